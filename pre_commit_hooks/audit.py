@@ -0,0 +1,264 @@
+#  Copyright 2025 T-Systems International GmbH
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice, this
+#     list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its
+#     contributors may be used to endorse or promote products derived from
+#     this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import NamedTuple
+
+from pre_commit_hooks.check_prohibited_filenames import (
+    Ruleset,
+    Violation,
+    add_rule_arguments,
+    open_denylist,
+    write_report,
+)
+from pre_commit_hooks.denylist import DenyList
+from pre_commit_hooks.git_index import MODE_GITLINK, MODE_TREE, index_file, read_index
+from pre_commit_hooks.pathstore import PathStore
+from pre_commit_hooks.util import CalledProcessError
+
+
+class RepoResult(NamedTuple):
+    repo: str
+    paths: int
+    violations: list[Violation]
+    seconds: float
+    # Checked-out submodules found in the index, if requested.
+    submodules: list[str]
+    error: str | None = None
+
+
+def _error_message(e: Exception) -> str:
+    if isinstance(e, CalledProcessError):
+        # The stderr of the failed git command, e.g. "not a git repository".
+        return e.args[4].decode(errors='replace').strip()
+    return str(e)
+
+
+def audit_repo(ruleset: Ruleset, repo: str, *, submodules: bool = False) -> RepoResult:
+    """
+    Check every path in the git index of the repository at `repo`.
+
+    With `submodules`, the checked-out submodules are returned for auditing
+    as well. A repository that cannot be read is returned with an error.
+    """
+    start = time.perf_counter()
+    paths = PathStore()
+    found = []
+    last = None
+    try:
+        for entry in read_index(*index_file(repo), repo):
+            # Conflict stages of a path are adjacent.
+            if entry.mode == MODE_TREE or entry.path == last:
+                continue
+            if entry.mode == MODE_GITLINK and submodules:
+                submodule = os.path.join(repo, entry.path)
+                if os.path.exists(os.path.join(submodule, '.git')):
+                    found.append(submodule)
+            paths.append(entry.path)
+            last = entry.path
+        violations = [v for vs in ruleset.match_store(paths) for v in vs]
+    except (CalledProcessError, OSError, ValueError) as e:
+        elapsed = time.perf_counter() - start
+        return RepoResult(repo, 0, [], elapsed, [], _error_message(e))
+    elapsed = time.perf_counter() - start
+    return RepoResult(repo, len(paths), violations, elapsed, found)
+
+
+# The ruleset of a worker process, compiled by `_init_worker`.
+_worker_ruleset: Ruleset
+
+
+def _init_worker(
+    prohibited_filenames: Sequence[str],
+    prohibited_patterns: Sequence[str],
+    denylist_filename: str | None,
+) -> None:
+    """Compile the ruleset once per worker process."""
+    global _worker_ruleset
+    denylist = DenyList(denylist_filename) if denylist_filename else None
+    _worker_ruleset = Ruleset(prohibited_filenames, prohibited_patterns, denylist)
+
+
+def _audit_repo_in_worker(repo: str, submodules: bool) -> RepoResult:
+    return audit_repo(_worker_ruleset, repo, submodules=submodules)
+
+
+def audit(
+    repos: Iterable[str],
+    *,
+    prohibited_filenames: Sequence[str] = (),
+    prohibited_patterns: Sequence[str] = (),
+    denylist_filename: str | None = None,
+    jobs: int = 4,
+    submodules: bool = False,
+) -> Iterator[RepoResult]:
+    """
+    Audit repositories in at most `jobs` processes, yielding results as done.
+
+    Every worker process compiles the ruleset of the prohibited filenames,
+    patterns and deny-list index once. With `submodules`, the checked-out
+    submodules of every audited repository are audited as well. Each
+    repository is audited once, however often it is reached.
+    """
+    seen = set()
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(
+            list(prohibited_filenames),
+            list(prohibited_patterns),
+            denylist_filename,
+        ),
+    ) as executor:
+        pending = set()
+        queue = list(repos)
+        while queue or pending:
+            for repo in queue:
+                key = os.path.realpath(repo)
+                if key not in seen:
+                    seen.add(key)
+                    pending.add(
+                        executor.submit(_audit_repo_in_worker, repo, submodules)
+                    )
+            queue = []
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                queue.extend(result.submodules)
+                yield result
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Check every tracked path of many repositories at once.'
+    )
+    add_rule_arguments(parser)
+    parser.add_argument(
+        '--repos-from',
+        metavar='FILE',
+        help='Read repository roots from FILE, one per line (`-` for stdin)',
+    )
+    parser.add_argument(
+        '--submodules',
+        action='store_true',
+        help='Also audit the checked-out submodules of every repository',
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=min(8, os.cpu_count() or 1),
+        metavar='N',
+        help='Audit up to N repositories at a time',
+    )
+    parser.add_argument(
+        '--report',
+        metavar='FILE',
+        help='Write violations and per-repository timings to FILE as JSON lines',
+    )
+    parser.add_argument(
+        'repos',
+        nargs='*',
+        help='Repository roots to audit',
+    )
+    args = parser.parse_args(argv)
+
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+    repos = list(args.repos)
+    if args.repos_from:
+        with contextlib.ExitStack() as stack:
+            if args.repos_from == '-':
+                f = sys.stdin
+            else:
+                f = stack.enter_context(open(args.repos_from, encoding='utf-8'))
+            repos.extend(line.strip() for line in f if line.strip())
+    if not repos:
+        parser.error('no repositories given')
+
+    start = time.perf_counter()
+    with contextlib.ExitStack() as stack:
+        denylist = open_denylist(parser, args.prohibited_filenames_index, stack)
+        if not Ruleset(args.prohibited_filenames, args.prohibited_patterns, denylist):
+            parser.error('no prohibited filenames, patterns or deny-list given')
+
+        # Sorted, so reports of consecutive audits can be compared line by line.
+        results = sorted(
+            audit(
+                repos,
+                prohibited_filenames=args.prohibited_filenames,
+                prohibited_patterns=args.prohibited_patterns,
+                denylist_filename=args.prohibited_filenames_index,
+                jobs=args.jobs,
+                submodules=args.submodules,
+            ),
+            key=lambda result: result.repo,
+        )
+
+        report = None
+        if args.report:
+            report = stack.enter_context(open(args.report, 'w', encoding='utf-8'))
+        for result in results:
+            if result.error is not None:
+                print(f'{result.repo}: {result.error}')
+            elif result.violations:
+                names = ', '.join(v.path for v in result.violations)
+                print(f'{result.repo}: Prohibited filename(s) found: {names}')
+            if report is not None:
+                for violation in result.violations:
+                    write_report(report, violation, repo=result.repo)
+                record = {
+                    'repo': result.repo,
+                    'paths': result.paths,
+                    'violations': len(result.violations),
+                    'seconds': round(result.seconds, 6),
+                }
+                if result.error is not None:
+                    record['error'] = result.error
+                report.write(json.dumps(record) + '\n')
+
+    violations = sum(len(result.violations) for result in results)
+    errors = sum(result.error is not None for result in results)
+    print(
+        f'Audited {len(results)} repositories '
+        f'({sum(result.paths for result in results)} paths) '
+        f'in {time.perf_counter() - start:.2f}s: '
+        f'{violations} violation(s), {errors} error(s)'
+    )
+    return 1 if violations or errors else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -30,6 +30,7 @@ from __future__ import annotations
 import argparse
 from collections.abc import Sequence
 
+from pre_commit_hooks import metrics
 from pre_commit_hooks.util import cmd_output
 
 
@@ -56,33 +57,53 @@ def _domain_in_allowed(email_domain: str, allowed_domains: list[str]) -> bool:
     return email_domain_lower in allowed_domains_lower
 
 
-def main(argv: Sequence[str] | None = None) -> int:
-    parser = argparse.ArgumentParser()
+def add_arguments(parser: argparse._ActionsContainer) -> None:
+    """Add the options of this hook to `parser`."""
     parser.add_argument(
         '--allowed-domains',
         nargs='+',
         default=[],
         help='List of allowed email domains',
     )
-    args = parser.parse_args(argv)
 
-    local_email = _get_git_user_email_local()
+
+def check(allowed_domains: list[str], email: str | None = None) -> int:
+    """
+    Check the Git user email against the allowed domains.
+
+    The local Git user email is looked up unless `email` is given.
+    """
+    local_email = _get_git_user_email_local() if email is None else email
     local_email_domain = _get_email_domain(local_email)
 
-    if _domain_in_allowed(local_email_domain, args.allowed_domains):
+    if _domain_in_allowed(local_email_domain, allowed_domains):
         return 0
 
+    metrics.count('violations')
     print(
         f"""
     Git user email does not match allowed domains,
     please set it using 'git config user.email <email>'
     or globally by 'git config --global user.email <email>'
 
-    Domains allowed: {args.allowed_domains}
+    Domains allowed: {allowed_domains}
     """
     )
     return 1
 
 
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser()
+    add_arguments(parser)
+    parser.add_argument(
+        '--metrics-file',
+        metavar='FILE',
+        help='Add the timings and counts of this run to FILE as OpenMetrics text',
+    )
+    args = parser.parse_args(argv)
+    with metrics.recorded(args.metrics_file, 'check-git-user-email'):
+        return check(args.allowed_domains)
+
+
 if __name__ == '__main__':
     raise SystemExit(main())
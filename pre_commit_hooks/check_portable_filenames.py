@@ -0,0 +1,153 @@
+#  Copyright 2025 T-Systems International GmbH
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice, this
+#     list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its
+#     contributors may be used to endorse or promote products derived from
+#     this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import annotations
+
+import argparse
+import re
+import unicodedata
+from collections.abc import Iterable, Sequence
+
+from pre_commit_hooks.git_index import MODE_TREE, IndexEntry, index_file, read_index
+
+_WINDOWS_RESERVED_NAMES = frozenset(
+    [
+        'CON',
+        'PRN',
+        'AUX',
+        'NUL',
+        *(f'{device}{n}' for device in ('COM', 'LPT') for n in '123456789¹²³'),
+    ]
+)
+_WINDOWS_INVALID_CHARS_RE = re.compile(r'[<>:"|?*\\\x00-\x1f]')
+
+
+def _collision_key(path: str) -> str:
+    """
+    Fold `path` the way case-insensitive, Unicode-normalizing filesystems do.
+
+    Paths with equal keys cannot be checked out side by side on e.g. Windows
+    or macOS.
+    """
+    return unicodedata.normalize('NFC', unicodedata.normalize('NFC', path).casefold())
+
+
+def _windows_problem(name: str) -> str | None:
+    """Return why a single path component is invalid on Windows, if it is."""
+    if name[-1] in '. ':
+        return 'trailing dot or space'
+    if _WINDOWS_INVALID_CHARS_RE.search(name):
+        return 'invalid character'
+    if name.split('.', 1)[0].rstrip(' ').upper() in _WINDOWS_RESERVED_NAMES:
+        return 'reserved name'
+    return None
+
+
+def find_collisions(paths: Iterable[str]) -> list[tuple[str, str]]:
+    """
+    Find paths, or their parent directories, that collide once folded.
+
+    Every path and directory is hashed once, so this is linear in the total
+    length of all paths. Each colliding pair is reported once.
+    """
+    seen: dict[str, str] = {}
+    visited: set[str] = set()
+    collisions = []
+    for path in paths:
+        end = len(path)
+        # Walk from the full path up through its directories, stopping at the
+        # first one that has been hashed already.
+        while end > 0:
+            prefix = path[:end]
+            if prefix in visited:
+                break
+            visited.add(prefix)
+            other = seen.setdefault(_collision_key(prefix), prefix)
+            if other != prefix:
+                collisions.append((other, prefix))
+            end = path.rfind('/', 0, end)
+    return collisions
+
+
+def find_windows_problems(paths: Iterable[str]) -> list[tuple[str, str]]:
+    """Find paths with components that are invalid on Windows."""
+    problems: dict[str, str | None] = {}
+    found = []
+    for path in paths:
+        for name in path.split('/'):
+            try:
+                problem = problems[name]
+            except KeyError:
+                problem = problems[name] = _windows_problem(name) if name else None
+            if problem is not None:
+                found.append((path, problem))
+                break
+    return found
+
+
+def check(
+    filenames: Iterable[str], index_entries: Iterable[IndexEntry] | None = None
+) -> int:
+    """
+    Check the paths in the git index and `filenames` for portability.
+
+    The index is read unless its entries are given as `index_entries`.
+    """
+    if index_entries is None:
+        index_entries = read_index(*index_file())
+    paths = dict.fromkeys(e.path for e in index_entries if e.mode != MODE_TREE)
+    paths.update(dict.fromkeys(filenames))
+
+    rc = 0
+    collisions = find_collisions(paths)
+    if collisions:
+        pairs = ', '.join(f'{a} and {b}' for a, b in collisions)
+        print(f'Path(s) colliding on case-insensitive filesystems: {pairs}')
+        rc = 1
+
+    problems = find_windows_problems(paths)
+    if problems:
+        names = ', '.join(f'{path} ({problem})' for path, problem in problems)
+        print(f'Path(s) not portable to Windows: {names}')
+        rc = 1
+
+    return rc
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        'filenames',
+        nargs='*',
+        help='Additional filenames to check along with the git index',
+    )
+    args = parser.parse_args(argv)
+    return check(args.filenames)
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -28,10 +28,48 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
 import fnmatch
+import glob
+import hashlib
+import itertools
+import json
 import os
-from collections.abc import Sequence
+import posixpath
+import re
+import time
+import zlib
+from array import array
+from collections.abc import (
+    Callable,
+    Container,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
 from pathlib import PurePosixPath, Path
+from typing import Any, NamedTuple, TextIO
+
+from pre_commit_hooks import metrics
+from pre_commit_hooks.denylist import DenyList, fingerprint
+from pre_commit_hooks.git_index import (
+    MODE_EXECUTABLE,
+    MODE_GITLINK,
+    MODE_SYMLINK,
+    MODE_TREE,
+    IndexEntry,
+    index_file,
+    read_index,
+)
+from pre_commit_hooks.pathstore import PathStore
+from pre_commit_hooks.util import (
+    CalledProcessError,
+    CatFileBatch,
+    CatFileBatchCheck,
+    introduced_files,
+)
+from pre_commit_hooks.watch import WatchState, WorkingTree, toplevel, write_state
 
 
 class CommaSeparatedList(argparse.Action):
@@ -52,6 +90,114 @@ class CommaSeparatedList(argparse.Action):
             setattr(namespace, self.dest, result)
 
 
+_SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024**2, 'G': 1024**3, 'T': 1024**4}
+_SIZE_RE = re.compile(r'\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:I?B)?\s*', re.IGNORECASE)
+
+
+def _parse_size(s: str) -> int:
+    """
+    Parse a size such as `512`, `100KB`, `10MB` or `1.5GiB` into bytes.
+
+    Units are binary multiples; the `B`/`iB` suffix is optional.
+    """
+    m = _SIZE_RE.fullmatch(s)
+    if not m:
+        raise ValueError(f'Invalid size: {s!r}')
+    return int(float(m[1]) * _SIZE_UNITS[m[2].upper()])
+
+
+def _format_size(n: int) -> str:
+    """Format a number of bytes using the largest fitting binary unit."""
+    for unit in ('TiB', 'GiB', 'MiB', 'KiB'):
+        factor = _SIZE_UNITS[unit[0]]
+        if n >= factor:
+            return f'{n / factor:.1f} {unit}'
+    return f'{n} B'
+
+
+def _parse_size_limit(s: str) -> tuple[str, int]:
+    """Parse a `PATTERN=SIZE` size limit, e.g. `*.csv=10MB`."""
+    pattern, sep, size = s.rpartition('=')
+    if not sep or not pattern:
+        raise ValueError(f'Invalid size limit (expected PATTERN=SIZE): {s!r}')
+    return pattern, _parse_size(size)
+
+
+_MODE_KINDS = {
+    MODE_SYMLINK: 'symlink',
+    MODE_EXECUTABLE: 'executable',
+    MODE_GITLINK: 'gitlink',
+}
+
+
+def _parse_mode_rule(s: str) -> tuple[str, str]:
+    """Parse a `KIND:PATTERN` mode rule, e.g. `executable:*.env`."""
+    kind, sep, pattern = s.partition(':')
+    if not sep or not pattern or kind not in _MODE_KINDS.values():
+        kinds = '/'.join(_MODE_KINDS.values())
+        raise ValueError(f'Invalid mode rule (expected {kinds}:PATTERN): {s!r}')
+    return kind, pattern
+
+
+# Well-known markers of private keys and credentials. All of them match at
+# most _SIGNATURE_OVERLAP bytes, so they are found across chunk borders.
+_SIGNATURES = {
+    'private_key': rb'-----BEGIN (?:RSA |DSA |EC |OPENSSH |ENCRYPTED |PGP )?'
+    rb'PRIVATE KEY(?: BLOCK)?-----',
+    'putty_private_key': rb'PuTTY-User-Key-File-\d: ',
+    'aws_access_key_id': rb'\b(?:AKIA|ASIA)[0-9A-Z]{16}\b',
+    'github_token': rb'\bgh[pousr]_[0-9A-Za-z]{36}\b',
+    'gitlab_token': rb'\bglpat-[0-9A-Za-z_-]{20}\b',
+    'slack_token': rb'\bxox[abposr]-[0-9A-Za-z-]{10}',
+    'google_api_key': rb'\bAIza[0-9A-Za-z_-]{35}\b',
+    'stripe_secret_key': rb'\b[rs]k_live_[0-9A-Za-z]{24}',
+}
+# Every signature starts with one of these literals, or one byte before it
+# for `[rs]k_live_`. Looking for them is much faster than running the regex,
+# which only has to run from the first one found.
+_SIGNATURE_PREFIXES = (
+    b'-----BEGIN ',
+    b'PuTTY-User-Key-File-',
+    b'AKIA',
+    b'ASIA',
+    b'ghp_',
+    b'gho_',
+    b'ghu_',
+    b'ghs_',
+    b'ghr_',
+    b'glpat-',
+    b'xox',
+    b'AIza',
+    b'k_live_',
+)
+_SIGNATURE_OVERLAP = 128
+_SIGNATURE_CHUNK_SIZE = 1 << 20
+# A single alternation lets the regex engine look for all signatures in one
+# pass over the data.
+_SIGNATURES_RE = re.compile(
+    b'|'.join(b'(?P<%s>%s)' % (name.encode(), sig) for name, sig in _SIGNATURES.items())
+)
+
+
+def _scan_chunks(chunks: Iterable[bytes]) -> str | None:
+    """
+    Return the name of the first signature found in a chunked blob, if any.
+
+    Each chunk is scanned together with the last bytes of the previous one,
+    so signatures split across chunks are still found.
+    """
+    tail = b''
+    for chunk in chunks:
+        window = tail + chunk
+        hits = [i for i in map(window.find, _SIGNATURE_PREFIXES) if i >= 0]
+        if hits:
+            m = _SIGNATURES_RE.search(window, max(min(hits) - 1, 0))
+            if m:
+                return m.lastgroup.replace('_', '-')
+        tail = window[-_SIGNATURE_OVERLAP:]
+    return None
+
+
 def _norm_path(s: str) -> str:
     """Wrapper around os.path.normpath to normalize path separators."""
     return os.path.normpath(s)
@@ -137,30 +283,902 @@ def _matches_patterns(path: str, patterns: Sequence[str]) -> bool:
     return False
 
 
+_DOT_COMPONENT_RE = re.compile(r'(?:^|/)\.\.?(?:/|$)')
+_COMPONENT_CACHE_SIZE = 1 << 16
+
+
+class _PathInfo(NamedTuple):
+    """A path split once into the pieces that all rules match against."""
+
+    posix: str
+    basename: str
+    # Components as in `PurePosixPath.parts`, including a leading root.
+    parts: tuple[str, ...]
+    # Components without the root.
+    names: tuple[str, ...]
+    # Basename by the platform's rules, as used by `_match_filename`. It only
+    # differs from `basename` for backslashes on POSIX.
+    native_basename: str
+
+
+def _is_git_normalized(path: str) -> bool:
+    """Check if `path` is relative, POSIX-separated and normalized already."""
+    return (
+        bool(path)
+        and path[0] != '/'
+        and path[-1] != '/'
+        and '\\' not in path
+        and '//' not in path
+        and _DOT_COMPONENT_RE.search(path) is None
+    )
+
+
+def _split_git_path(path: str) -> _PathInfo:
+    """Split a path as reported by git, skipping any normalization."""
+    parts = tuple(path.split('/'))
+    return _PathInfo(path, parts[-1], parts, parts, parts[-1])
+
+
+def _split_path(path: str) -> _PathInfo:
+    """
+    Split an arbitrary path.
+
+    Paths that are git-normalized already take the fast path; everything else
+    goes through the same normalization as `_matches_patterns`.
+    """
+    if _is_git_normalized(path):
+        return _split_git_path(path)
+    posix = _to_posix_path(path)
+    parts = PurePosixPath(posix).parts
+    names = parts[1:] if parts and '/' in parts[0] else parts
+    native_basename = os.path.basename(_norm_path(path))
+    return _PathInfo(posix, posix.rsplit('/', 1)[-1], parts, names, native_basename)
+
+
+# Marks a verdict that has not been computed yet.
+_UNKNOWN = object()
+
+
+class _CacheStats:
+    """Lookups and hits of the component cache during one scan."""
+
+    __slots__ = ('hits', 'lookups')
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.lookups = 0
+
+
+class _Rules:
+    """
+    Prohibited filenames and patterns compiled for matching many paths.
+
+    Gives the same verdicts as `_match_filename` and `_matches_patterns`, but
+    normalizes and compiles every rule once and matches against `_PathInfo`,
+    so each path is split only once for all rules. Glob verdicts for single
+    path components are memoized, as components repeat across paths.
+    """
+
+    def __init__(
+        self, filenames: Sequence[str] = (), patterns: Sequence[str] = ()
+    ) -> None:
+        self._casefold = os.name == 'nt'
+        self._filenames: dict[str, str] = {}
+        for fn in filenames:
+            self._filenames.setdefault(self._key(os.path.basename(_norm_path(fn))), fn)
+
+        self._exact: dict[str, str] = {}
+        self._globs: list[tuple[str, Callable[[str], object]]] = []
+        self._paths: list[tuple[str, str, tuple[Callable[[str], object], ...]]] = []
+        for pat in patterns:
+            pat_norm = _normalize_pattern(pat)
+            if '/' in pat_norm:
+                candidates = [pat_norm]
+                if pat_norm.startswith('**/'):
+                    candidates.append(pat_norm[3:])
+                for cand in candidates:
+                    pure = PurePosixPath(cand)
+                    parts = pure.parts[1:] if pure.anchor else pure.parts
+                    if pure.anchor or parts:
+                        matchers = tuple(_compile_path_glob(p) for p in parts)
+                        self._paths.append((pat, pure.anchor, matchers))
+            elif _has_glob_meta(pat_norm):
+                self._globs.append((pat, _compile_glob(os.path.normcase(pat_norm))))
+            else:
+                key = self._key(os.path.basename(_norm_path(pat_norm)))
+                self._exact.setdefault(key, pat)
+
+        self._component_cache: dict[str, str | None] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self._filenames or self._exact or self._globs or self._paths)
+
+    def _key(self, name: str) -> str:
+        return name.casefold() if self._casefold else name
+
+    def match_filename(self, info: _PathInfo) -> str | None:
+        """Return the prohibited filename matching the basename, if any."""
+        if not self._filenames:
+            return None
+        return self._filenames.get(self._key(info.native_basename))
+
+    def match_pattern(
+        self, info: _PathInfo, stats: _CacheStats | None = None
+    ) -> str | None:
+        """
+        Return a prohibited pattern matching the path, if any.
+
+        Component cache lookups are counted in `stats`, if given.
+        """
+        if self._exact:
+            pat = self._exact.get(self._key(info.basename))
+            if pat is not None:
+                return pat
+
+        if self._globs:
+            pat = self._match_component(info.basename, stats)
+            if pat is not None:
+                return pat
+            for name in info.names:
+                pat = self._match_component(name, stats)
+                if pat is not None:
+                    return pat
+
+        parts = info.parts
+        for pat, anchor, matchers in self._paths:
+            if anchor:
+                if len(parts) != len(matchers) + 1 or parts[0] != anchor:
+                    continue
+            elif len(matchers) > len(parts):
+                continue
+            if all(m(p) for m, p in zip(reversed(matchers), reversed(parts))):
+                return pat
+
+        return None
+
+    def _match_component(self, name: str, stats: _CacheStats | None) -> str | None:
+        cache = self._component_cache
+        if stats is not None:
+            stats.lookups += 1
+        try:
+            pat = cache[name]
+        except KeyError:
+            pass
+        else:
+            if stats is not None:
+                stats.hits += 1
+            return pat
+        normed = os.path.normcase(name)
+        pat = next((pat for pat, m in self._globs if m(normed)), None)
+        if len(cache) >= _COMPONENT_CACHE_SIZE:
+            cache.clear()
+        cache[name] = pat
+        return pat
+
+    def match_store(
+        self,
+        store: PathStore,
+        denylist: DenyList | None = None,
+        stats: _CacheStats | None = None,
+    ) -> Iterator[list[tuple[str, str]]]:
+        """
+        Lazily yield the `(rule, kind)` verdicts of each path in `store`.
+
+        Gives the same verdicts as `match_filename`, `_match_denylist` and
+        `match_pattern` for trusted paths. Directory names are matched once
+        per distinct ID; basenames, being mostly unique, once per path.
+        """
+        names = store.names
+        # Verdicts per directory ID, filled in on first use.
+        glob_verdicts: list[Any] = [_UNKNOWN] * len(names)
+        matcher_bits: list[Any] = [_UNKNOWN] * len(names)
+        # Git paths are relative, so anchored path patterns never match them.
+        path_rules = []
+        matchers: list[Callable[[str], object]] = []
+        for pat, anchor, pat_matchers in self._paths:
+            if not anchor:
+                path_rules.append((pat, len(matchers), len(pat_matchers)))
+                matchers.extend(pat_matchers)
+
+        def glob_verdict(component: int) -> str | None:
+            verdict = glob_verdicts[component]
+            if verdict is _UNKNOWN:
+                verdict = glob_verdicts[component] = self._match_component(
+                    names[component], stats
+                )
+            return verdict
+
+        def bits(component: int) -> int:
+            verdict = matcher_bits[component]
+            if verdict is _UNKNOWN:
+                name = names[component]
+                verdict = matcher_bits[component] = sum(
+                    1 << i for i, m in enumerate(matchers) if m(name)
+                )
+            return verdict
+
+        fingerprints = denylist is not None and denylist.has_fingerprints
+        for index in range(len(store)):
+            ids = store.ids(index)
+            base = store.basename(index)
+            found: list[tuple[str, str]] = []
+            rule = self._filenames.get(self._key(base)) if self._filenames else None
+            if rule is not None:
+                found.append((rule, 'filename'))
+            elif denylist is not None:
+                if base in denylist:
+                    found.append((base, 'denylist'))
+                elif fingerprints:
+                    fp = fingerprint(store[index])
+                    if fp in denylist:
+                        found.append((fp, 'denylist'))
+
+            pat = self._exact.get(self._key(base)) if self._exact else None
+            if pat is None and self._globs:
+                pat = self._match_component(base, stats)
+                if pat is None:
+                    pat = next(filter(None, map(glob_verdict, ids)), None)
+            if pat is None:
+                for rule, offset, count in path_rules:
+                    # The last matcher is for the basename, the others for
+                    # the innermost directories.
+                    start = len(ids) + 1 - count
+                    if start < 0 or not matchers[offset + count - 1](base):
+                        continue
+                    if all(
+                        bits(ids[start + i]) >> (offset + i) & 1
+                        for i in range(count - 1)
+                    ):
+                        pat = rule
+                        break
+            if pat is not None:
+                found.append((pat, 'pattern'))
+            yield found
+
+
+def _compile_glob(pat: str) -> Callable[[str], object]:
+    """Compile a glob for a single path component, like `fnmatch.fnmatchcase`."""
+    return re.compile(fnmatch.translate(pat)).match
+
+
+def _compile_path_glob(pat: str) -> Callable[[str], object]:
+    """
+    Compile one component of a path pattern, like `PurePosixPath.match`.
+
+    Unlike `fnmatch`, wildcards do not match a separator, so the root of an
+    absolute path only matches patterns like `[!a]`.
+    """
+    return re.compile(
+        glob.translate(pat, recursive=False, include_hidden=True, seps='/')
+    ).match
+
+
+def _match_denylist(info: _PathInfo, denylist: DenyList) -> str | None:
+    """
+    Return the deny-listed basename or path fingerprint of `info`, if any.
+
+    Fingerprints are only computed if the deny-list contains any.
+    """
+    if info.native_basename in denylist:
+        return info.native_basename
+    if denylist.has_fingerprints:
+        fp = fingerprint(info.posix)
+        if fp in denylist:
+            return fp
+    return None
+
+
+class Violation(NamedTuple):
+    """A path matched by a rule of a `Ruleset`."""
+
+    path: str
+    rule: str
+    # One of 'filename', 'denylist', 'pattern', 'size', 'mode' or 'content'.
+    kind: str
+
+
+class Ruleset:
+    """
+    Compiled prohibited filenames, patterns and deny-list.
+
+    A ruleset is compiled once and can then match any number of paths. It is
+    never modified by matching (apart from an internal cache), so a single
+    instance can be shared between threads.
+
+    >>> rules = Ruleset(prohibited_patterns=['*.pem'])
+    >>> list(rules.match(['src/main.py', 'keys/id_rsa.pem']))
+    [Violation(path='keys/id_rsa.pem', rule='*.pem', kind='pattern')]
+    """
+
+    def __init__(
+        self,
+        prohibited_filenames: Sequence[str] = (),
+        prohibited_patterns: Sequence[str] = (),
+        denylist: DenyList | None = None,
+    ) -> None:
+        self._rules = _Rules(prohibited_filenames, prohibited_patterns)
+        self._denylist = denylist
+
+    def __bool__(self) -> bool:
+        return bool(self._rules) or self._denylist is not None
+
+    def match_path(self, path: str, *, trusted: bool = False) -> list[Violation]:
+        """
+        Return the violations of a single path.
+
+        A path matches at most one filename or deny-list rule and at most one
+        pattern rule. `trusted` paths must be git-normalized (relative,
+        POSIX-separated, normalized) and skip normalization.
+        """
+        return self._match_path(path, trusted, None)
+
+    def _match_path(
+        self, path: str, trusted: bool, stats: _CacheStats | None
+    ) -> list[Violation]:
+        info = _split_git_path(path) if trusted else _split_path(path)
+        violations = []
+        rule = self._rules.match_filename(info)
+        if rule is not None:
+            violations.append(Violation(path, rule, 'filename'))
+        elif self._denylist is not None:
+            rule = _match_denylist(info, self._denylist)
+            if rule is not None:
+                violations.append(Violation(path, rule, 'denylist'))
+        rule = self._rules.match_pattern(info, stats)
+        if rule is not None:
+            violations.append(Violation(path, rule, 'pattern'))
+        return violations
+
+    def match(
+        self, paths: Iterable[str], *, trusted: bool = False
+    ) -> Iterator[Violation]:
+        """Lazily yield the violations of all `paths`, in order."""
+        for path in paths:
+            yield from self.match_path(path, trusted=trusted)
+
+    def match_store(self, store: PathStore) -> Iterator[list[Violation]]:
+        """
+        Lazily yield the violations of each path in `store`, in order.
+
+        Stored paths are matched like trusted paths, but on directory IDs:
+        every rule is evaluated once per distinct directory name, however
+        many paths share it. Path strings are only built for violations and
+        deny-list fingerprints.
+        """
+        return self._match_store(store, None)
+
+    def _match_store(
+        self, store: PathStore, stats: _CacheStats | None
+    ) -> Iterator[list[Violation]]:
+        verdicts = self._rules.match_store(store, self._denylist, stats)
+        for index, found in enumerate(verdicts):
+            if found:
+                path = store[index]
+                yield [Violation(path, rule, kind) for rule, kind in found]
+            else:
+                yield []
+
+
+def _shard_of(path: str, count: int) -> int:
+    """
+    Return the zero-based shard of `path` out of `count` shards.
+
+    The shard only depends on the path itself, never on the other paths or
+    their order, so independent runs always split the same way.
+    """
+    return zlib.crc32(path.encode('utf-8', 'surrogateescape')) % count
+
+
+def _parse_shard(s: str) -> tuple[int, int]:
+    """Parse a one-based `INDEX/COUNT` shard specification."""
+    index, sep, count = s.partition('/')
+    try:
+        shard = int(index), int(count)
+    except ValueError:
+        shard = 0, 0
+    if not sep or not 1 <= shard[0] <= shard[1]:
+        raise ValueError(f'Invalid shard (expected INDEX/COUNT, e.g. 1/4): {s!r}')
+    return shard
+
+
+def write_report(report: TextIO, violation: Violation, **fields: Any) -> None:
+    """Write a violation as one JSON line, so reports merge by concatenation."""
+    report.write(json.dumps({**violation._asdict(), **fields}) + '\n')
+
+
+def _print_stopped(check: str, checked: int, total: int, stopped: str | None) -> None:
+    """Report the progress of a check that stopped early, if it did."""
+    if stopped:
+        print(f'{check} stopped after checking {checked} of {total} path(s): {stopped}')
+
+
 def find_prohibited(
     prohibited_filenames: Sequence[str],
     prohibited_patterns: Sequence[str],
     filenames: Sequence[str],
+    introduced_by: Mapping[str, str] | None = None,
+    denylist: DenyList | None = None,
+    *,
+    max_violations: int | None = None,
+    deadline: float | None = None,
+    report: TextIO | None = None,
+    trusted: Container[str] = (),
+    state: WatchState | None = None,
 ) -> int:
     """
     Check the given filenames against prohibited filenames and patterns.
+
+    If `introduced_by` maps a filename to a commit, the commit is reported
+    alongside the filename. Such filenames, and those in `trusted`, come
+    straight from git and skip path normalization.
+
+    Working tree filenames covered by the `state` of a watcher for the same
+    rules take their violations from there instead of being matched. A
+    `PathStore` of git paths is matched on its component IDs instead.
+
+    The scan stops once `max_violations` violations are found or when the
+    `time.monotonic()` `deadline` passes. A scan cut short by the deadline
+    fails even without violations, as the remaining paths are unchecked.
+
+    Violations are also written to `report` as JSON lines.
     """
+    ruleset = Ruleset(prohibited_filenames, prohibited_patterns, denylist)
+    if not ruleset:
+        return 0
+
+    introduced_by = introduced_by or {}
+    state_violations: dict[str, list[Violation]] = {}
+    if state is not None:
+        state_violations = {
+            path: [Violation(**v) for v in found]
+            for path, found in state.violations.items()
+        }
+
+    def match(fn: str) -> list[Violation]:
+        if (
+            state is not None
+            and fn not in introduced_by
+            and _is_git_normalized(fn)
+            and state.covers(fn)
+        ):
+            return state_violations.get(fn, [])
+        is_trusted = fn in introduced_by or fn in trusted
+        return ruleset._match_path(fn, is_trusted, stats)
+
+    stats = _CacheStats()
+    if isinstance(filenames, PathStore):
+        verdicts = ruleset._match_store(filenames, stats)
+    else:
+        verdicts = map(match, filenames)
     found = []
-    for fn in filenames:
-        if prohibited_filenames and _match_filename(fn, prohibited_filenames):
-            found.append(fn)
-        if prohibited_patterns and _matches_patterns(fn, prohibited_patterns):
-            found.append(fn)
+    stopped = None
+    scanned = 0
+    while scanned < len(filenames):
+        if deadline is not None and time.monotonic() > deadline:
+            stopped = 'time budget exceeded'
+            break
+        scanned += 1
+        found.extend(next(verdicts))
+        if max_violations is not None and len(found) >= max_violations:
+            del found[max_violations:]
+            if scanned < len(filenames):
+                stopped = f'{max_violations} violation(s) found'
+            break
 
+    metrics.count('component_cache_hits', stats.hits)
+    metrics.count('component_cache_lookups', stats.lookups)
+    metrics.count('violations', len(found))
     if found:
-        print(f"Prohibited filename(s) found: {', '.join(found)}")
+        if report is not None:
+            for violation in found:
+                commit = introduced_by.get(violation.path)
+                extra = {'commit': commit} if commit else {}
+                write_report(report, violation, **extra)
+        names = [
+            f'{v.path} (introduced in {introduced_by[v.path][:12]})'
+            if v.path in introduced_by
+            else v.path
+            for v in found
+        ]
+        print(f"Prohibited filename(s) found: {', '.join(names)}")
+
+    _print_stopped('Scan', scanned, len(filenames), stopped)
+    if stopped and not found:
+        print('Scan incomplete: the remaining paths were not checked')
+
+    return 1 if found or stopped else 0
+
+
+def find_oversized(
+    size_limits: Sequence[tuple[str, int]],
+    filenames: Sequence[str],
+    introduced_by: Mapping[str, str] | None = None,
+    *,
+    max_violations: int | None = None,
+    deadline: float | None = None,
+    report: TextIO | None = None,
+    trusted: Container[str] = (),
+) -> int:
+    """
+    Check the blob sizes of the given filenames against per-pattern limits.
+
+    The first `(pattern, limit)` pair whose pattern matches a filename applies.
+    Sizes are those of the staged blobs, or of the blob in the introducing
+    commit for filenames listed in `introduced_by`. All sizes are requested
+    from a single long-lived `git cat-file --batch-check` process.
+
+    Sizes are looked up one at a time. The check stops once `max_violations`
+    oversized files are found or when the `time.monotonic()` `deadline`
+    passes between two lookups; a check cut short by the deadline fails.
+    Violations are also written to `report` as JSON lines. Filenames in
+    `trusted` skip path normalization.
+    """
+    if deadline is not None and time.monotonic() > deadline:
+        print('Size check skipped: time budget exceeded')
+        return 1
+
+    introduced_by = introduced_by or {}
+    rules = [_Rules(patterns=[pattern]) for pattern, _ in size_limits]
+    # The indexes of the limited filenames and of their limits, compact even
+    # for all paths of a `PathStore`.
+    limited = array('I')
+    limit_indexes = array('I')
+    for index, fn in enumerate(filenames):
+        if fn in introduced_by or fn in trusted:
+            info = _split_git_path(fn)
+        else:
+            info = _split_path(fn)
+        for limit_index, pattern_rules in enumerate(rules):
+            if pattern_rules.match_pattern(info) is not None:
+                limited.append(index)
+                limit_indexes.append(limit_index)
+                break
+    if not limited:
+        return 0
+
+    oversized = []
+    stopped = None
+    checked = 0
+    with CatFileBatchCheck() as cat_file:
+        for index, limit_index in zip(limited, limit_indexes):
+            fn = filenames[index]
+            pattern, limit = size_limits[limit_index]
+            if deadline is not None and time.monotonic() > deadline:
+                stopped = 'time budget exceeded'
+                break
+            if len(oversized) == max_violations:
+                stopped = f'{max_violations} violation(s) found'
+                break
+            obj = f'{introduced_by[fn]}:{fn}' if fn in introduced_by else f':0:{fn}'
+            size = cat_file.size(obj)
+            checked += 1
+            if size is not None and size > limit:
+                oversized.append((fn, pattern, limit, size))
+
+    metrics.count('violations', len(oversized))
+    if oversized:
+        if report is not None:
+            for fn, pattern, limit, size in oversized:
+                violation = Violation(fn, pattern, 'size')
+                write_report(report, violation, size=size, limit=limit)
+        names = [
+            f'{fn} ({_format_size(size)} > {_format_size(limit)})'
+            for fn, _, limit, size in oversized
+        ]
+        print(f"File(s) exceeding size limit: {', '.join(names)}")
+
+    _print_stopped('Size check', checked, len(limited), stopped)
+    return 1 if oversized or stopped else 0
+
+
+def _symlink_escapes(path: str, target: str) -> bool:
+    """Check if the symlink at `path` points outside of the repository."""
+    target = target.replace('\\', '/')
+    if target.startswith('/') or re.match(r'[A-Za-z]:', target):
+        return True
+    resolved = posixpath.normpath(posixpath.join(posixpath.dirname(path), target))
+    return resolved == '..' or resolved.startswith('../')
+
+
+def _staged_entries(
+    filenames: Sequence[str],
+    index_entries: Iterable[IndexEntry] | None = None,
+    *,
+    trusted: Container[str] = (),
+    exclude: Container[str] = (),
+) -> Iterator[IndexEntry | None]:
+    """
+    Yield the stage 0 index entry of each filename, or `None`.
+
+    Filenames in `exclude` are not looked up, and those in `trusted` skip
+    path normalization. Unless `index_entries` are given, the index is read
+    in-process and only until every path has been found. The paths of a
+    `PathStore` are in index order, so they are matched in a single merge
+    with the index instead of through a table of all paths.
+    """
+    if index_entries is None:
+        index_entries = read_index(*index_file())
+    if isinstance(filenames, PathStore):
+        entries = iter(index_entries)
+        entry = next(entries, None)
+        for fn in filenames:
+            # Skip the paths left out of the store, e.g. those of other shards.
+            while entry is not None and entry.path != fn:
+                entry = next(entries, None)
+            staged = None
+            while entry is not None and entry.path == fn:
+                if entry.stage == 0:
+                    staged = entry
+                entry = next(entries, None)
+            yield None if fn in exclude else staged
+        return
+
+    wanted = {}
+    for fn in filenames:
+        if fn not in exclude:
+            info = _split_git_path(fn) if fn in trusted else _split_path(fn)
+            wanted[info.posix] = fn
+    found = {}
+    if wanted:
+        for entry in index_entries:
+            fn = wanted.get(entry.path)
+            if fn is not None and entry.stage == 0:
+                found[fn] = entry
+                del wanted[entry.path]
+                if not wanted:
+                    break
+    for fn in filenames:
+        yield found.get(fn)
+
+
+def find_prohibited_modes(
+    mode_rules: Sequence[tuple[str, str]],
+    filenames: Sequence[str],
+    *,
+    external_symlinks: bool = False,
+    index_entries: Iterable[IndexEntry] | None = None,
+    max_violations: int | None = None,
+    deadline: float | None = None,
+    report: TextIO | None = None,
+    trusted: Container[str] = (),
+) -> int:
+    """
+    Check the staged file modes of the given filenames.
+
+    `mode_rules` are `(kind, pattern)` pairs prohibiting symlinks, executables
+    or gitlinks (submodules) matching a pattern. With `external_symlinks`,
+    symlinks pointing outside of the repository are prohibited as well.
+    Modes are read from the git index in-process, unless the index entries
+    are given as `index_entries`, and all symlink targets with a single
+    long-lived `git cat-file --batch`. Filenames without a staged entry are
+    skipped.
+
+    `max_violations`, `deadline`, `report` and `trusted` work as for
+    `find_oversized`, with the limits checked between two filenames.
+    """
+    if deadline is not None and time.monotonic() > deadline:
+        print('Mode check skipped: time budget exceeded')
         return 1
 
+    by_kind: dict[str, list[str]] = {}
+    for kind, pattern in mode_rules:
+        by_kind.setdefault(kind, []).append(pattern)
+    rules = {kind: _Rules(patterns=patterns) for kind, patterns in by_kind.items()}
+
+    staged = _staged_entries(filenames, index_entries, trusted=trusted)
+
+    # Each violation comes with a description and extra report fields.
+    found: list[tuple[Violation, str, dict[str, str]]] = []
+    stopped = None
+    checked = 0
+    with contextlib.ExitStack() as stack:
+        cat_file = None
+        for fn, entry in zip(filenames, staged):
+            if deadline is not None and time.monotonic() > deadline:
+                stopped = 'time budget exceeded'
+                break
+            if max_violations is not None and len(found) >= max_violations:
+                stopped = f'{max_violations} violation(s) found'
+                break
+            checked += 1
+            kind = None if entry is None else _MODE_KINDS.get(entry.mode)
+            if kind is None:
+                continue
+            if kind in rules:
+                info = _split_git_path(fn) if fn in trusted else _split_path(fn)
+                pattern = rules[kind].match_pattern(info)
+                if pattern is not None:
+                    violation = Violation(fn, f'{kind}:{pattern}', 'mode')
+                    found.append((violation, f'{kind} matching {pattern}', {}))
+            if external_symlinks and kind == 'symlink':
+                if cat_file is None:
+                    cat_file = stack.enter_context(CatFileBatch())
+                target = cat_file.read(entry.oid)
+                if target is None:
+                    continue
+                target_str = target.decode('utf-8', 'surrogateescape')
+                if _symlink_escapes(entry.path, target_str):
+                    violation = Violation(fn, 'external-symlink', 'mode')
+                    description = f'symlink to {target_str} outside the repository'
+                    found.append((violation, description, {'target': target_str}))
+
+    if max_violations is not None:
+        # A path may add two violations, one more than the cap.
+        del found[max_violations:]
+
+    metrics.count('violations', len(found))
+    if found:
+        if report is not None:
+            for violation, _, extra in found:
+                write_report(report, violation, **extra)
+        names = [f'{v.path} ({description})' for v, description, _ in found]
+        print(f"Prohibited file mode(s) found: {', '.join(names)}")
+
+    _print_stopped('Mode check', checked, len(filenames), stopped)
+    return 1 if found or stopped else 0
+
+
+def find_secrets(
+    filenames: Sequence[str],
+    introduced_by: Mapping[str, str] | None = None,
+    *,
+    index_entries: Iterable[IndexEntry] | None = None,
+    max_violations: int | None = None,
+    deadline: float | None = None,
+    report: TextIO | None = None,
+    trusted: Container[str] = (),
+) -> int:
+    """
+    Scan the contents of the given filenames for private keys and credentials.
+
+    Staged regular files are scanned, or the blob in the introducing commit
+    for filenames listed in `introduced_by`. All blobs are streamed in fixed
+    size chunks through a single `git cat-file --batch` process, so even
+    huge blobs are never held in memory. The process is only started if
+    there is a blob to scan.
+
+    `index_entries` work as for `find_prohibited_modes`, `max_violations`,
+    `deadline`, `report` and `trusted` as for `find_oversized`; a scan cut
+    short by the deadline fails.
+    """
+    introduced_by = introduced_by or {}
+    staged = _staged_entries(
+        filenames, index_entries, trusted=trusted, exclude=introduced_by
+    )
+
+    found = []
+    stopped = None
+    checked = 0
+    with contextlib.ExitStack() as stack:
+        cat_file = None
+        for fn, entry in zip(filenames, staged):
+            if deadline is not None and time.monotonic() > deadline:
+                stopped = 'time budget exceeded'
+                break
+            if max_violations is not None and len(found) >= max_violations:
+                stopped = f'{max_violations} violation(s) found'
+                break
+            checked += 1
+            if fn in introduced_by:
+                obj = f'{introduced_by[fn]}:{fn}'
+            elif entry is not None and entry.mode & 0o170000 == 0o100000:
+                obj = entry.oid
+            else:
+                continue
+            if cat_file is None:
+                cat_file = stack.enter_context(CatFileBatch())
+            chunks = cat_file.iter_chunks(obj, _SIGNATURE_CHUNK_SIZE)
+            with contextlib.closing(chunks):
+                signature = _scan_chunks(chunks)
+            if signature is not None:
+                found.append(Violation(fn, signature, 'content'))
+
+    metrics.count('violations', len(found))
+    if found:
+        if report is not None:
+            for violation in found:
+                write_report(report, violation)
+        names = [f'{v.path} ({v.rule})' for v in found]
+        print(f"Secret signature(s) found: {', '.join(names)}")
+
+    _print_stopped('Content scan', checked, len(filenames), stopped)
+    return 1 if found or stopped else 0
+
+
+class _AllPaths:
+    """Contains every path, for `trusted` when all filenames come from git."""
+
+    def __contains__(self, path: object) -> bool:
+        return True
+
+
+_ALL_PATHS = _AllPaths()
+
+
+def open_denylist(
+    parser: argparse.ArgumentParser, filename: str | None, stack: contextlib.ExitStack
+) -> DenyList | None:
+    """Open the deny-list index, if any, closing it with `stack`."""
+    if not filename:
+        return None
+    try:
+        denylist = DenyList(filename)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    stack.callback(denylist.close)
+    return denylist
+
+
+def _rules_fingerprint(args: argparse.Namespace) -> str:
+    """Identify the filename rules, so a state file is only used for them."""
+    rules: list[Any] = [args.prohibited_filenames, args.prohibited_patterns]
+    if args.prohibited_filenames_index:
+        st = os.stat(args.prohibited_filenames_index)
+        index = os.path.abspath(args.prohibited_filenames_index)
+        rules.append([index, st.st_size, st.st_mtime_ns])
+    return hashlib.sha256(json.dumps(rules).encode()).hexdigest()
+
+
+def watch(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+    """
+    Keep the violations of the working tree in the state file until stopped.
+
+    The whole repository is watched, wherever the watcher is started, and
+    paths are relative to its top level. Only added paths are matched, and
+    problems are reported as they appear. The state file is removed when the
+    watcher is interrupted.
+    """
+    if args.watch_interval <= 0:
+        parser.error('--watch-interval must be positive')
+    with contextlib.ExitStack() as stack:
+        denylist = open_denylist(parser, args.prohibited_filenames_index, stack)
+        ruleset = Ruleset(args.prohibited_filenames, args.prohibited_patterns, denylist)
+        if not ruleset:
+            parser.error('--watch requires prohibited filenames, patterns or an index')
+        rules_fp = _rules_fingerprint(args)
+
+        root = toplevel()
+        if root is None:
+            parser.error('--watch must be run inside a git repository')
+        tree = WorkingTree(root)
+        violations: dict[str, list[Violation]] = {}
+        try:
+            while True:
+                scanned_at = time.time_ns()
+                added, removed = tree.poll()
+                for path in removed:
+                    violations.pop(path, None)
+                new = []
+                for path in added:
+                    found = ruleset.match_path(path, trusted=True)
+                    if found:
+                        violations[path] = found
+                        new.append(path)
+                if new:
+                    print(f"Prohibited filename(s) found: {', '.join(new)}", flush=True)
+                write_state(
+                    args.state_file,
+                    {
+                        'fingerprint': rules_fp,
+                        'root': root,
+                        'scanned_at': scanned_at,
+                        'heartbeat': time.time(),
+                        'interval': args.watch_interval,
+                        'pruned': sorted(tree.pruned),
+                        'violations': [
+                            v._asdict() for found in violations.values() for v in found
+                        ],
+                    },
+                )
+                time.sleep(args.watch_interval)
+        except KeyboardInterrupt:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(args.state_file)
     return 0
 
 
-def main(argv: Sequence[str] | None = None) -> int:
-    parser = argparse.ArgumentParser()
+def add_rule_arguments(parser: argparse._ActionsContainer) -> None:
+    """Add the options defining a `Ruleset` to `parser`."""
     parser.add_argument(
         '--prohibited-filenames',
         '--filenames',
@@ -177,18 +1195,257 @@ def main(argv: Sequence[str] | None = None) -> int:
         default=[],
         help='Glob-style patterns to prohibit (e.g., `*.pem`, `**/secrets/*`)',
     )
+    parser.add_argument(
+        '--prohibited-filenames-index',
+        metavar='FILE',
+        help='Deny-list index built with `build-prohibited-filenames-index`',
+    )
+
+
+def add_arguments(parser: argparse._ActionsContainer) -> None:
+    """Add the options of this hook, except the filenames, to `parser`."""
+    add_rule_arguments(parser)
+    parser.add_argument(
+        '--size-limits',
+        action=CommaSeparatedList,
+        default=[],
+        help='Maximum blob sizes per pattern, first match wins (e.g., `*.csv=10MB`)',
+    )
+    parser.add_argument(
+        '--prohibited-modes',
+        action=CommaSeparatedList,
+        default=[],
+        help='Staged symlinks, executables or gitlinks to prohibit, as KIND:PATTERN '
+        '(e.g., `executable:*.env`, `symlink:*`)',
+    )
+    parser.add_argument(
+        '--no-external-symlinks',
+        action='store_true',
+        help='Prohibit staged symlinks pointing outside of the repository',
+    )
+    parser.add_argument(
+        '--scan-content',
+        action='store_true',
+        help='Scan file contents for private keys and credentials',
+    )
+    parser.add_argument(
+        '--fail-fast',
+        action='store_true',
+        help='Stop at the first violation',
+    )
+    parser.add_argument(
+        '--max-violations',
+        type=int,
+        metavar='N',
+        help='Stop each check after N violations',
+    )
+    parser.add_argument(
+        '--time-budget',
+        type=int,
+        metavar='MS',
+        help='Stop checking after MS milliseconds and fail with a partial result',
+    )
+    parser.add_argument(
+        '--shard',
+        metavar='INDEX/COUNT',
+        help='Only check the paths of shard INDEX (1-based) out of COUNT',
+    )
+    parser.add_argument(
+        '--report',
+        metavar='FILE',
+        help='Write violations to FILE as JSON lines',
+    )
+    parser.add_argument(
+        '--range',
+        dest='rev_range',
+        metavar='A..B',
+        help='Also check every path added by the commits in the revision range',
+    )
+    parser.add_argument(
+        '--index',
+        action='store_true',
+        help='Also check every path in the git index (tracked and staged files)',
+    )
+    parser.add_argument(
+        '--state-file',
+        metavar='FILE',
+        help='Take filename violations from the state file of a running `--watch`',
+    )
+
+
+def validate(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    """
+    Report invalid options in `args` via `parser`.
+
+    The deny-list index is opened once as well, so that `check` does not run
+    into option errors later, e.g. in a worker thread.
+    """
+    try:
+        for limit in args.size_limits:
+            _parse_size_limit(limit)
+        for rule in args.prohibited_modes:
+            _parse_mode_rule(rule)
+        if args.shard:
+            _parse_shard(args.shard)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.max_violations is not None and args.max_violations < 1:
+        parser.error('--max-violations must be at least 1')
+    if args.time_budget is not None and args.time_budget < 1:
+        parser.error('--time-budget must be at least 1')
+    with contextlib.ExitStack() as stack:
+        open_denylist(parser, args.prohibited_filenames_index, stack)
+
+
+def check(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    *,
+    index_entries: Sequence[IndexEntry] | None = None,
+) -> int:
+    """
+    Run the checks selected by `args`, which `validate` has accepted.
+
+    The git index is read as needed unless its entries are given as
+    `index_entries`.
+    """
+    size_limits = [_parse_size_limit(limit) for limit in args.size_limits]
+    mode_rules = [_parse_mode_rule(rule) for rule in args.prohibited_modes]
+    shard = _parse_shard(args.shard) if args.shard else None
+
+    max_violations = 1 if args.fail_fast else args.max_violations
+    deadline = None
+    if args.time_budget is not None:
+        deadline = time.monotonic() + args.time_budget / 1000
+
+    # Paths reported by git are normalized already.
+    git_paths: Container[str]
+    filenames: Sequence[str]
+    introduced_by = None
+    if args.index and not args.rev_range and not args.filenames:
+        # A full-tree scan, which may well be millions of paths: keep them in
+        # a compact store. Conflict stages of a path are adjacent.
+        entries = read_index(*index_file()) if index_entries is None else index_entries
+        paths = (e.path for e in entries if e.mode != MODE_TREE)
+        paths = (path for path, _ in itertools.groupby(paths))
+        if shard is not None:
+            index, count = shard
+            paths = (path for path in paths if _shard_of(path, count) == index - 1)
+        filenames = PathStore(paths)
+        git_paths = _ALL_PATHS
+    else:
+        git_paths = {}
+        if args.rev_range:
+            try:
+                introduced_by = introduced_files(args.rev_range)
+            except CalledProcessError as e:
+                # The stderr of git, e.g. "fatal: bad revision 'nope..HEAD'".
+                stderr = e.args[4].decode(errors='replace').strip()
+                parser.error(f'--range {args.rev_range}: {stderr}')
+            git_paths.update(dict.fromkeys(introduced_by))
+        if args.index:
+            if index_entries is None:
+                entries = read_index(*index_file())
+            else:
+                entries = index_entries
+            git_paths.update((e.path, None) for e in entries if e.mode != MODE_TREE)
+        filenames = [*git_paths, *(fn for fn in args.filenames if fn not in git_paths)]
+        if shard is not None:
+            index, count = shard
+            filenames = [fn for fn in filenames if _shard_of(fn, count) == index - 1]
+    metrics.count('paths_checked', len(filenames))
+
+    with contextlib.ExitStack() as stack:
+        denylist = open_denylist(parser, args.prohibited_filenames_index, stack)
+        state = None
+        if args.state_file:
+            state = WatchState.load(args.state_file, _rules_fingerprint(args))
+        report = None
+        if args.report:
+            report = stack.enter_context(open(args.report, 'w', encoding='utf-8'))
+
+        rc = find_prohibited(
+            args.prohibited_filenames,
+            args.prohibited_patterns,
+            filenames,
+            introduced_by,
+            denylist,
+            max_violations=max_violations,
+            deadline=deadline,
+            report=report,
+            trusted=git_paths,
+            state=state,
+        )
+        if size_limits and not (rc and args.fail_fast):
+            rc |= find_oversized(
+                size_limits,
+                filenames,
+                introduced_by,
+                max_violations=max_violations,
+                deadline=deadline,
+                report=report,
+                trusted=git_paths,
+            )
+        if (mode_rules or args.no_external_symlinks) and not (rc and args.fail_fast):
+            rc |= find_prohibited_modes(
+                mode_rules,
+                filenames,
+                external_symlinks=args.no_external_symlinks,
+                index_entries=index_entries,
+                max_violations=max_violations,
+                deadline=deadline,
+                report=report,
+                trusted=git_paths,
+            )
+        if args.scan_content and not (rc and args.fail_fast):
+            rc |= find_secrets(
+                filenames,
+                introduced_by,
+                index_entries=index_entries,
+                max_violations=max_violations,
+                deadline=deadline,
+                report=report,
+                trusted=git_paths,
+            )
+    return rc
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser()
+    add_arguments(parser)
     parser.add_argument(
         'filenames',
-        nargs='+',
+        nargs='*',
         help='Filenames to check against the prohibited list',
     )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Watch the working tree and keep its violations in `--state-file`',
+    )
+    parser.add_argument(
+        '--watch-interval',
+        type=float,
+        default=1.0,
+        metavar='SECONDS',
+        help='Poll the working tree every SECONDS in `--watch` mode',
+    )
+    parser.add_argument(
+        '--metrics-file',
+        metavar='FILE',
+        help='Add the timings and counts of this run to FILE as OpenMetrics text',
+    )
     args = parser.parse_args(argv)
 
-    return find_prohibited(
-        args.prohibited_filenames,
-        args.prohibited_patterns,
-        args.filenames,
-    )
+    if args.watch:
+        if not args.state_file:
+            parser.error('--watch requires --state-file')
+        return watch(parser, args)
+    if not args.filenames and not args.rev_range and not args.index:
+        parser.error('the following arguments are required: filenames')
+    validate(parser, args)
+    with metrics.recorded(args.metrics_file, 'check-prohibited-filenames'):
+        return check(parser, args)
 
 
 if __name__ == '__main__':
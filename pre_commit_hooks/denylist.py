@@ -0,0 +1,278 @@
+#  Copyright 2025 T-Systems International GmbH
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice, this
+#     list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its
+#     contributors may be used to endorse or promote products derived from
+#     this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Memory-mapped deny-lists for very large sets of prohibited filenames.
+
+A deny-list index is built once from a plain text list and then opened in
+constant time: a Bloom filter rejects almost all keys without touching the
+rest of the file, and only candidate hits are confirmed against a sorted
+table stored in the same file.
+
+Index layout (all integers little-endian)::
+
+    header   magic, version, flags, number of hash functions,
+             number of filter bits, number of entries
+    filter   Bloom filter bits, padded to a multiple of 8 bytes
+    offsets  (entries + 1) 64-bit offsets into the key table
+    keys     UTF-8 encoded keys, sorted bytewise
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import math
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Iterable, Sequence
+from typing import BinaryIO
+
+MAGIC = b'PCHDENY\0'
+VERSION = 1
+FLAG_CASEFOLD = 0x1
+FLAG_FINGERPRINTS = 0x2
+FINGERPRINT_PREFIX = 'sha256:'
+
+_HEADER = struct.Struct('<8sIIIIQQ')
+_OFFSET = struct.Struct('<Q')
+
+
+def _hashes(key: bytes) -> tuple[int, int]:
+    """Return the two base hashes used for double hashing."""
+    digest = hashlib.blake2b(key, digest_size=16).digest()
+    return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little')
+
+
+def _filter_size(entries: int, false_positive_rate: float) -> tuple[int, int]:
+    """Return the optimal number of filter bits and hash functions."""
+    entries = max(entries, 1)
+    bits = math.ceil(-entries * math.log(false_positive_rate) / math.log(2) ** 2)
+    bits = max(64, (bits + 63) // 64 * 64)
+    return bits, max(1, round(bits / entries * math.log(2)))
+
+
+def fingerprint(path: str) -> str:
+    """Return the deny-list key for a hashed path fingerprint."""
+    encoded = path.encode('utf-8', 'surrogateescape')
+    return FINGERPRINT_PREFIX + hashlib.sha256(encoded).hexdigest()
+
+
+def build(
+    entries: Iterable[str],
+    out: BinaryIO,
+    *,
+    casefold: bool = False,
+    false_positive_rate: float = 0.001,
+) -> int:
+    """
+    Write a deny-list index for `entries` to the binary file `out`.
+
+    With `casefold`, keys are stored and looked up case-insensitively.
+    Returns the number of distinct entries written.
+    """
+    keys = {e.casefold() if casefold else e for e in entries}
+    encoded = sorted(k.encode('utf-8', 'surrogateescape') for k in keys)
+    flags = FLAG_CASEFOLD if casefold else 0
+    if any(k.startswith(FINGERPRINT_PREFIX) for k in keys):
+        flags |= FLAG_FINGERPRINTS
+
+    num_bits, num_hashes = _filter_size(len(encoded), false_positive_rate)
+    bloom = bytearray(num_bits // 8)
+    for key in encoded:
+        h1, h2 = _hashes(key)
+        for i in range(num_hashes):
+            bit = (h1 + i * h2) % num_bits
+            bloom[bit >> 3] |= 1 << (bit & 7)
+
+    out.write(
+        _HEADER.pack(MAGIC, VERSION, flags, num_hashes, 0, num_bits, len(encoded))
+    )
+    out.write(bloom)
+    offset = 0
+    out.write(_OFFSET.pack(offset))
+    for key in encoded:
+        offset += len(key)
+        out.write(_OFFSET.pack(offset))
+    for key in encoded:
+        out.write(key)
+    return len(encoded)
+
+
+class DenyList:
+    """
+    Read-only view of a memory-mapped deny-list index.
+
+    Instances are immutable after opening and safe to share between threads.
+    """
+
+    def __init__(self, filename: str) -> None:
+        with open(filename, 'rb') as f:
+            if not os.fstat(f.fileno()).st_size:
+                raise ValueError(f'Not a deny-list index: {filename}')
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, flags, num_hashes, _, num_bits, entries = (
+                _HEADER.unpack_from(self._mm)
+            )
+        except struct.error:
+            magic, version = b'', 0
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f'Not a deny-list index: {filename}')
+        try:
+            self._check_size(num_hashes, num_bits, entries)
+        except ValueError as e:
+            self._mm.close()
+            raise ValueError(f'Corrupt deny-list index {filename}: {e}') from None
+        self.casefold = bool(flags & FLAG_CASEFOLD)
+        self.has_fingerprints = bool(flags & FLAG_FINGERPRINTS)
+        self._num_hashes = num_hashes
+        self._num_bits = num_bits
+        self._entries = entries
+        self._bloom_start = _HEADER.size
+        self._offsets_start = self._bloom_start + num_bits // 8
+        self._keys_start = self._offsets_start + (entries + 1) * _OFFSET.size
+
+    def _check_size(self, num_hashes: int, num_bits: int, entries: int) -> None:
+        """Check that the header and the offsets fit the mapped file."""
+        size = len(self._mm)
+        if not num_hashes or not num_bits or num_bits % 64:
+            raise ValueError('invalid filter parameters')
+        offsets_start = _HEADER.size + num_bits // 8
+        keys_start = offsets_start + (entries + 1) * _OFFSET.size
+        if keys_start > size:
+            raise ValueError(f'expected at least {keys_start} bytes, got {size}')
+        first, = _OFFSET.unpack_from(self._mm, offsets_start)
+        last, = _OFFSET.unpack_from(self._mm, keys_start - _OFFSET.size)
+        if first != 0 or keys_start + last != size:
+            raise ValueError(
+                f'expected {keys_start + last} bytes of keys, got {size}'
+            )
+
+    def __enter__(self) -> DenyList:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._entries
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        if self.casefold:
+            key = key.casefold()
+        encoded = key.encode('utf-8', 'surrogateescape')
+        return self._maybe_contains(encoded) and self._table_contains(encoded)
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def _maybe_contains(self, key: bytes) -> bool:
+        """Bloom filter test: `False` means the key is definitely absent."""
+        mm, start, num_bits = self._mm, self._bloom_start, self._num_bits
+        h1, h2 = _hashes(key)
+        for i in range(self._num_hashes):
+            bit = (h1 + i * h2) % num_bits
+            if not mm[start + (bit >> 3)] & (1 << (bit & 7)):
+                return False
+        return True
+
+    def _key(self, i: int) -> bytes:
+        pos = self._offsets_start + i * _OFFSET.size
+        begin, end = struct.unpack_from('<QQ', self._mm, pos)
+        return self._mm[self._keys_start + begin : self._keys_start + end]
+
+    def _table_contains(self, key: bytes) -> bool:
+        """Binary search the sorted key table."""
+        lo, hi = 0, self._entries
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo < self._entries and self._key(lo) == key
+
+
+def _read_entries(f: Iterable[str]) -> Iterable[str]:
+    """Yield the entries of a text deny-list, skipping blanks and comments."""
+    for line in f:
+        entry = line.strip()
+        if entry and not entry.startswith('#'):
+            yield entry
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Build a deny-list index for check-prohibited-filenames.',
+    )
+    parser.add_argument(
+        'source',
+        help='Text file with one filename or `sha256:<hex>` path fingerprint '
+        'per line, or `-` for stdin',
+    )
+    parser.add_argument('output', help='Index file to write')
+    parser.add_argument(
+        '--casefold',
+        action='store_true',
+        help='Match filenames case-insensitively',
+    )
+    parser.add_argument(
+        '--false-positive-rate',
+        type=float,
+        default=0.001,
+        help='Bloom filter false positive rate (default: %(default)s)',
+    )
+    args = parser.parse_args(argv)
+
+    if not 0 < args.false_positive_rate < 1:
+        parser.error('--false-positive-rate must be between 0 and 1')
+
+    if args.source == '-':
+        entries = list(_read_entries(sys.stdin))
+    else:
+        with open(args.source, encoding='utf-8') as f:
+            entries = list(_read_entries(f))
+
+    with open(args.output, 'wb') as out:
+        count = build(
+            entries,
+            out,
+            casefold=args.casefold,
+            false_positive_rate=args.false_positive_rate,
+        )
+    print(f'Wrote {count} entries to {args.output}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,214 @@
+#  Copyright 2025 T-Systems International GmbH
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice, this
+#     list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its
+#     contributors may be used to endorse or promote products derived from
+#     this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from collections.abc import Iterator
+from typing import NamedTuple
+
+from pre_commit_hooks.util import cmd_output, zsplit
+
+MODE_TREE = 0o040000
+MODE_SYMLINK = 0o120000
+MODE_GITLINK = 0o160000
+MODE_EXECUTABLE = 0o100755
+
+_HEADER = struct.Struct('>4sII')
+_MODE = struct.Struct('>I')
+_FLAGS = struct.Struct('>H')
+_EXTENSION = struct.Struct('>4sI')
+# ctime, mtime (8 bytes each), dev, ino, mode, uid, gid, size (4 bytes each)
+_STAT_SIZE = 40
+_MODE_OFFSET = 24
+_FLAG_EXTENDED = 0x4000
+_NAME_MASK = 0xFFF
+_HASH_SIZES = {'sha1': 20, 'sha256': 32}
+
+
+class IndexEntry(NamedTuple):
+    path: str
+    mode: int
+    oid: str
+    stage: int
+
+
+# The git command locating the index, see `parse_index_file`.
+INDEX_FILE_CMD = ('git', 'rev-parse', '--git-path', 'index', '--show-object-format')
+
+
+def index_file(repo: str = '.') -> tuple[str, int]:
+    """
+    Locate the index of the repository at `repo`.
+
+    Returns the index filename and the object hash size in bytes. Honours
+    `GIT_INDEX_FILE` and linked worktrees.
+    """
+    return parse_index_file(cmd_output(*INDEX_FILE_CMD, cwd=repo), repo)
+
+
+def parse_index_file(out: str, repo: str = '.') -> tuple[str, int]:
+    """Parse the output of `INDEX_FILE_CMD` run in `repo` like `index_file`."""
+    filename, object_format = out.splitlines()
+    return os.path.join(repo, filename), _HASH_SIZES[object_format]
+
+
+def _varint(mm: mmap.mmap, pos: int) -> tuple[int, int]:
+    """Decode git's offset varint at `pos`, returning value and end position."""
+    c = mm[pos]
+    pos += 1
+    value = c & 0x7F
+    while c & 0x80:
+        c = mm[pos]
+        pos += 1
+        value = ((value + 1) << 7) | (c & 0x7F)
+    return value, pos
+
+
+def read_index(
+    filename: str, hash_size: int = 20, repo: str = '.'
+) -> Iterator[IndexEntry]:
+    """
+    Lazily yield the entries of a git index file (versions 2, 3 and 4).
+
+    The file is memory-mapped and decoded one entry at a time, so scanning
+    stops costing anything as soon as the caller stops iterating. A missing
+    or empty index has no entries.
+
+    The entries of a split index (`core.splitIndex`) are spread over the
+    index and a shared index, so they are listed with `git ls-files` run in
+    `repo` instead.
+    """
+    try:
+        f = open(filename, 'rb')
+    except FileNotFoundError:
+        return
+    with f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            split = _is_split_index(mm, filename, hash_size)
+            if not split:
+                yield from _read_entries(mm, filename, hash_size)
+    if split:
+        yield from _ls_files(filename, repo)
+
+
+def _is_split_index(mm: mmap.mmap, filename: str, hash_size: int) -> bool:
+    """
+    Check if the index has a `link` extension, i.e. is a split index.
+
+    Shared indexes are written next to the index, so the entries are only
+    skipped to look at the extensions if there are any.
+    """
+    directory = os.path.dirname(filename) or '.'
+    if not any(name.startswith('sharedindex.') for name in os.listdir(directory)):
+        return False
+    pos = _skip_entries(mm, filename, hash_size)
+    end = len(mm) - hash_size
+    while pos + _EXTENSION.size <= end:
+        signature, size = _EXTENSION.unpack_from(mm, pos)
+        if signature == b'link':
+            return True
+        pos += _EXTENSION.size + size
+    return False
+
+
+def _ls_files(filename: str, repo: str) -> Iterator[IndexEntry]:
+    """Yield the entries of the index `filename` as listed by `git ls-files`."""
+    env = {**os.environ, 'GIT_INDEX_FILE': os.path.abspath(filename)}
+    out = cmd_output('git', 'ls-files', '--stage', '-z', cwd=repo, env=env)
+    for line in zsplit(out):
+        info, path = line.split('\t', 1)
+        mode, oid, stage = info.split()
+        yield IndexEntry(path, int(mode, 8), oid, int(stage))
+
+
+def _header(mm: mmap.mmap, filename: str) -> tuple[int, int]:
+    """Return the version and number of entries of the index."""
+    signature, version, count = _HEADER.unpack_from(mm)
+    if signature != b'DIRC' or version not in (2, 3, 4):
+        raise ValueError(f'Unsupported git index: {filename}')
+    return version, count
+
+
+def _skip_entries(mm: mmap.mmap, filename: str, hash_size: int) -> int:
+    """Return the position of the first extension, after all entries."""
+    version, count = _header(mm, filename)
+    pos = _HEADER.size
+    flags_start = _STAT_SIZE + hash_size
+    for _ in range(count):
+        (flags,) = _FLAGS.unpack_from(mm, pos + flags_start)
+        name = pos + flags_start + _FLAGS.size
+        if version >= 3 and flags & _FLAG_EXTENDED:
+            name += _FLAGS.size
+        if version == 4:
+            _, name = _varint(mm, name)
+            pos = mm.find(b'\0', name) + 1
+        else:
+            length = flags & _NAME_MASK
+            end = name + length if length < _NAME_MASK else mm.find(b'\0', name)
+            pos += (end - pos + 8) & ~7
+    return pos
+
+
+def _read_entries(
+    mm: mmap.mmap, filename: str, hash_size: int
+) -> Iterator[IndexEntry]:
+    version, count = _header(mm, filename)
+    pos = _HEADER.size
+    oid_start = _STAT_SIZE
+    flags_start = oid_start + hash_size
+    path = b''
+    for _ in range(count):
+        (mode,) = _MODE.unpack_from(mm, pos + _MODE_OFFSET)
+        oid = mm[pos + oid_start : pos + flags_start].hex()
+        (flags,) = _FLAGS.unpack_from(mm, pos + flags_start)
+        name = pos + flags_start + _FLAGS.size
+        if version >= 3 and flags & _FLAG_EXTENDED:
+            name += _FLAGS.size
+
+        if version == 4:
+            strip, name = _varint(mm, name)
+            end = mm.find(b'\0', name)
+            path = path[: len(path) - strip] + mm[name:end]
+            pos = end + 1
+        else:
+            length = flags & _NAME_MASK
+            end = name + length if length < _NAME_MASK else mm.find(b'\0', name)
+            path = mm[name:end]
+            # Entries are NUL-padded to a multiple of 8 bytes (1 to 8 NULs).
+            pos += (end - pos + 8) & ~7
+
+        if not path:
+            # Entries of a split index replacing those of the shared index.
+            raise ValueError(f'Unsupported split git index: {filename}')
+        yield IndexEntry(
+            path.decode('utf-8', 'surrogateescape'), mode, oid, (flags >> 12) & 3
+        )
@@ -0,0 +1,189 @@
+#  Copyright 2025 T-Systems International GmbH
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice, this
+#     list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its
+#     contributors may be used to endorse or promote products derived from
+#     this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Run metrics of the hooks, written as OpenMetrics text.
+
+The checks count what they do with `count`, and `recorded` writes the counts
+of a run together with its duration to a file read by e.g. the textfile
+collector of the Prometheus node exporter. Counters and histograms in the
+file accumulate over all runs writing to it.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+PREFIX = 'pre_commit_hooks_'
+
+# Counter names (without prefix and `_total` suffix) and their help texts.
+COUNTERS = {
+    'paths_checked': 'Paths checked.',
+    'violations': 'Violations found.',
+    'git_subprocess_seconds': 'Wall time git subprocesses were running.',
+    'component_cache_hits': 'Path component lookups answered by the glob cache.',
+    'component_cache_lookups': 'Path component lookups in the glob cache.',
+}
+DURATION = 'run_duration_seconds'
+DURATION_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_SAMPLE_RE = re.compile(r'^(\w+)\{hook="([^"\\]*)"(?:,le="([^"]*)")?\} (\S+)$')
+
+_lock = threading.Lock()
+_counts: Counter[str] = Counter()
+
+
+def count(name: str, value: float = 1) -> None:
+    """Add `value` to the counter `name` of the current run."""
+    with _lock:
+        _counts[name] += value
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if value == int(value) else repr(value)
+
+
+def _format_le(bound: float) -> str:
+    return '+Inf' if bound == float('inf') else repr(bound)
+
+
+def _read_samples(filename: str) -> dict[tuple[str, str, str | None], float]:
+    """Read the samples of a previously written file, keyed by name and labels."""
+    samples = {}
+    try:
+        f = open(filename, encoding='utf-8')
+    except FileNotFoundError:
+        return samples
+    with f:
+        for line in f:
+            m = _SAMPLE_RE.match(line)
+            if m:
+                name, hook, le, value = m.groups()
+                try:
+                    samples[(name, hook, le)] = float(value)
+                except ValueError:
+                    continue
+    return samples
+
+
+def render(samples: dict[tuple[str, str, str | None], float]) -> str:
+    """Render samples keyed by name, hook and bucket bound as OpenMetrics text."""
+    hooks = sorted({hook for _, hook, _ in samples})
+    lines = []
+    name = PREFIX + DURATION
+    lines.append(f'# HELP {name} Duration of hook runs.')
+    lines.append(f'# TYPE {name} histogram')
+    lines.append(f'# UNIT {name} seconds')
+    for hook in hooks:
+        for bound in (*DURATION_BUCKETS, float('inf')):
+            le = _format_le(bound)
+            value = samples.get((f'{name}_bucket', hook, le), 0)
+            lines.append(
+                f'{name}_bucket{{hook="{hook}",le="{le}"}} {_format_value(value)}'
+            )
+        for suffix in ('_count', '_sum'):
+            value = samples.get((name + suffix, hook, None), 0)
+            lines.append(f'{name}{suffix}{{hook="{hook}"}} {_format_value(value)}')
+    for counter, help_text in COUNTERS.items():
+        name = PREFIX + counter
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} counter')
+        for hook in hooks:
+            value = samples.get((f'{name}_total', hook, None), 0)
+            lines.append(f'{name}_total{{hook="{hook}"}} {_format_value(value)}')
+    lines.append('# EOF')
+    return '\n'.join(lines) + '\n'
+
+
+def write(filename: str, hook: str, duration: float, counts: Counter[str]) -> None:
+    """
+    Add a run of `hook` to the metrics in `filename`.
+
+    The file is replaced atomically, so readers never see a partial file.
+    Where available, concurrent runs are serialized with a lock file, so no
+    run is lost.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    with contextlib.ExitStack() as stack:
+        if fcntl is not None:
+            lock = stack.enter_context(open(f'{filename}.lock', 'a'))
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        samples = _read_samples(filename)
+
+        name = PREFIX + DURATION
+        for bound in (*DURATION_BUCKETS, float('inf')):
+            if duration <= bound:
+                key = (f'{name}_bucket', hook, _format_le(bound))
+                samples[key] = samples.get(key, 0) + 1
+        for suffix, value in (('_count', 1), ('_sum', duration)):
+            key = (name + suffix, hook, None)
+            samples[key] = samples.get(key, 0) + value
+        for counter in COUNTERS:
+            key = (f'{PREFIX}{counter}_total', hook, None)
+            samples[key] = samples.get(key, 0) + counts[counter]
+
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix='.metrics-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(render(samples))
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, filename)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+@contextlib.contextmanager
+def recorded(filename: str | None, hook: str) -> Iterator[None]:
+    """
+    Count a run of `hook` and write its metrics to `filename` when it ends.
+
+    Runs that raise are written as well. Without `filename`, nothing is
+    written.
+    """
+    with _lock:
+        _counts.clear()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if filename:
+            with _lock:
+                counts = _counts.copy()
+            write(filename, hook, time.perf_counter() - start, counts)
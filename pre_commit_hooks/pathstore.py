@@ -0,0 +1,167 @@
+#  Copyright 2025 T-Systems International GmbH
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice, this
+#     list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its
+#     contributors may be used to endorse or promote products derived from
+#     this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from typing import overload
+
+
+class PathStore(Sequence[str]):
+    """
+    A compact sequence of git-normalized paths for full-tree scans.
+
+    Directories are interned: every distinct directory name is stored once
+    and numbered, and every distinct directory once as the run of IDs of its
+    names. Basenames are mostly unique, so they are packed as UTF-8 into a
+    single buffer. A path costs its directory ID, an offset and the bytes of
+    its basename instead of a string object, and matchers can work on the
+    IDs and memoize their verdicts per directory name.
+
+    >>> store = PathStore(['src/main.py', 'src/util/io.py'])
+    >>> list(store.ids(1)), store.names, store.basename(1)
+    ([0, 1], ['src', 'util'], 'io.py')
+    >>> store[0]
+    'src/main.py'
+    """
+
+    __slots__ = (
+        '_ids',
+        '_names',
+        '_directories',
+        '_components',
+        '_offsets',
+        '_last_directory',
+        '_directory_of',
+        '_basenames',
+        '_basename_offsets',
+    )
+
+    def __init__(self, paths: Iterable[str] = ()) -> None:
+        self._ids: dict[str, int] = {}
+        self._names: list[str] = []
+        # Directory IDs by parent directory ID and name ID, packed into one
+        # int; directory 0 is the root.
+        self._directories: dict[int, int] = {}
+        # Directory i is self._components[self._offsets[i]:self._offsets[i + 1]].
+        self._components = array('I')
+        self._offsets = array('I', [0, 0])
+        # Paths usually come sorted, so most share the previous directory.
+        self._last_directory = ('', 0)
+        self._directory_of = array('I')
+        # Basename i is self._basenames[self._basename_offsets[i]:...[i + 1]].
+        self._basenames = bytearray()
+        self._basename_offsets = array('I', [0])
+        for path in paths:
+            self.append(path)
+
+    def append(self, path: str) -> None:
+        """Add a relative, `/`-separated, normalized path."""
+        directory, _, basename = path.rpartition('/')
+        last, index = self._last_directory
+        if directory != last:
+            index = self._intern(directory)
+            self._last_directory = (directory, index)
+        self._directory_of.append(index)
+        self._basenames += basename.encode('utf-8', 'surrogateescape')
+        self._basename_offsets.append(len(self._basenames))
+
+    def _intern(self, directory: str) -> int:
+        """Return the ID of `directory`, adding it and its parents as needed."""
+        ids = self._ids
+        names = self._names
+        directories = self._directories
+        components = self._components
+        offsets = self._offsets
+        index = 0
+        for name in directory.split('/') if directory else ():
+            component = ids.get(name)
+            if component is None:
+                component = ids[name] = len(names)
+                names.append(name)
+            key = index << 32 | component
+            child = directories.get(key)
+            if child is None:
+                child = directories[key] = len(offsets) - 1
+                components.extend(components[offsets[index] : offsets[index + 1]])
+                components.append(component)
+                offsets.append(len(components))
+            index = child
+        return index
+
+    @property
+    def names(self) -> list[str]:
+        """The distinct directory names, indexed by ID. Must not be modified."""
+        return self._names
+
+    def ids(self, index: int) -> array[int]:
+        """Return the IDs of the directory names of the path at `index`."""
+        directory = self._directory_of[index]
+        return self._components[self._offsets[directory] : self._offsets[directory + 1]]
+
+    def basename(self, index: int) -> str:
+        """Return the basename of the path at `index`."""
+        offsets = self._basename_offsets
+        return self._basenames[offsets[index] : offsets[index + 1]].decode(
+            'utf-8', 'surrogateescape'
+        )
+
+    def __len__(self) -> int:
+        return len(self._directory_of)
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[str]: ...
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('PathStore index out of range')
+        names = self._names
+        parts = [names[i] for i in self.ids(index)]
+        parts.append(self.basename(index))
+        return '/'.join(parts)
+
+    def __iter__(self) -> Iterator[str]:
+        names = self._names
+        components = self._components
+        offsets = self._offsets
+        prefixes = [
+            ''.join([names[c] + '/' for c in components[offsets[i] : offsets[i + 1]]])
+            for i in range(len(offsets) - 1)
+        ]
+        basenames = self._basenames
+        basename_offsets = self._basename_offsets
+        for i, directory in enumerate(self._directory_of):
+            basename = basenames[basename_offsets[i] : basename_offsets[i + 1]]
+            yield prefixes[directory] + basename.decode('utf-8', 'surrogateescape')
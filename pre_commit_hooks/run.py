@@ -0,0 +1,189 @@
+#  Copyright 2025 T-Systems International GmbH
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice, this
+#     list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its
+#     contributors may be used to endorse or promote products derived from
+#     this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import sys
+import threading
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import TextIO
+
+from pre_commit_hooks import (
+    check_git_user_email,
+    check_portable_filenames,
+    check_prohibited_filenames,
+    metrics,
+)
+from pre_commit_hooks.check_prohibited_filenames import CommaSeparatedList
+from pre_commit_hooks.git_index import INDEX_FILE_CMD, parse_index_file, read_index
+from pre_commit_hooks.util import cmd_outputs
+
+HOOKS = (
+    'check-git-user-email',
+    'check-prohibited-filenames',
+    'check-portable-filenames',
+)
+
+
+class _ThreadOutput(io.TextIOBase):
+    """
+    A stream writing to a buffer of the current thread, if it has one.
+
+    Installed as `sys.stdout`, it keeps the output of concurrent checks apart.
+    """
+
+    def __init__(self, default: TextIO) -> None:
+        self._default = default
+        self._local = threading.local()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        return getattr(self._local, 'buffer', self._default).write(s)
+
+    def capture(
+        self, func: Callable[[], int]
+    ) -> tuple[int, str, BaseException | None]:
+        """
+        Call `func` and return its result and everything it printed.
+
+        An exception raised by `func` is returned as well, so that the output
+        printed before it is not lost.
+        """
+        self._local.buffer = buffer = io.StringIO()
+        try:
+            return func(), buffer.getvalue(), None
+        except BaseException as e:
+            return 1, buffer.getvalue(), e
+        finally:
+            del self._local.buffer
+
+
+def _needs_index(hooks: Sequence[str], args: argparse.Namespace) -> bool:
+    if 'check-portable-filenames' in hooks:
+        return True
+    return 'check-prohibited-filenames' in hooks and bool(
+        args.index
+        or args.prohibited_modes
+        or args.no_external_symlinks
+        or args.scan_content
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Run several hooks in one process, sharing their git queries.'
+    )
+    parser.add_argument(
+        '--hooks',
+        action=CommaSeparatedList,
+        required=True,
+        help=f"Hooks to run, any of {', '.join(HOOKS)}",
+    )
+    check_git_user_email.add_arguments(
+        parser.add_argument_group('check-git-user-email')
+    )
+    check_prohibited_filenames.add_arguments(
+        parser.add_argument_group('check-prohibited-filenames')
+    )
+    parser.add_argument(
+        '--metrics-file',
+        metavar='FILE',
+        help='Add the timings and counts of this run to FILE as OpenMetrics text',
+    )
+    parser.add_argument(
+        'filenames',
+        nargs='*',
+        help='Filenames to check',
+    )
+    args = parser.parse_args(argv)
+
+    hooks = list(dict.fromkeys(args.hooks))
+    unknown = [hook for hook in hooks if hook not in HOOKS]
+    if unknown:
+        parser.error(f"unknown hook(s): {', '.join(unknown)}")
+    # Options are validated up front, as the checks run in worker threads.
+    if 'check-prohibited-filenames' in hooks:
+        check_prohibited_filenames.validate(parser, args)
+
+    with metrics.recorded(args.metrics_file, 'pre-commit-hooks-run'):
+        return _run(parser, args, hooks)
+
+
+def _run(
+    parser: argparse.ArgumentParser, args: argparse.Namespace, hooks: list[str]
+) -> int:
+    # Git data used by several checks is gathered once, concurrently.
+    cmds = {}
+    if 'check-git-user-email' in hooks:
+        cmds['email'] = ('git', 'config', '--default', '', 'user.email')
+    if _needs_index(hooks, args):
+        cmds['index'] = INDEX_FILE_CMD
+    outputs = dict(zip(cmds, cmd_outputs(*cmds.values())))
+    # An unset email is looked up again by the check, which reports it.
+    email = outputs.get('email', '').strip() or None
+    index_entries = None
+    if 'index' in outputs:
+        index_entries = list(read_index(*parse_index_file(outputs['index'])))
+
+    checks: dict[str, Callable[[], int]] = {
+        'check-git-user-email': lambda: check_git_user_email.check(
+            args.allowed_domains, email
+        ),
+        'check-prohibited-filenames': lambda: check_prohibited_filenames.check(
+            parser, args, index_entries=index_entries
+        ),
+        'check-portable-filenames': lambda: check_portable_filenames.check(
+            args.filenames, index_entries
+        ),
+    }
+
+    rc = 0
+    with contextlib.redirect_stdout(_ThreadOutput(sys.stdout)) as out:
+        with ThreadPoolExecutor(max_workers=len(hooks)) as executor:
+            futures = [executor.submit(out.capture, checks[hook]) for hook in hooks]
+    # Output is printed in the order of the hooks, whichever finished first,
+    # and before the error of any failed check is raised.
+    errors = []
+    for future in futures:
+        hook_rc, output, error = future.result()
+        print(output, end='')
+        rc |= hook_rc
+        if error is not None:
+            errors.append(error)
+    if errors:
+        raise errors[0]
+    return rc
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -23,30 +23,339 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import subprocess
-from typing import Any
+import tempfile
+import time
+from collections.abc import Iterator, Sequence
+from typing import Any, Self
+
+from pre_commit_hooks import metrics
 
 
 class CalledProcessError(RuntimeError):
     pass
 
 
+@contextlib.contextmanager
+def _timed() -> Iterator[None]:
+    """Count the wall time of the block as git subprocess time."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.count("git_subprocess_seconds", time.perf_counter() - start)
+
+
 def added_files() -> set[str]:
     cmd = ("git", "diff", "--staged", "--name-only", "--diff-filter=A")
     return set(cmd_output(*cmd).splitlines())
 
 
-def cmd_output(*cmd: str, retcode: int | None = 0, **kwargs: Any) -> str:
+def introduced_files(rev_range: str) -> dict[str, str]:
+    """Map every path added within `rev_range` to the first commit adding it."""
+    cmd = (
+        "git",
+        "log",
+        "--reverse",
+        "--topo-order",
+        "--no-renames",
+        "--diff-filter=A",
+        "--diff-merges=first-parent",
+        "--name-only",
+        "-z",
+        # Two NULs in front of each commit id: paths are never empty, so an
+        # empty field unambiguously announces the next commit header.
+        "--format=%x00%x00%H",
+        rev_range,
+        "--",
+    )
+    introduced: dict[str, str] = {}
+    commit = ""
+    in_header = False
+    first_path = False
+    for field in cmd_output_zstream(*cmd):
+        if not field:
+            in_header = True
+        elif in_header:
+            commit = field
+            in_header = False
+            first_path = True
+        else:
+            if first_path:
+                # git separates the header from the name list with a newline.
+                field = field.removeprefix("\n")
+                first_path = False
+            introduced.setdefault(field, commit)
+    return introduced
+
+
+class _CatFile:
+    """A long-lived `git cat-file` process answering one object at a time."""
+
+    def __init__(self, *cmd: str, **kwargs: Any) -> None:
+        self._cmd = cmd
+        with _timed():
+            self._proc = subprocess.Popen(
+                self._cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                **kwargs,
+            )
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._proc.stdin.close()
+        self._proc.stdout.close()
+        with _timed():
+            self._proc.wait()
+
+    def _request(self, obj: str) -> bytes:
+        """Request `obj` and return the header line of the answer."""
+        with _timed():
+            self._proc.stdin.write(f"{obj}\n".encode())
+            self._proc.stdin.flush()
+            header = self._proc.stdout.readline()
+        if not header:
+            raise CalledProcessError(self._cmd, 0, self._proc.poll(), "", b"")
+        return header
+
+
+class CatFileBatchCheck(_CatFile):
+    """
+    A long-lived `git cat-file --batch-check` process looking up blob sizes.
+
+    Objects are looked up one at a time, so a caller can stop between any
+    two lookups. Objects use revision syntax, e.g. `:0:<path>` for a staged
+    blob.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(
+            "git", "cat-file", "--batch-check=%(objecttype) %(objectsize)", **kwargs
+        )
+
+    def size(self, obj: str) -> int | None:
+        """
+        Return the size of the blob `obj`.
+
+        Returns `None` for objects that do not exist, are no blobs or cannot
+        be expressed on one line.
+        """
+        if "\n" in obj:
+            return None
+        kind, _, size = self._request(obj).rstrip(b"\n").rpartition(b" ")
+        return int(size) if kind == b"blob" else None
+
+
+class CatFileBatch(_CatFile):
+    """
+    A long-lived `git cat-file --batch` process streaming object contents.
+
+    Objects are requested one at a time and read in chunks, so objects of
+    any size can be processed without holding them in memory.
+
+    Only the time spent waiting for git counts as git subprocess time, not
+    that of the consumer of the chunks.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__("git", "cat-file", "--batch", **kwargs)
+
+    def _size(self, obj: str) -> int | None:
+        """Request `obj` and return its size, or `None` if it is missing."""
+        if "\n" in obj:
+            return None
+        header = self._request(obj)
+        if header.endswith((b" missing\n", b" ambiguous\n")):
+            return None
+        return int(header.rsplit(b" ", 1)[1])
+
+    def read(self, obj: str) -> bytes | None:
+        """
+        Return the contents of `obj`, or `None` if it does not exist.
+
+        The whole object is held in memory, so this suits small objects such
+        as symlink targets.
+        """
+        size = self._size(obj)
+        if size is None:
+            return None
+        with _timed():
+            contents = self._proc.stdout.read(size + 1)  # trailing newline
+        if len(contents) != size + 1:
+            raise CalledProcessError(self._cmd, 0, self._proc.poll(), "", b"")
+        return contents[:-1]
+
+    def iter_chunks(self, obj: str, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+        """
+        Yield the contents of `obj` in chunks of at most `chunk_size` bytes.
+
+        Missing objects yield nothing. Stopping early is fine: the rest of
+        the object is skipped before the next request.
+        """
+        size = self._size(obj)
+        if size is None:
+            return
+        remaining = size + 1  # trailing newline
+        try:
+            while remaining > 1:
+                with _timed():
+                    chunk = self._proc.stdout.read(min(chunk_size, remaining - 1))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            with _timed():
+                while remaining > 0:
+                    skipped = self._proc.stdout.read(min(chunk_size, remaining))
+                    if not skipped:
+                        break
+                    remaining -= len(skipped)
+
+
+def cmd_output(
+    *cmd: str, retcode: int | None = 0, input: str | None = None, **kwargs: Any
+) -> str:
     kwargs.setdefault("stdout", subprocess.PIPE)
     kwargs.setdefault("stderr", subprocess.PIPE)
-    proc = subprocess.Popen(cmd, **kwargs)
-    stdout, stderr = proc.communicate()
+    if input is not None:
+        kwargs.setdefault("stdin", subprocess.PIPE)
+    with _timed():
+        proc = subprocess.Popen(cmd, **kwargs)
+        stdout, stderr = proc.communicate(None if input is None else input.encode())
     stdout = stdout.decode()
     if retcode is not None and proc.returncode != retcode:
         raise CalledProcessError(cmd, retcode, proc.returncode, stdout, stderr)
     return stdout
 
 
+async def cmd_output_async(
+    *cmd: str,
+    retcode: int | None = 0,
+    input: str | None = None,
+    timeout: float | None = None,
+    **kwargs: Any,
+) -> str:
+    """
+    Asynchronous `cmd_output` based on `asyncio.create_subprocess_exec`.
+
+    A command running longer than `timeout` seconds is killed and reported
+    as a `CalledProcessError`, even with `retcode=None`. Commands usually run
+    concurrently, so their wall time is counted by the caller (see
+    `cmd_outputs`).
+    """
+    kwargs.setdefault("stdout", subprocess.PIPE)
+    kwargs.setdefault("stderr", subprocess.PIPE)
+    if input is not None:
+        kwargs.setdefault("stdin", subprocess.PIPE)
+    timed_out = False
+    proc = await asyncio.create_subprocess_exec(*cmd, **kwargs)
+    try:
+        stdout, stderr = await asyncio.wait_for(
+            proc.communicate(None if input is None else input.encode()), timeout
+        )
+    except TimeoutError:
+        timed_out = True
+        stdout, stderr = b"", f"timed out after {timeout}s".encode()
+    finally:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+    stdout = stdout.decode()
+    if timed_out or (retcode is not None and proc.returncode != retcode):
+        raise CalledProcessError(cmd, retcode, proc.returncode, stdout, stderr)
+    return stdout
+
+
+def cmd_outputs(
+    *cmds: Sequence[str], max_concurrency: int = 4, timeout: float | None = None
+) -> list[str]:
+    """
+    Run independent commands concurrently and return their outputs in order.
+
+    At most `max_concurrency` commands run at a time, each limited to
+    `timeout` seconds. The first failing command raises `CalledProcessError`,
+    and the commands still running are killed.
+
+    This starts its own event loop and raises `RuntimeError` when called
+    from a running one; use `cmd_output_async` there instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        raise RuntimeError(
+            "cmd_outputs() cannot be called from a running event loop, "
+            "await cmd_output_async() instead"
+        )
+
+    async def run() -> list[str]:
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run_one(cmd: Sequence[str]) -> str:
+            async with semaphore:
+                return await cmd_output_async(*cmd, timeout=timeout)
+
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(run_one(cmd)) for cmd in cmds]
+        return [task.result() for task in tasks]
+
+    try:
+        # The commands overlap, so only the wall time of all of them counts.
+        with _timed():
+            return asyncio.run(run())
+    except ExceptionGroup as eg:
+        raise eg.exceptions[0] from None
+
+
+def cmd_output_zstream(
+    *cmd: str, retcode: int | None = 0, chunk_size: int = 65536, **kwargs: Any
+) -> Iterator[str]:
+    """
+    Run `cmd` and yield its NUL-separated output fields as they arrive.
+
+    Unlike `zsplit`, empty fields are preserved so callers can rely on them
+    as record separators.
+    """
+    with tempfile.TemporaryFile() as stderr_file:
+        kwargs.setdefault("stdout", subprocess.PIPE)
+        kwargs.setdefault("stderr", stderr_file)
+        # Only the time spent waiting for git counts, not that of the
+        # consumer between two fields.
+        with _timed():
+            proc = subprocess.Popen(cmd, **kwargs)
+        pending = b""
+        try:
+            while True:
+                with _timed():
+                    chunk = proc.stdout.read(chunk_size)
+                if not chunk:
+                    break
+                *fields, pending = (pending + chunk).split(b"\0")
+                for field in fields:
+                    yield field.decode()
+        finally:
+            proc.stdout.close()
+            with _timed():
+                proc.wait()
+        if pending:
+            yield pending.decode()
+        if retcode is not None and proc.returncode != retcode:
+            stderr_file.seek(0)
+            stderr = stderr_file.read()
+            raise CalledProcessError(cmd, retcode, proc.returncode, "", stderr)
+
+
 def zsplit(s: str) -> list[str]:
     s = s.strip("\0")
     if s:
@@ -0,0 +1,313 @@
+#  Copyright 2025 T-Systems International GmbH
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice, this
+#     list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its
+#     contributors may be used to endorse or promote products derived from
+#     this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Incremental snapshots of a working tree and the state file of a watcher.
+
+`WorkingTree` keeps the names of all files below a root and finds added and
+removed files by polling directory mtimes: creating, deleting or renaming
+an entry updates the mtime of its directory, so only changed directories are
+listed again. Directories ignored by git and nested repositories are not
+descended into.
+
+A watcher records its violations in a state file. `WatchState` answers for
+a path from that file only as long as no directory on the way to the path
+changed since the watcher last looked at it. This is checked once per
+directory, so looking up a path costs less than matching it.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any
+
+from pre_commit_hooks.util import cmd_output, zsplit
+
+STATE_VERSION = 2
+# Filesystems may store mtimes coarser than the clock, so directories changed
+# less than this long before a poll are listed again on the next poll.
+MTIME_SLACK_NS = 2_000_000_000
+# A state file whose heartbeat is older than this many poll intervals (plus
+# _STALE_GRACE seconds) belongs to a watcher that stopped.
+_STALE_INTERVALS = 3
+_STALE_GRACE = 5.0
+
+
+def toplevel(directory: str = '.') -> str | None:
+    """
+    Return the real path of the top level of the repository of `directory`.
+
+    Returns `None` outside of a git repository.
+    """
+    out = cmd_output('git', 'rev-parse', '--show-toplevel', retcode=None, cwd=directory)
+    return os.path.realpath(out.rstrip('\n')) if out else None
+
+
+def _join(directory: str, name: str) -> str:
+    return f'{directory}/{name}' if directory else name
+
+
+class WorkingTree:
+    """Incremental snapshot of the files below `root`."""
+
+    def __init__(self, root: str = '.') -> None:
+        self.root = root
+        # Watched directories relative to root ('' is root itself) and their
+        # mtimes, or -1 if they must be listed again.
+        self._mtimes: dict[str, int] = {}
+        self._files: dict[str, set[str]] = {}
+        self._subdirs: dict[str, set[str]] = {}
+        # Directories not descended into: ignored ones and nested repositories.
+        self.pruned: set[str] = set()
+
+    def _ignored(self, dirs: Sequence[str]) -> set[str]:
+        if not dirs:
+            return set()
+        out = cmd_output(
+            'git',
+            'check-ignore',
+            '-z',
+            '--stdin',
+            retcode=None,
+            input=''.join(f'{d}/\0' for d in dirs),
+            cwd=self.root,
+        )
+        return {path.rstrip('/') for path in zsplit(out)}
+
+    def _list(self, directory: str, start: int) -> tuple[set[str], set[str]]:
+        """List a directory, remembering its mtime; return files and subdirs."""
+        path = os.path.join(self.root, directory)
+        mtime = os.stat(path).st_mtime_ns
+        self._mtimes[directory] = mtime if mtime < start - MTIME_SLACK_NS else -1
+        files, subdirs = set(), set()
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.name == '.git':
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.add(entry.name)
+                else:
+                    files.add(entry.name)
+        return files, subdirs
+
+    def _descend(self, candidates: Sequence[str]) -> list[str]:
+        """Return the candidate directories to watch, pruning the others."""
+        repos = {
+            d for d in candidates if os.path.lexists(os.path.join(self.root, d, '.git'))
+        }
+        ignored = self._ignored([d for d in candidates if d not in repos])
+        self.pruned.update(repos, ignored)
+        return [d for d in candidates if d not in repos and d not in ignored]
+
+    def _walk(self, dirs: Sequence[str], start: int, added: list[str]) -> None:
+        """Add new directories and everything below them, level by level."""
+        while dirs:
+            candidates = []
+            for directory in dirs:
+                try:
+                    files, subdirs = self._list(directory, start)
+                except (FileNotFoundError, NotADirectoryError):
+                    self._mtimes.pop(directory, None)
+                    continue
+                self._files[directory] = files
+                self._subdirs[directory] = set()
+                added.extend(_join(directory, name) for name in sorted(files))
+                candidates.extend(_join(directory, name) for name in sorted(subdirs))
+            dirs = self._descend(candidates)
+            for directory in dirs:
+                parent, _, name = directory.rpartition('/')
+                self._subdirs[parent].add(name)
+
+    def _drop(self, directory: str, removed: list[str]) -> None:
+        """Forget a directory and everything below it."""
+        self._mtimes.pop(directory, None)
+        files = self._files.pop(directory, ())
+        removed.extend(_join(directory, name) for name in sorted(files))
+        for name in self._subdirs.pop(directory, ()):
+            self._drop(_join(directory, name), removed)
+        prefix = f'{directory}/'
+        self.pruned = {d for d in self.pruned if not d.startswith(prefix)}
+
+    def poll(self) -> tuple[list[str], list[str]]:
+        """Return the files added and removed since the last poll."""
+        start = time.time_ns()
+        added: list[str] = []
+        removed: list[str] = []
+        if not self._mtimes:
+            self._walk([''], start, added)
+            return added, removed
+
+        changed = []
+        for directory, mtime in list(self._mtimes.items()):
+            if directory not in self._mtimes:
+                continue  # Dropped along with its parent.
+            try:
+                current = os.stat(os.path.join(self.root, directory)).st_mtime_ns
+            except (FileNotFoundError, NotADirectoryError):
+                current = None
+            if current is None and directory:
+                parent, _, name = directory.rpartition('/')
+                self._subdirs[parent].discard(name)
+                self._drop(directory, removed)
+            elif current != mtime:
+                changed.append(directory)
+
+        new_dirs = []
+        for directory in changed:
+            try:
+                files, subdirs = self._list(directory, start)
+            except (FileNotFoundError, NotADirectoryError):
+                continue  # Dropped on the next poll.
+            known = self._files[directory]
+            added.extend(_join(directory, name) for name in sorted(files - known))
+            removed.extend(_join(directory, name) for name in sorted(known - files))
+            self._files[directory] = files
+            watched = self._subdirs[directory]
+            for name in watched - subdirs:
+                watched.discard(name)
+                self._drop(_join(directory, name), removed)
+            for path in list(self.pruned):
+                parent, _, name = path.rpartition('/')
+                if parent == directory and name not in subdirs:
+                    self.pruned.discard(path)
+            candidates = [_join(directory, name) for name in sorted(subdirs - watched)]
+            candidates = [path for path in candidates if path not in self.pruned]
+            new_dirs.extend(self._descend(candidates))
+        for directory in new_dirs:
+            parent, _, name = directory.rpartition('/')
+            self._subdirs[parent].add(name)
+        self._walk(new_dirs, start, added)
+        return added, removed
+
+
+def write_state(filename: str, state: Mapping[str, Any]) -> None:
+    """Replace the state file atomically, so readers never see a partial one."""
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.state-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'version': STATE_VERSION, **state}, f)
+        os.replace(tmp, filename)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class WatchState:
+    """
+    The violations recorded by a running watcher.
+
+    Use `load` to read a state file. Paths must be relative to the root of
+    the watched tree, the top level of its repository, and normalized.
+    """
+
+    def __init__(
+        self,
+        scanned_at: int,
+        pruned: Iterable[str],
+        violations: Mapping[str, list[dict[str, str]]],
+        root: str = '.',
+    ) -> None:
+        self.scanned_at = scanned_at
+        self.pruned = frozenset(pruned)
+        self.violations = violations
+        self.root = root
+        # The names in each directory the watcher saw as it is now, or None.
+        self._listings: dict[str, frozenset[str] | None] = {}
+
+    @classmethod
+    def load(
+        cls, filename: str, fingerprint: str, root: str = '.'
+    ) -> WatchState | None:
+        """
+        Read a state file written for the rules with `fingerprint`.
+
+        Returns `None` if the file is missing or invalid, was written for
+        other rules or for another tree than the repository with the top
+        level `root`, or if its watcher stopped.
+        """
+        try:
+            with open(filename, encoding='utf-8') as f:
+                state = json.load(f)
+            if (
+                state['version'] != STATE_VERSION
+                or state['fingerprint'] != fingerprint
+                or time.time() - state['heartbeat']
+                > _STALE_INTERVALS * state['interval'] + _STALE_GRACE
+                or state['root'] != os.path.realpath(root)
+                or state['root'] != toplevel(root)
+            ):
+                return None
+            violations: dict[str, list[dict[str, str]]] = {}
+            for violation in state['violations']:
+                violations.setdefault(violation['path'], []).append(violation)
+            return cls(state['scanned_at'], state['pruned'], violations, root)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _listing(self, directory: str) -> frozenset[str] | None:
+        """
+        Return the names in `directory` if the watcher saw it as it is now.
+
+        A directory is listed at most once, and only if it and all of its
+        parents are unchanged since the watcher listed them.
+        """
+        try:
+            return self._listings[directory]
+        except KeyError:
+            pass
+        names = None
+        if directory not in self.pruned and (
+            not directory or self._listing(directory.rpartition('/')[0]) is not None
+        ):
+            path = os.path.join(self.root, directory)
+            try:
+                mtime = os.stat(path).st_mtime_ns
+                if mtime < self.scanned_at - MTIME_SLACK_NS:
+                    listed = frozenset(os.listdir(path))
+                    # The directory must not change while it is listed.
+                    if os.stat(path).st_mtime_ns == mtime:
+                        names = listed
+            except OSError:
+                pass
+        self._listings[directory] = names
+        return names
+
+    def covers(self, path: str) -> bool:
+        """
+        Check if the watcher had seen the directory of `path` as it is now.
+
+        That is the case if `path` exists, no directory on the way to it
+        changed since the watcher listed it and none of them was pruned.
+        """
+        directory, _, name = path.rpartition('/')
+        names = self._listing(directory)
+        return names is not None and name in names
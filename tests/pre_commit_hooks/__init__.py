@@ -24,3 +24,49 @@
 #  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
 #  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 #  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Shared helpers for tests running the hooks in a scratch git repository."""
+
+import io
+import os
+import subprocess
+import unittest
+from collections.abc import Callable, Sequence
+from contextlib import redirect_stdout
+from tempfile import TemporaryDirectory
+
+
+def run_main(main: Callable[[Sequence[str]], int], *args: str) -> tuple[int, str]:
+    """Run the `main` of a hook with `args` and return its code and output."""
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        rc = main(list(args))
+    return rc, buf.getvalue()
+
+
+class GitRepoTestCase(unittest.TestCase):
+    """
+    A test case running in a new, empty git repository.
+
+    Each test changes into `self.repo`, which is removed afterwards. Set
+    `main` to the `main` of the hook under test to call it with `_main`.
+    """
+
+    main: Callable[[Sequence[str]], int]
+
+    def setUp(self):
+        tmp = TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.repo = tmp.name
+        cwd = os.getcwd()
+        os.chdir(self.repo)
+        self.addCleanup(os.chdir, cwd)
+        self._git('init', '--quiet')
+
+    def _git(self, *args, input=None):
+        return subprocess.run(
+            ['git', *args], check=True, capture_output=True, text=True, input=input
+        ).stdout
+
+    def _main(self, *args):
+        return run_main(type(self).main, *args)
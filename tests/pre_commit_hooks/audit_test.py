@@ -0,0 +1,186 @@
+#  Copyright 2025 T-Systems International GmbH
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice, this
+#     list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its
+#     contributors may be used to endorse or promote products derived from
+#     this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import io
+import json
+import os
+import shutil
+import subprocess
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+import pre_commit_hooks.audit as lib
+from pre_commit_hooks.check_prohibited_filenames import Ruleset, Violation
+from pre_commit_hooks.denylist import build
+from tests.pre_commit_hooks import run_main
+
+
+@unittest.skipIf(shutil.which('git') is None, 'git not available')
+class AuditTests(unittest.TestCase):
+    def setUp(self):
+        tmp = TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        self.clean = self._repo('clean', 'README.md', 'src/main.py')
+        self.leaky = self._repo('leaky', 'README.md', 'keys/id_rsa.pem')
+        self.sub = self._repo('leaky/vendor/lib', 'server.pem')
+        blob = self._git(self.leaky, 'hash-object', '-w', '--stdin', input='x')
+        self._git(
+            self.leaky,
+            'update-index',
+            '--add',
+            '--cacheinfo',
+            f'160000,{blob.strip()},vendor/lib',
+        )
+        self.plain = os.path.join(self.root, 'plain')
+        os.mkdir(self.plain)
+
+    def _git(self, repo, *args, input=None):
+        return subprocess.run(
+            ['git', *args],
+            cwd=repo,
+            check=True,
+            capture_output=True,
+            text=True,
+            input=input,
+        ).stdout
+
+    def _repo(self, name, *files):
+        repo = os.path.join(self.root, name)
+        os.makedirs(repo)
+        self._git(repo, 'init', '--quiet')
+        for fn in files:
+            path = Path(repo, fn)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(fn)
+        self._git(repo, 'add', '--all')
+        return repo
+
+    def _main(self, *args):
+        return run_main(lib.main, *args)
+
+    def test_audit_repo(self):
+        ruleset = Ruleset(prohibited_patterns=['*.pem'])
+        result = lib.audit_repo(ruleset, self.leaky, submodules=True)
+        self.assertEqual(result.repo, self.leaky)
+        self.assertEqual(result.paths, 3)
+        self.assertEqual(
+            result.violations, [Violation('keys/id_rsa.pem', '*.pem', 'pattern')]
+        )
+        self.assertEqual(result.submodules, [os.path.join(self.leaky, 'vendor/lib')])
+        self.assertIsNone(result.error)
+
+    def test_audit_repo_error(self):
+        result = lib.audit_repo(Ruleset(prohibited_patterns=['*']), self.plain)
+        self.assertEqual(result.paths, 0)
+        self.assertIn('not a git repository', result.error)
+
+    def test_audit_submodules_once(self):
+        repos = [self.clean, self.leaky, self.leaky + '/', self.sub]
+        results = sorted(
+            lib.audit(repos, prohibited_patterns=['*.pem'], jobs=2, submodules=True)
+        )
+        self.assertEqual(
+            [(r.repo, len(r.violations)) for r in results],
+            [(self.clean, 0), (self.leaky, 1), (self.sub, 1)],
+        )
+
+    def test_jobs_bound_workers(self):
+        repos = [self.clean, self.leaky, self.plain]
+        with patch.object(
+            lib, 'ProcessPoolExecutor', wraps=lib.ProcessPoolExecutor
+        ) as executor:
+            results = list(lib.audit(repos, prohibited_filenames=['x'], jobs=3))
+        self.assertEqual(sorted(r.repo for r in results), sorted(repos))
+        self.assertEqual(executor.call_args.kwargs['max_workers'], 3)
+
+    def test_workers_open_denylist(self):
+        index = os.path.join(self.root, 'deny.idx')
+        with open(index, 'wb') as out:
+            build(['id_rsa.pem'], out)
+        rc, out = self._main(
+            '--prohibited-filenames-index', index, '--jobs', '2', self.clean, self.leaky
+        )
+        self.assertEqual(rc, 1)
+        self.assertIn(
+            f'{self.leaky}: Prohibited filename(s) found: keys/id_rsa.pem', out
+        )
+
+    def test_main_report(self):
+        report = os.path.join(self.root, 'report.jsonl')
+        repos = os.path.join(self.root, 'repos.txt')
+        Path(repos).write_text(f'{self.leaky}\n\n{self.plain}\n')
+        rc, out = self._main(
+            '--patterns',
+            '*.pem',
+            '--submodules',
+            '--report',
+            report,
+            '--repos-from',
+            repos,
+            self.clean,
+        )
+        self.assertEqual(rc, 1)
+        self.assertIn(
+            f'{self.leaky}: Prohibited filename(s) found: keys/id_rsa.pem', out
+        )
+        self.assertIn(f'{self.sub}: Prohibited filename(s) found: server.pem', out)
+        self.assertIn(f'{self.plain}: ', out)
+        self.assertIn('Audited 4 repositories (6 paths)', out)
+        self.assertIn('2 violation(s), 1 error(s)', out)
+        with open(report, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(
+            [r['repo'] for r in records],
+            [self.clean, self.leaky, self.leaky, self.sub, self.sub, self.plain],
+        )
+        self.assertEqual(
+            records[1],
+            {
+                'path': 'keys/id_rsa.pem',
+                'rule': '*.pem',
+                'kind': 'pattern',
+                'repo': self.leaky,
+            },
+        )
+        self.assertEqual(records[2]['paths'], 3)
+        self.assertEqual(records[2]['violations'], 1)
+        self.assertIsInstance(records[2]['seconds'], float)
+        self.assertIn('not a git repository', records[5]['error'])
+
+    def test_main_clean(self):
+        rc, out = self._main('--filenames', '.DS_Store', self.clean, self.leaky)
+        self.assertEqual(rc, 0)
+        self.assertIn('Audited 2 repositories (5 paths)', out)
+
+    def test_main_requires_rules_and_repos(self):
+        for args in ([self.clean], ['--patterns', '*']):
+            with self.subTest(args=args), patch('sys.stderr', io.StringIO()):
+                with self.assertRaises(SystemExit):
+                    lib.main(args)
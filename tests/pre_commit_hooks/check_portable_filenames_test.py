@@ -0,0 +1,134 @@
+#  Copyright 2025 T-Systems International GmbH
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice, this
+#     list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its
+#     contributors may be used to endorse or promote products derived from
+#     this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import shutil
+import unicodedata
+import unittest
+
+import pre_commit_hooks.check_portable_filenames as lib
+from tests.pre_commit_hooks import GitRepoTestCase
+
+NFC = unicodedata.normalize('NFC', 'café')
+NFD = unicodedata.normalize('NFD', 'café')
+
+
+class CollisionTests(unittest.TestCase):
+    def test_case_collision(self):
+        self.assertEqual(
+            lib.find_collisions(['README.md', 'src/a.py', 'readme.md']),
+            [('README.md', 'readme.md')],
+        )
+
+    def test_unicode_normalization_collision(self):
+        self.assertNotEqual(NFC, NFD)
+        self.assertEqual(lib.find_collisions([NFC, NFD]), [(NFC, NFD)])
+        self.assertEqual(
+            lib.find_collisions([f'{NFC}/x', f'{NFD.upper()}/y']),
+            [(NFC, NFD.upper())],
+        )
+
+    def test_directory_collision_reported_once(self):
+        paths = ['Docs/a.md', 'docs/b.md', 'docs/c.md', 'DOCS/sub/d.md']
+        self.assertEqual(
+            lib.find_collisions(paths), [('Docs', 'docs'), ('Docs', 'DOCS')]
+        )
+
+    def test_file_and_directory_collision(self):
+        self.assertEqual(
+            lib.find_collisions(['build', 'Build/x']), [('build', 'Build')]
+        )
+
+    def test_no_collisions(self):
+        self.assertEqual(lib.find_collisions(['a/b', 'a/c', 'b', 'a/b']), [])
+
+    def test_casefold_beyond_lower(self):
+        self.assertEqual(
+            lib.find_collisions(['straße', 'STRASSE']), [('straße', 'STRASSE')]
+        )
+
+
+class WindowsNameTests(unittest.TestCase):
+    def test_windows_problem(self):
+        cases = {
+            'CON': 'reserved name',
+            'nul.txt': 'reserved name',
+            'Com1.tar.gz': 'reserved name',
+            'lpt²': 'reserved name',
+            'aux .c': 'reserved name',
+            'dir.': 'trailing dot or space',
+            'name ': 'trailing dot or space',
+            'a:b': 'invalid character',
+            'what?': 'invalid character',
+            'tab\there': 'invalid character',
+            'back\\slash': 'invalid character',
+            'console.log': None,
+            'COM10': None,
+            'nullable': None,
+            '.env': None,
+        }
+        for name, problem in cases.items():
+            with self.subTest(name=name):
+                self.assertEqual(lib._windows_problem(name), problem)
+
+    def test_find_windows_problems_reports_path_once(self):
+        self.assertEqual(
+            lib.find_windows_problems(['con/aux/x', 'ok/fine.txt', 'a/b.']),
+            [('con/aux/x', 'reserved name'), ('a/b.', 'trailing dot or space')],
+        )
+
+
+@unittest.skipIf(shutil.which('git') is None, 'git not available')
+class CheckPortableFilenamesMainTests(GitRepoTestCase):
+    main = lib.main
+
+    def _add(self, *names):
+        for name in names:
+            with open(name, 'w') as f:
+                f.write(name)
+        self._git('add', '--', *names)
+
+    def test_clean_tree(self):
+        self._add('README.md', 'main.py')
+        self.assertEqual(self._main(), (0, ''))
+
+    def test_collision_in_index(self):
+        with open('probe', 'w'):
+            pass
+        if os.path.exists('PROBE'):
+            self.skipTest('case-insensitive filesystem')
+        self._add('README.md', 'readme.md')
+        rc, out = self._main()
+        self.assertEqual(rc, 1)
+        self.assertIn('README.md and readme.md', out)
+
+    def test_windows_names_and_extra_filenames(self):
+        self._add('aux.c')
+        rc, out = self._main('AUX.C')
+        self.assertEqual(rc, 1)
+        self.assertIn('aux.c (reserved name)', out)
+        self.assertIn('aux.c and AUX.C', out)
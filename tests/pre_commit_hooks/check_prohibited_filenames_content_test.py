@@ -0,0 +1,204 @@
+#  Copyright 2025 T-Systems International GmbH
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice, this
+#     list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its
+#     contributors may be used to endorse or promote products derived from
+#     this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import contextlib
+import json
+import os
+import shutil
+import unittest
+from pathlib import Path
+from unittest.mock import ANY, patch
+
+import pre_commit_hooks.check_prohibited_filenames as lib
+import pre_commit_hooks.util as util
+from tests.pre_commit_hooks import GitRepoTestCase, run_main
+
+# Markers are split, so that this file does not look like it holds secrets.
+DASHES = '-' * 5
+PRIVATE_KEY = (
+    DASHES + 'BEGIN OPENSSH PRIVATE KEY' + DASHES + '\nb3BlbnNzaC1rZXktdjEAAAAA\n'
+)
+AWS_KEY = 'aws_access_key_id = ' + 'AKIA' + 'IOSFODNN7EXAMPLE\n'
+
+
+class SignatureScanTests(unittest.TestCase):
+    def test_signatures(self):
+        cases = {
+            PRIVATE_KEY: 'private-key',
+            DASHES + 'BEGIN PRIVATE KEY' + DASHES: 'private-key',
+            DASHES + 'BEGIN PGP PRIVATE KEY BLOCK' + DASHES: 'private-key',
+            'PuTTY-User-Key-File-' + '2: ssh-rsa': 'putty-private-key',
+            AWS_KEY: 'aws-access-key-id',
+            'token: ghp_' + 'a' * 36: 'github-token',
+            'glpat-' + 'x' * 20: 'gitlab-token',
+            'xox' + 'b-1234567890-abc': 'slack-token',
+            'AIza' + 'B' * 35: 'google-api-key',
+            'sk_live_' + '0' * 24: 'stripe-secret-key',
+            DASHES + 'BEGIN PUBLIC KEY' + DASHES: None,
+            'uk_live_' + '0' * 24: None,
+            'AKIAIOSFODNN7EXAMPLEXX': None,
+            'ghp_tooshort': None,
+            '': None,
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(lib._scan_chunks([text.encode()]), expected)
+
+    def test_regex_only_runs_after_a_prefix(self):
+        data = b'no secrets here\n' * 1000
+        with patch.object(lib, '_SIGNATURES_RE') as regex:
+            self.assertIsNone(lib._scan_chunks([data]))
+            regex.search.assert_not_called()
+            lib._scan_chunks([data + b'sk_live_'])
+            regex.search.assert_called_once_with(ANY, len(data))
+
+    def test_signature_across_chunk_border(self):
+        data = b'x' * 1000 + PRIVATE_KEY.encode() + b'y' * 1000
+        for size in (1, 7, 64, 1000, 1010, 4096):
+            chunks = [data[i : i + size] for i in range(0, len(data), size)]
+            with self.subTest(size=size):
+                self.assertEqual(lib._scan_chunks(chunks), 'private-key')
+
+
+@unittest.skipIf(shutil.which('git') is None, 'git not available')
+class ContentScanGitTests(GitRepoTestCase):
+    main = lib.main
+
+    def setUp(self):
+        super().setUp()
+        self._git('config', 'user.name', 'Test')
+        self._git('config', 'user.email', 'test@example.com')
+        Path('id_deploy').write_text(PRIVATE_KEY)
+        Path('settings.ini').write_text('[default]\n' + AWS_KEY)
+        Path('README.md').write_text('readme\n' * 1000)
+        os.symlink('id_deploy', 'key-link')
+        self._git('add', '--all')
+
+    FILES = ['README.md', 'id_deploy', 'settings.ini', 'key-link', 'untracked']
+
+    def test_staged_blobs_are_scanned(self):
+        # The working tree copy is irrelevant, only the staged blob counts.
+        Path('id_deploy').write_text('rotated')
+        rc, out = self._main('--scan-content', *self.FILES)
+        self.assertEqual(rc, 1)
+        self.assertIn('id_deploy (private-key)', out)
+        self.assertIn('settings.ini (aws-access-key-id)', out)
+        self.assertNotIn('README.md', out)
+        self.assertNotIn('key-link', out)
+
+    def test_without_flag_contents_are_ignored(self):
+        self.assertEqual(self._main(*self.FILES), (0, ''))
+
+    def test_small_chunks(self):
+        with patch.object(lib, '_SIGNATURE_CHUNK_SIZE', 5):
+            rc, out = self._main('--scan-content', 'README.md', 'id_deploy')
+        self.assertEqual(rc, 1)
+        self.assertIn('id_deploy (private-key)', out)
+
+    def test_max_violations_and_report(self):
+        report = os.path.join(self.repo, 'report.jsonl')
+        rc, _ = self._main(
+            '--scan-content', '--max-violations', '1', '--report', report, *self.FILES
+        )
+        self.assertEqual(rc, 1)
+        with open(report, encoding='utf-8') as f:
+            self.assertEqual(
+                json.loads(f.read()),
+                {'path': 'id_deploy', 'rule': 'private-key', 'kind': 'content'},
+            )
+
+    def test_max_violations_reports_progress(self):
+        rc, out = self._main('--scan-content', '--max-violations', '1', *self.FILES)
+        self.assertEqual(rc, 1)
+        self.assertEqual(
+            out,
+            'Secret signature(s) found: id_deploy (private-key)\n'
+            'Content scan stopped after checking 2 of 5 path(s): '
+            '1 violation(s) found\n',
+        )
+
+    def test_deadline_reports_progress(self):
+        with patch.object(lib.time, 'monotonic', side_effect=[0, 0, 2]):
+            rc, out = run_main(
+                lambda filenames: lib.find_secrets(filenames, deadline=1), *self.FILES
+            )
+        self.assertEqual(rc, 1)
+        self.assertEqual(
+            out,
+            'Secret signature(s) found: id_deploy (private-key)\n'
+            'Content scan stopped after checking 2 of 5 path(s): '
+            'time budget exceeded\n',
+        )
+
+    def test_no_blobs_start_no_process(self):
+        with patch.object(lib, 'CatFileBatch') as process:
+            rc, out = self._main('--scan-content', 'key-link', 'untracked')
+        self.assertEqual((rc, out), (0, ''))
+        process.assert_not_called()
+
+    def test_range(self):
+        # The key is reported although it is no longer in the index.
+        tree = self._git('mktree', input='').strip()
+        base = self._git('commit-tree', tree, '-m', 'base').strip()
+        self._git('update-ref', 'HEAD', base)
+        self._git('commit', '--quiet', '-m', 'add key')
+        self._git('rm', '--quiet', '--cached', 'id_deploy', 'settings.ini')
+        self._git('commit', '--quiet', '-m', 'remove key')
+        rc, out = self._main('--scan-content', '--range', f'{base}..HEAD')
+        self.assertEqual(rc, 1)
+        self.assertIn('id_deploy (private-key)', out)
+
+    def test_cat_file_batch_streams_chunks(self):
+        blob = self._git('hash-object', '-w', '--stdin', input='abcdefg').strip()
+        with util.CatFileBatch() as cat_file:
+            self.assertEqual(
+                list(cat_file.iter_chunks(blob, 3)), [b'abc', b'def', b'g']
+            )
+            self.assertEqual(list(cat_file.iter_chunks('HEAD:missing')), [])
+            # Abandoning an object part way must not confuse the next request.
+            chunks = cat_file.iter_chunks(blob, 2)
+            self.assertEqual(next(chunks), b'ab')
+            chunks.close()
+            self.assertEqual(
+                b''.join(cat_file.iter_chunks(':0:id_deploy')), PRIVATE_KEY.encode()
+            )
+
+    def test_cat_file_batch_does_not_time_the_consumer(self):
+        timed = []
+
+        @contextlib.contextmanager
+        def track_timed():
+            timed.append(True)
+            try:
+                yield
+            finally:
+                timed.pop()
+
+        with patch.object(util, '_timed', track_timed):
+            with util.CatFileBatch() as cat_file:
+                for _ in cat_file.iter_chunks(':0:README.md', 1000):
+                    self.assertEqual(timed, [])
@@ -0,0 +1,207 @@
+#  Copyright 2025 T-Systems International GmbH
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice, this
+#     list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its
+#     contributors may be used to endorse or promote products derived from
+#     this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pre_commit_hooks.check_prohibited_filenames as lib
+
+
+class PathSplittingTests(unittest.TestCase):
+    def test_is_git_normalized(self):
+        for path in ('a', 'a/b.txt', '.env', 'a/.b/..c', 'a/b..'):
+            with self.subTest(path=path):
+                self.assertTrue(lib._is_git_normalized(path))
+        for path in ('', '/a', 'a/', 'a//b', './a', 'a/./b', 'a/..', '..', r'a\b'):
+            with self.subTest(path=path):
+                self.assertFalse(lib._is_git_normalized(path))
+
+    def test_split_git_path(self):
+        info = lib._split_git_path('a/b/c.txt')
+        self.assertEqual(info.posix, 'a/b/c.txt')
+        self.assertEqual(info.basename, 'c.txt')
+        self.assertEqual(info.parts, ('a', 'b', 'c.txt'))
+        self.assertIs(info.names, info.parts)
+
+    def test_split_path_fast_path_skips_normalization(self):
+        with patch.object(lib, '_to_posix_path') as to_posix:
+            info = lib._split_path('a/b/c.txt')
+        to_posix.assert_not_called()
+        self.assertEqual(info, lib._split_git_path('a/b/c.txt'))
+
+    def test_split_path_normalizes_untrusted_input(self):
+        info = lib._split_path('a/./b//c.txt')
+        self.assertEqual(info.posix, 'a/b/c.txt')
+        self.assertEqual(info.parts, ('a', 'b', 'c.txt'))
+
+    def test_split_path_keeps_root_out_of_names(self):
+        path = os.path.join(os.sep, 'var', 'x.txt')
+        info = lib._split_path(path)
+        self.assertEqual(info.parts, ('/', 'var', 'x.txt'))
+        self.assertEqual(info.names, ('var', 'x.txt'))
+
+
+class RulesTests(unittest.TestCase):
+    PATHS = [
+        'a/b/file.txt',
+        'x/whoopie/z.txt',
+        'keys/id_rsa.pem',
+        'a/secrets/cred.pem',
+        'secrets.pem',
+        'dir/sub/file.txt',
+        'docs/README.md',
+        os.path.join(os.sep, 'var', 'whoopie', 'z.txt'),
+        '/keys/a.pem',
+        'a/./b/../.env',
+    ]
+    PATTERNS = [
+        ['*.txt'],
+        ['*whoop*'],
+        ['**/secrets/*'],
+        ['**/keys/*.pem'],
+        ['/keys/*.pem'],
+        [r'dir\sub\file.txt'],
+        ['README.md'],
+        ['.env', '*.md'],
+        ['b/*.txt', 'nope'],
+    ]
+
+    def test_patterns_agree_with_reference(self):
+        for patterns in self.PATTERNS:
+            rules = lib._Rules(patterns=patterns)
+            for path in self.PATHS:
+                with self.subTest(path=path, patterns=patterns):
+                    self.assertEqual(
+                        rules.match_pattern(lib._split_path(path)) is not None,
+                        lib._matches_patterns(path, patterns),
+                    )
+
+    def test_filenames_agree_with_reference(self):
+        filenames = ['README.md', 'dir/.env', 'z.txt']
+        rules = lib._Rules(filenames=filenames)
+        for path in self.PATHS:
+            with self.subTest(path=path):
+                self.assertEqual(
+                    rules.match_filename(lib._split_path(path)) is not None,
+                    lib._match_filename(path, filenames),
+                )
+
+    def test_backslash_is_not_a_filename_separator_on_posix(self):
+        if os.name == 'nt':
+            self.skipTest('backslash is a separator on Windows')
+        info = lib._split_path(r'x/a\b')
+        self.assertEqual(info.basename, 'b')
+        self.assertEqual(info.native_basename, r'a\b')
+        self.assertIsNone(lib._Rules(filenames=['b']).match_filename(info))
+        self.assertIsNotNone(lib._Rules(patterns=['b']).match_pattern(info))
+
+    def test_match_returns_rule(self):
+        rules = lib._Rules(['dir/README.md'], ['*.md', '**/keys/*'])
+        self.assertEqual(
+            rules.match_filename(lib._split_path('x/README.md')), 'dir/README.md'
+        )
+        self.assertEqual(rules.match_pattern(lib._split_path('x/README.md')), '*.md')
+        self.assertEqual(rules.match_pattern(lib._split_path('keys/k')), '**/keys/*')
+        self.assertIsNone(rules.match_pattern(lib._split_path('x/y')))
+
+    def test_windows_filenames_are_case_insensitive(self):
+        with patch.object(lib.os, 'name', 'nt'):
+            rules = lib._Rules(['README.md'], ['.ENV'])
+        self.assertTrue(rules.match_filename(lib._split_path('dir/ReadMe.md')))
+        self.assertTrue(rules.match_pattern(lib._split_path('dir/.env')))
+
+    def test_component_verdicts_are_memoized(self):
+        rules = lib._Rules(patterns=['*whoop*'])
+        with patch.object(lib, '_compile_glob', side_effect=AssertionError):
+            self.assertTrue(rules.match_pattern(lib._split_path('a/whoopie/x')))
+        self.assertIn('whoopie', rules._component_cache)
+        rules._component_cache['whoopie'] = None
+        self.assertIsNone(rules.match_pattern(lib._split_path('a/whoopie/x')))
+
+    def test_cache_stats_are_per_call(self):
+        rules = lib._Rules(patterns=['*.md'])
+        info = lib._split_path('docs/README.md')
+        first, second = lib._CacheStats(), lib._CacheStats()
+        rules.match_pattern(info, first)
+        rules.match_pattern(info, second)
+        rules.match_pattern(info)
+        # The basename matches, so no component is looked up.
+        self.assertEqual((first.lookups, first.hits), (1, 0))
+        self.assertEqual((second.lookups, second.hits), (1, 1))
+
+    def test_empty_rules_are_falsy(self):
+        self.assertFalse(lib._Rules())
+        self.assertTrue(lib._Rules(patterns=['*.pem']))
+
+
+class RulesetTests(unittest.TestCase):
+    def test_match_yields_structured_violations_lazily(self):
+        ruleset = lib.Ruleset(['README.md'], ['*.md', '**/keys/*'])
+        paths = iter(['docs/README.md', 'src/ok.py', 'keys/k'])
+        violations = ruleset.match(paths)
+        self.assertEqual(
+            next(violations), lib.Violation('docs/README.md', 'README.md', 'filename')
+        )
+        self.assertEqual(
+            next(violations), lib.Violation('docs/README.md', '*.md', 'pattern')
+        )
+        # The remaining paths have not been consumed yet.
+        self.assertEqual(next(paths), 'src/ok.py')
+        self.assertEqual(
+            list(violations), [lib.Violation('keys/k', '**/keys/*', 'pattern')]
+        )
+
+    def test_match_path(self):
+        ruleset = lib.Ruleset(prohibited_patterns=['**/keys/*'])
+        self.assertEqual(
+            ruleset.match_path('keys/k', trusted=True),
+            [lib.Violation('keys/k', '**/keys/*', 'pattern')],
+        )
+        self.assertEqual(ruleset.match_path('src/k'), [])
+
+    def test_bool(self):
+        self.assertFalse(lib.Ruleset())
+        self.assertTrue(lib.Ruleset(['.env']))
+
+    def test_shared_between_threads(self):
+        ruleset = lib.Ruleset(['.env'], ['*.pem', '*secret*', '**/keys/*'])
+        paths = [
+            f'dir{i % 7}/{name}'
+            for i in range(2000)
+            for name in ('.env', 'a.pem', 'my-secret', 'ok.txt', 'keys')
+        ]
+        expected = list(ruleset.match(paths))
+
+        def run(chunk):
+            return list(ruleset.match(paths[chunk::8]))
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(run, range(8)))
+        merged = sorted(v for result in results for v in result)
+        self.assertEqual(merged, sorted(expected))
@@ -0,0 +1,245 @@
+#  Copyright 2025 T-Systems International GmbH
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice, this
+#     list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its
+#     contributors may be used to endorse or promote products derived from
+#     this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Differential fuzzing and throughput gate for the matching engine.
+
+`Ruleset` must give exactly the verdicts of the reference implementation
+(`_match_filename` and `_matches_patterns`) and stay faster than it.
+
+Environment variables:
+
+- PRE_COMMIT_HOOKS_FUZZ_SEED: seed of the random generator (default: 0)
+- PRE_COMMIT_HOOKS_FUZZ_CASES: number of random rulesets (default: 300)
+- PRE_COMMIT_HOOKS_MIN_SPEEDUP: minimum throughput of the engine relative to
+  the reference implementation (default: 2.0)
+- PRE_COMMIT_HOOKS_BENCH_OUTPUT: file to append throughput results to (JSON lines)
+"""
+
+import json
+import os
+import random
+import time
+import unittest
+from unittest.mock import patch
+
+import pre_commit_hooks.check_prohibited_filenames as lib
+from pre_commit_hooks.pathstore import PathStore
+
+SEED = int(os.environ.get('PRE_COMMIT_HOOKS_FUZZ_SEED', '0'))
+CASES = int(os.environ.get('PRE_COMMIT_HOOKS_FUZZ_CASES', '300'))
+MIN_SPEEDUP = float(os.environ.get('PRE_COMMIT_HOOKS_MIN_SPEEDUP', '2.0'))
+BENCH_OUTPUT = os.environ.get('PRE_COMMIT_HOOKS_BENCH_OUTPUT')
+
+NAMES = [
+    'a',
+    'B',
+    'keys',
+    'Keys',
+    'secrets',
+    'node_modules',
+    '.env',
+    '.ENV',
+    'id_rsa',
+    'id_rsa.pem',
+    'README.md',
+    'readme.MD',
+    'x.tar.gz',
+    'ünïcödé',
+    'sp ace',
+    '[ab]',
+    'a.b.',
+    'file?',
+]
+PATH_PIECES = [*NAMES, '.', '..', '', 'a\\b']
+GLOBS = ['*', '**', '?', '*.pem', '*.md', 'id_*', '[ab]', '[!a]*', '*secret*', '.*']
+
+
+def random_path(rnd: random.Random) -> str:
+    path = '/'.join(rnd.choice(PATH_PIECES) for _ in range(rnd.randint(1, 6)))
+    if rnd.random() < 0.05:
+        path = '/' + path
+    return path
+
+
+def random_pattern(rnd: random.Random) -> str:
+    pieces = [rnd.choice(NAMES + GLOBS) for _ in range(rnd.randint(1, 4))]
+    if rnd.random() < 0.3:
+        pieces.insert(0, '**')
+    sep = '\\' if rnd.random() < 0.1 else '/'
+    pattern = sep.join(pieces)
+    if rnd.random() < 0.05:
+        pattern = '/' + pattern
+    return pattern
+
+
+def random_rules(rnd: random.Random) -> tuple[list[str], list[str]]:
+    filenames = rnd.sample(NAMES, rnd.randint(0, 3))
+    if rnd.random() < 0.2:
+        filenames.append('dir/' + rnd.choice(NAMES))
+    patterns = [random_pattern(rnd) for _ in range(rnd.randint(0, 5))]
+    return filenames, patterns
+
+
+def reference_verdicts(path, filenames, patterns) -> tuple[bool, bool]:
+    return (
+        bool(filenames) and lib._match_filename(path, filenames),
+        bool(patterns) and lib._matches_patterns(path, patterns),
+    )
+
+
+def engine_verdicts(ruleset, path) -> tuple[bool, bool]:
+    kinds = {v.kind for v in ruleset.match_path(path)}
+    return 'filename' in kinds, 'pattern' in kinds
+
+
+class DifferentialFuzzTests(unittest.TestCase):
+    def _fuzz(self, seed):
+        rnd = random.Random(seed)
+        for case in range(CASES):
+            filenames, patterns = random_rules(rnd)
+            ruleset = lib.Ruleset(filenames, patterns)
+            for _ in range(50):
+                path = random_path(rnd)
+                expected = reference_verdicts(path, filenames, patterns)
+                actual = engine_verdicts(ruleset, path)
+                if actual != expected:
+                    self.fail(
+                        f'seed={seed} case={case}: {path!r} '
+                        f'filenames={filenames!r} patterns={patterns!r}: '
+                        f'engine={actual} reference={expected}'
+                    )
+
+    def test_engine_matches_reference(self):
+        self._fuzz(SEED)
+
+    def test_engine_matches_reference_with_windows_casefolding(self):
+        with patch.object(lib.os, 'name', 'nt'):
+            self._fuzz(SEED + 1)
+
+    def test_absolute_paths_match_reference(self):
+        # Regressions found by the fuzzer: the root of an absolute path is a
+        # component that only bracket expressions match.
+        cases = [
+            ('/.env', ['**/**/[!a]*']),
+            ('/..', ['**/*']),
+            ('/..', ['[!a]*', '**/[!a]*']),
+            ('/../sp ace', ['[!a]*/**']),
+            ('/a/b', ['*/*/*', '[!a]*/*/*']),
+        ]
+        for path, patterns in cases:
+            with self.subTest(path=path, patterns=patterns):
+                self.assertEqual(
+                    engine_verdicts(lib.Ruleset((), patterns), path),
+                    reference_verdicts(path, (), patterns),
+                )
+
+    def test_trusted_paths_match_reference(self):
+        rnd = random.Random(SEED + 2)
+        for _ in range(CASES):
+            filenames, patterns = random_rules(rnd)
+            ruleset = lib.Ruleset(filenames, patterns)
+            for _ in range(50):
+                path = random_path(rnd)
+                if not lib._is_git_normalized(path):
+                    continue
+                self.assertEqual(
+                    ruleset.match_path(path, trusted=True),
+                    ruleset.match_path(path),
+                    msg=f'{path!r} {filenames!r} {patterns!r}',
+                )
+
+    def test_path_store_matches_trusted_paths(self):
+        rnd = random.Random(SEED + 3)
+        for _ in range(CASES // 10):
+            filenames, patterns = random_rules(rnd)
+            ruleset = lib.Ruleset(filenames, patterns)
+            paths = [random_path(rnd) for _ in range(500)]
+            paths = [path for path in paths if lib._is_git_normalized(path)]
+            self.assertEqual(
+                list(ruleset.match_store(PathStore(paths))),
+                [ruleset.match_path(path, trusted=True) for path in paths],
+                msg=f'{filenames!r} {patterns!r}',
+            )
+
+
+class ThroughputGateTests(unittest.TestCase):
+    FILENAMES = ['.DS_Store', 'id_rsa', '.env']
+    PATTERNS = ['*.pem', '*.key', '**/secrets/*', '**/.ssh/*', '*.p12', 'tmp/*']
+
+    @staticmethod
+    def _paths(count):
+        rnd = random.Random(SEED)
+        dirs = ['src', 'lib', 'pkg', 'tests', 'docs', 'internal', 'vendor', 'util']
+        return [
+            '/'.join(rnd.choice(dirs) for _ in range(rnd.randint(1, 5)))
+            + f'/file{i}.{rnd.choice(["py", "md", "txt", "json"])}'
+            for i in range(count)
+        ]
+
+    @staticmethod
+    def _best_rate(func, paths, repeat=3):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(paths)
+            best = min(best, time.perf_counter() - start)
+        return len(paths) / best
+
+    def test_engine_throughput_does_not_regress(self):
+        paths = self._paths(20000)
+
+        def reference(paths):
+            for path in paths:
+                reference_verdicts(path, self.FILENAMES, self.PATTERNS)
+
+        def engine(paths):
+            ruleset = lib.Ruleset(self.FILENAMES, self.PATTERNS)
+            for _ in ruleset.match(paths):
+                pass
+
+        reference_rate = self._best_rate(reference, paths)
+        engine_rate = self._best_rate(engine, paths)
+        speedup = engine_rate / reference_rate
+
+        if BENCH_OUTPUT:
+            with open(BENCH_OUTPUT, 'a', encoding='utf-8') as f:
+                result = {
+                    'benchmark': 'check_prohibited_filenames.match',
+                    'paths': len(paths),
+                    'reference_paths_per_sec': round(reference_rate),
+                    'engine_paths_per_sec': round(engine_rate),
+                    'speedup': round(speedup, 2),
+                }
+                f.write(json.dumps(result) + '\n')
+
+        self.assertGreaterEqual(
+            speedup,
+            MIN_SPEEDUP,
+            msg=f'engine: {engine_rate:.0f} paths/s, '
+            f'reference: {reference_rate:.0f} paths/s',
+        )
@@ -0,0 +1,230 @@
+#  Copyright 2025 T-Systems International GmbH
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice, this
+#     list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its
+#     contributors may be used to endorse or promote products derived from
+#     this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import io
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+import pre_commit_hooks.check_prohibited_filenames as lib
+from pre_commit_hooks.git_index import IndexEntry
+
+
+class ScanLimitTests(unittest.TestCase):
+    FILENAMES = ['a.pem', 'ok.txt', 'b.pem', 'c.pem', 'more.txt']
+
+    def _run(self, func, *args, **kwargs):
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            rc = func(*args, **kwargs)
+        return rc, buf.getvalue()
+
+    def test_max_violations_stops_scan_and_reports_progress(self):
+        with patch.object(lib.Ruleset, '_match_path', autospec=True) as match_path:
+            match_path.side_effect = lambda self, fn, trusted, stats: [
+                lib.Violation(fn, '*.pem', 'pattern')
+            ] * fn.endswith('.pem')
+            rc, out = self._run(
+                lib.find_prohibited, [], ['*.pem'], self.FILENAMES, max_violations=2
+            )
+        self.assertEqual(rc, 1)
+        self.assertEqual(match_path.call_count, 3)
+        self.assertIn('Prohibited filename(s) found: a.pem, b.pem', out)
+        self.assertIn('Scan stopped after checking 3 of 5 path(s)', out)
+        self.assertNotIn('c.pem', out)
+
+    def test_max_violations_truncates_duplicates(self):
+        rc, out = self._run(
+            lib.find_prohibited, ['a.pem'], ['*.pem'], ['a.pem'], max_violations=1
+        )
+        self.assertEqual(rc, 1)
+        self.assertEqual(out.count('a.pem'), 1)
+        # The last path was checked, so the scan was complete.
+        self.assertNotIn('Scan stopped', out)
+
+    def test_max_violations_not_reached_scans_everything(self):
+        rc, out = self._run(
+            lib.find_prohibited, [], ['*.pem'], self.FILENAMES, max_violations=10
+        )
+        self.assertEqual(rc, 1)
+        self.assertIn('a.pem, b.pem, c.pem', out)
+        self.assertNotIn('Scan stopped', out)
+
+    def test_expired_deadline_fails_with_partial_result(self):
+        with patch.object(lib.time, 'monotonic', side_effect=[0, 0, 2, 2]):
+            rc, out = self._run(
+                lib.find_prohibited, [], ['*.txt'], self.FILENAMES, deadline=1
+            )
+        self.assertEqual(rc, 1)
+        self.assertIn('Scan stopped after checking 2 of 5 path(s)', out)
+        self.assertIn('time budget exceeded', out)
+        self.assertIn('ok.txt', out)
+
+    def test_expired_deadline_without_violations_is_incomplete(self):
+        rc, out = self._run(lib.find_prohibited, [], ['*.md'], ['a.txt'], deadline=0)
+        self.assertEqual(rc, 1)
+        self.assertIn('Scan incomplete', out)
+
+    def test_deadline_not_reached(self):
+        rc, out = self._run(
+            lib.find_prohibited, [], ['*.md'], self.FILENAMES, deadline=float('inf')
+        )
+        self.assertEqual((rc, out), (0, ''))
+
+    def _cat_file(self, cls):
+        patcher = patch.object(lib, cls)
+        self.addCleanup(patcher.stop)
+        return patcher.start().return_value.__enter__.return_value
+
+    def test_find_oversized_caps_violations(self):
+        self._cat_file('CatFileBatchCheck').size.return_value = 10
+        rc, out = self._run(
+            lib.find_oversized, [('*', 1)], ['a', 'b', 'c'], max_violations=2
+        )
+        self.assertEqual(rc, 1)
+        self.assertIn('a (10 B > 1 B), b (10 B > 1 B)', out)
+        self.assertNotIn('c (', out)
+
+    def test_find_oversized_skipped_after_deadline(self):
+        cat_file = self._cat_file('CatFileBatchCheck')
+        rc, out = self._run(lib.find_oversized, [('*', 1)], ['a'], deadline=0)
+        self.assertEqual(rc, 1)
+        self.assertIn('time budget exceeded', out)
+        cat_file.size.assert_not_called()
+
+    def test_find_oversized_stops_looking_up_at_cap(self):
+        cat_file = self._cat_file('CatFileBatchCheck')
+        cat_file.size.return_value = 10
+        rc, out = self._run(
+            lib.find_oversized, [('*', 1)], ['a', 'b', 'c', 'd', 'e'], max_violations=3
+        )
+        self.assertEqual(rc, 1)
+        self.assertEqual(cat_file.size.call_count, 3)
+        self.assertIn('a (10 B > 1 B), b (10 B > 1 B), c (10 B > 1 B)\n', out)
+        self.assertIn(
+            'Size check stopped after checking 3 of 5 path(s): 3 violation(s) found',
+            out,
+        )
+
+    def test_find_oversized_at_cap_after_last_path_is_complete(self):
+        self._cat_file('CatFileBatchCheck').size.return_value = 10
+        rc, out = self._run(
+            lib.find_oversized, [('*', 1)], ['a', 'b'], max_violations=2
+        )
+        self.assertEqual(rc, 1)
+        self.assertNotIn('stopped', out)
+
+    def test_find_oversized_stops_at_deadline_between_lookups(self):
+        cat_file = self._cat_file('CatFileBatchCheck')
+        cat_file.size.return_value = 0
+        with patch.object(lib.time, 'monotonic', side_effect=[0, 0, 0, 2]):
+            rc, out = self._run(
+                lib.find_oversized, [('*', 1)], ['a', 'b', 'c', 'd'], deadline=1
+            )
+        self.assertEqual(rc, 1)
+        self.assertEqual(cat_file.size.call_count, 2)
+        self.assertIn(
+            'Size check stopped after checking 2 of 4 path(s): time budget exceeded',
+            out,
+        )
+
+    def test_find_prohibited_modes_stops_at_cap(self):
+        cat_file = self._cat_file('CatFileBatch')
+        cat_file.read.return_value = b'/etc'
+        filenames = ['a', 'b', 'c', 'd', 'e']
+        entries = [IndexEntry(fn, 0o120000, 'f' * 40, 0) for fn in filenames]
+        rc, out = self._run(
+            lib.find_prohibited_modes,
+            [],
+            filenames,
+            external_symlinks=True,
+            index_entries=entries,
+            max_violations=1,
+        )
+        self.assertEqual(rc, 1)
+        self.assertEqual(cat_file.read.call_count, 1)
+        self.assertIn('found: a (symlink to /etc outside the repository)\n', out)
+        self.assertIn(
+            'Mode check stopped after checking 1 of 5 path(s): 1 violation(s) found',
+            out,
+        )
+
+    def test_find_prohibited_modes_stops_at_deadline_between_paths(self):
+        filenames = ['a.sh', 'b.sh', 'c.sh']
+        entries = [IndexEntry(fn, 0o100755, 'f' * 40, 0) for fn in filenames]
+        with patch.object(lib.time, 'monotonic', side_effect=[0, 0, 0, 2]):
+            rc, out = self._run(
+                lib.find_prohibited_modes,
+                [('executable', '*.sh')],
+                filenames,
+                index_entries=entries,
+                deadline=1,
+            )
+        self.assertEqual(rc, 1)
+        self.assertIn('a.sh (executable matching *.sh), b.sh', out)
+        self.assertNotIn('c.sh', out)
+        self.assertIn('Mode check stopped after checking 2 of 3 path(s)', out)
+
+
+class ScanLimitMainTests(unittest.TestCase):
+    def _main(self, *args):
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            rc = lib.main(list(args))
+        return rc, buf.getvalue()
+
+    def test_fail_fast(self):
+        rc, out = self._main('--patterns', '*.pem', '--fail-fast', 'a.pem', 'b.pem')
+        self.assertEqual(rc, 1)
+        self.assertIn('Prohibited filename(s) found: a.pem\n', out)
+        self.assertIn('Scan stopped after checking 1 of 2 path(s)', out)
+
+    @patch('pre_commit_hooks.check_prohibited_filenames.find_oversized')
+    def test_fail_fast_skips_size_check_after_violation(self, oversized):
+        with redirect_stdout(io.StringIO()):
+            lib.main(
+                ['--patterns', '*.pem', '--size-limits', '*=1', '--fail-fast', 'a.pem']
+            )
+        oversized.assert_not_called()
+
+    def test_max_violations(self):
+        rc, out = self._main(
+            '--patterns', '*.pem', '--max-violations', '2', 'a.pem', 'b.pem', 'c.pem'
+        )
+        self.assertEqual(rc, 1)
+        self.assertIn('a.pem, b.pem\n', out)
+
+    def test_time_budget_generous_passes(self):
+        rc, out = self._main('--patterns', '*.pem', '--time-budget', '60000', 'ok.txt')
+        self.assertEqual((rc, out), (0, ''))
+
+    def test_invalid_limits_are_errors(self):
+        for args in (['--max-violations', '0'], ['--time-budget', '0']):
+            with self.subTest(args=args):
+                with redirect_stdout(io.StringIO()), patch('sys.stderr', io.StringIO()):
+                    with self.assertRaises(SystemExit):
+                        lib.main([*args, 'a.txt'])
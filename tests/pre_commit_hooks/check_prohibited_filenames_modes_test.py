@@ -0,0 +1,133 @@
+#  Copyright 2025 T-Systems International GmbH
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice, this
+#     list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its
+#     contributors may be used to endorse or promote products derived from
+#     this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+import os
+import shutil
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import pre_commit_hooks.check_prohibited_filenames as lib
+import pre_commit_hooks.util as util
+from tests.pre_commit_hooks import GitRepoTestCase
+
+
+class ModeRuleParsingTests(unittest.TestCase):
+    def test_parse_mode_rule(self):
+        self.assertEqual(
+            lib._parse_mode_rule('executable:*.env'), ('executable', '*.env')
+        )
+        self.assertEqual(lib._parse_mode_rule('gitlink:a:b'), ('gitlink', 'a:b'))
+        for s in ('*.env', 'socket:*', 'symlink:'):
+            with self.subTest(s=s), self.assertRaises(ValueError):
+                lib._parse_mode_rule(s)
+
+    def test_symlink_escapes(self):
+        self.assertFalse(lib._symlink_escapes('a/link', 'target'))
+        self.assertFalse(lib._symlink_escapes('a/b/link', '../c'))
+        self.assertFalse(lib._symlink_escapes('a/link', '../a/../b'))
+        self.assertTrue(lib._symlink_escapes('link', '../outside'))
+        self.assertTrue(lib._symlink_escapes('a/link', '../../etc/passwd'))
+        self.assertTrue(lib._symlink_escapes('a/link', 'x/../../..'))
+        self.assertTrue(lib._symlink_escapes('link', '/etc/passwd'))
+        self.assertTrue(lib._symlink_escapes('link', r'C:\Windows'))
+        self.assertTrue(lib._symlink_escapes('link', r'..\..\x'))
+
+
+@unittest.skipIf(shutil.which('git') is None, 'git not available')
+class ModeChecksGitTests(GitRepoTestCase):
+    main = lib.main
+
+    def setUp(self):
+        super().setUp()
+        Path('app.env').write_text('KEY=1')
+        os.chmod('app.env', 0o755)
+        Path('run.sh').write_text('#!/bin/sh')
+        os.chmod('run.sh', 0o755)
+        Path('docs').mkdir()
+        os.symlink('../README.md', 'docs/readme-link')
+        os.symlink('../../etc/passwd', 'docs/passwd')
+        Path('README.md').write_text('readme')
+        self._git('add', '--all')
+        blob = self._git('hash-object', '-w', '--stdin', input='x').strip()
+        self._git('update-index', '--add', '--cacheinfo', f'160000,{blob},vendor/lib')
+
+    FILES = ['app.env', 'run.sh', 'docs/readme-link', 'docs/passwd', 'vendor/lib']
+
+    def test_executable_rule(self):
+        rc, out = self._main('--prohibited-modes', 'executable:*.env', *self.FILES)
+        self.assertEqual(rc, 1)
+        self.assertIn('app.env (executable matching *.env)', out)
+        self.assertNotIn('run.sh', out)
+
+    def test_symlink_and_gitlink_rules(self):
+        rc, out = self._main(
+            '--prohibited-modes', 'symlink:docs/*,gitlink:vendor/*', *self.FILES
+        )
+        self.assertEqual(rc, 1)
+        self.assertIn('docs/readme-link (symlink matching docs/*)', out)
+        self.assertIn('docs/passwd (symlink matching docs/*)', out)
+        self.assertIn('vendor/lib (gitlink matching vendor/*)', out)
+        self.assertNotIn('app.env', out)
+
+    def test_external_symlinks(self):
+        with patch.object(lib, 'CatFileBatch', wraps=lib.CatFileBatch) as process:
+            rc, out = self._main('--no-external-symlinks', *self.FILES)
+        self.assertEqual(rc, 1)
+        self.assertIn(
+            'docs/passwd (symlink to ../../etc/passwd outside the repository)', out
+        )
+        self.assertNotIn('readme-link', out)
+        process.assert_called_once_with()
+
+    def test_unstaged_files_are_skipped(self):
+        Path('new.env').write_text('x')
+        os.chmod('new.env', 0o755)
+        rc, out = self._main('--prohibited-modes', 'executable:*', 'new.env')
+        self.assertEqual((rc, out), (0, ''))
+
+    def test_report(self):
+        report = os.path.join(self.repo, 'report.jsonl')
+        self._main('--no-external-symlinks', '--report', report, *self.FILES)
+        with open(report, encoding='utf-8') as f:
+            self.assertEqual(
+                json.loads(f.read()),
+                {
+                    'path': 'docs/passwd',
+                    'rule': 'external-symlink',
+                    'kind': 'mode',
+                    'target': '../../etc/passwd',
+                },
+            )
+
+    def test_cat_file_batch_read(self):
+        blob = self._git('hash-object', '-w', '--stdin', input='a\nb\0c').strip()
+        objects = [blob, 'HEAD:missing', ':0:README.md', 'x\ny']
+        with util.CatFileBatch() as cat_file:
+            contents = [cat_file.read(obj) for obj in objects]
+        self.assertEqual(contents, [b'a\nb\0c', None, b'readme', None])
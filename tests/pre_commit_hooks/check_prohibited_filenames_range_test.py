@@ -0,0 +1,122 @@
+#  Copyright 2025 T-Systems International GmbH
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice, this
+#     list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its
+#     contributors may be used to endorse or promote products derived from
+#     this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import io
+import os
+import shutil
+import subprocess
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+import pre_commit_hooks.check_prohibited_filenames as lib
+
+
+def _git(cwd, *args):
+    return subprocess.run(
+        ['git', *args], cwd=cwd, check=True, text=True, capture_output=True
+    ).stdout.strip()
+
+
+def _commit(cwd, message, files):
+    for name, content in files.items():
+        path = Path(cwd, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    _git(cwd, 'add', '--all')
+    _git(cwd, 'commit', '--quiet', '--allow-empty', '-m', message)
+    return _git(cwd, 'rev-parse', 'HEAD')
+
+
+@unittest.skipIf(shutil.which('git') is None, 'git not available')
+class ProhibitedFilenamesRangeTests(unittest.TestCase):
+    def setUp(self):
+        tmp = TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.repo = tmp.name
+        _git(self.repo, 'init', '--quiet')
+        _git(self.repo, 'config', 'user.email', 'dev@corp.example')
+        _git(self.repo, 'config', 'user.name', 'Dev')
+        self.base = _commit(self.repo, 'base', {'old.pem': 'x'})
+        cwd = os.getcwd()
+        os.chdir(self.repo)
+        self.addCleanup(os.chdir, cwd)
+
+    def _main(self, *args):
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            rc = lib.main(list(args))
+        return rc, buf.getvalue()
+
+    def test_range_reports_first_commit_introducing_path(self):
+        first = _commit(self.repo, 'add key', {'keys/id_rsa.pem': 'k'})
+        _commit(self.repo, 'touch key', {'keys/id_rsa.pem': 'k2', 'ok.txt': 'o'})
+        rc, out = self._main('--prohibited-patterns', '*.pem', '--range', 'HEAD~2..')
+        self.assertEqual(rc, 1)
+        self.assertIn(f'keys/id_rsa.pem (introduced in {first[:12]})', out)
+        self.assertEqual(out.count('keys/id_rsa.pem'), 1)
+        self.assertNotIn('old.pem', out)
+
+    def test_range_deduplicates_readded_paths(self):
+        first = _commit(self.repo, 'add', {'.env': 'a'})
+        _git(self.repo, 'rm', '--quiet', '.env')
+        _commit(self.repo, 'remove', {})
+        _commit(self.repo, 're-add', {'.env': 'b'})
+        rc, out = self._main('--prohibited-filenames', '.env', '--range', 'HEAD~3..')
+        self.assertEqual(rc, 1)
+        self.assertEqual(out.count('.env'), 1)
+        self.assertIn(first[:12], out)
+
+    def test_range_clean_returns_0(self):
+        _commit(self.repo, 'add', {'src/main.py': 'print()'})
+        rc, out = self._main('--prohibited-patterns', '*.pem', '--range', 'HEAD~1..')
+        self.assertEqual(rc, 0)
+        self.assertEqual(out, '')
+
+    def test_range_combines_with_filenames(self):
+        _commit(self.repo, 'add', {'src/main.py': 'print()'})
+        rc, out = self._main(
+            '--prohibited-patterns', '*.pem', '--range', 'HEAD~1..', 'staged.pem'
+        )
+        self.assertEqual(rc, 1)
+        self.assertIn('staged.pem', out)
+
+    def test_invalid_range_is_an_error(self):
+        stderr = io.StringIO()
+        with self.assertRaises(SystemExit) as cm, redirect_stdout(io.StringIO()):
+            with patch('sys.stderr', stderr):
+                lib.main(['--prohibited-patterns', '*.pem', '--range', 'nope..HEAD'])
+        self.assertEqual(cm.exception.code, 2)
+        self.assertIn('--range nope..HEAD: fatal: bad revision', stderr.getvalue())
+        self.assertNotIn('Traceback', stderr.getvalue())
+
+    def test_missing_filenames_and_range_is_an_error(self):
+        with self.assertRaises(SystemExit), redirect_stdout(io.StringIO()):
+            with patch('sys.stderr', io.StringIO()):
+                lib.main(['--prohibited-patterns', '*.pem'])
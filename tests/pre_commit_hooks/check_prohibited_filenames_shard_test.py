@@ -0,0 +1,135 @@
+#  Copyright 2025 T-Systems International GmbH
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice, this
+#     list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its
+#     contributors may be used to endorse or promote products derived from
+#     this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import io
+import json
+import os
+import random
+import unittest
+from contextlib import redirect_stdout
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+import pre_commit_hooks.check_prohibited_filenames as lib
+
+PATHS = [f'dir{i % 13}/file{i}.{("pem", "txt", "py")[i % 3]}' for i in range(3000)]
+
+
+class ShardTests(unittest.TestCase):
+    def test_parse_shard(self):
+        self.assertEqual(lib._parse_shard('1/4'), (1, 4))
+        self.assertEqual(lib._parse_shard('4/4'), (4, 4))
+        for s in ('0/4', '5/4', '1', '1/0', 'a/b', '/'):
+            with self.subTest(s=s), self.assertRaises(ValueError):
+                lib._parse_shard(s)
+
+    def test_shard_is_stable(self):
+        # Pinned values: changing the hash would reshuffle running CI setups.
+        self.assertEqual(lib._shard_of('a', 4), 3)
+        self.assertEqual(lib._shard_of('src/main.py', 7), 5)
+
+    def test_shards_are_disjoint_complete_and_balanced(self):
+        shards = [[p for p in PATHS if lib._shard_of(p, 4) == i] for i in range(4)]
+        self.assertEqual(sorted(p for shard in shards for p in shard), sorted(PATHS))
+        for shard in shards:
+            self.assertGreater(len(shard), len(PATHS) / 4 * 0.8)
+
+
+class ShardReportMainTests(unittest.TestCase):
+    def setUp(self):
+        tmp = TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+
+    def _main(self, *args):
+        with redirect_stdout(io.StringIO()):
+            return lib.main(list(args))
+
+    def test_merged_shard_reports_equal_unsharded_report(self):
+        full = os.path.join(self.tmp, 'full.jsonl')
+        self._main('--patterns', '*.pem', '--report', full, *PATHS)
+        merged = []
+        for index in range(1, 4):
+            report = os.path.join(self.tmp, f'shard{index}.jsonl')
+            self._main(
+                *('--patterns', '*.pem', '--shard', f'{index}/3', '--report', report),
+                *PATHS,
+            )
+            with open(report, encoding='utf-8') as f:
+                merged.extend(f)
+        with open(full, encoding='utf-8') as f:
+            expected = f.readlines()
+        self.assertEqual(len(expected), 1000)
+        self.assertEqual(sorted(merged), sorted(expected))
+        self.assertEqual(
+            json.loads(expected[0]),
+            {'path': 'dir0/file0.pem', 'rule': '*.pem', 'kind': 'pattern'},
+        )
+
+    def test_shard_does_not_depend_on_input_order_or_other_paths(self):
+        def shard_report(paths):
+            report = os.path.join(self.tmp, 'shard.jsonl')
+            self._main(
+                *('--patterns', '*.pem', '--shard', '2/3', '--report', report), *paths
+            )
+            with open(report, encoding='utf-8') as f:
+                return sorted(f)
+
+        shuffled = PATHS[:1500]
+        random.Random(0).shuffle(shuffled)
+        extra = [f'extra/{i}.txt' for i in range(100)]
+        self.assertEqual(
+            shard_report(PATHS[:1500]), shard_report([*extra, *shuffled])
+        )
+
+    def test_shard_without_own_paths_passes(self):
+        path = 'only.pem'
+        other = lib._shard_of(path, 2) ^ 1
+        rc = self._main('--patterns', '*.pem', '--shard', f'{other + 1}/2', path)
+        self.assertEqual(rc, 0)
+
+    @patch.object(lib, 'CatFileBatchCheck')
+    def test_report_includes_size_violations(self, process):
+        process.return_value.__enter__.return_value.size.return_value = 5
+        report = os.path.join(self.tmp, 'r.jsonl')
+        self._main('--size-limits', '*.bin=1', '--report', report, 'a.bin')
+        with open(report, encoding='utf-8') as f:
+            self.assertEqual(
+                json.loads(f.read()),
+                {
+                    'path': 'a.bin',
+                    'rule': '*.bin',
+                    'kind': 'size',
+                    'size': 5,
+                    'limit': 1,
+                },
+            )
+
+    def test_invalid_shard_is_an_error(self):
+        with redirect_stdout(io.StringIO()), patch('sys.stderr', io.StringIO()):
+            with self.assertRaises(SystemExit):
+                lib.main(['--shard', '3/2', 'a'])
@@ -0,0 +1,172 @@
+#  Copyright 2025 T-Systems International GmbH
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice, this
+#     list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its
+#     contributors may be used to endorse or promote products derived from
+#     this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import io
+import os
+import shutil
+import subprocess
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import call, patch
+
+import pre_commit_hooks.check_prohibited_filenames as lib
+import pre_commit_hooks.util as util
+
+
+class SizeParsingTests(unittest.TestCase):
+    def test_parse_size_units(self):
+        self.assertEqual(lib._parse_size('512'), 512)
+        self.assertEqual(lib._parse_size('100KB'), 100 * 1024)
+        self.assertEqual(lib._parse_size('10mb'), 10 * 1024**2)
+        self.assertEqual(lib._parse_size('1.5GiB'), int(1.5 * 1024**3))
+        self.assertEqual(lib._parse_size('2 M'), 2 * 1024**2)
+
+    def test_parse_size_rejects_garbage(self):
+        for s in ('', 'MB', '10XB', '-1'):
+            with self.subTest(s=s), self.assertRaises(ValueError):
+                lib._parse_size(s)
+
+    def test_parse_size_limit(self):
+        self.assertEqual(lib._parse_size_limit('*.csv=10MB'), ('*.csv', 10 * 1024**2))
+        with self.assertRaises(ValueError):
+            lib._parse_size_limit('10MB')
+        with self.assertRaises(ValueError):
+            lib._parse_size_limit('=10MB')
+
+    def test_format_size(self):
+        self.assertEqual(lib._format_size(12), '12 B')
+        self.assertEqual(lib._format_size(1536), '1.5 KiB')
+        self.assertEqual(lib._format_size(10 * 1024**2), '10.0 MiB')
+
+
+class FindOversizedTests(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(lib, 'CatFileBatchCheck')
+        self.process = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cat_file = self.process.return_value.__enter__.return_value
+
+    def _run(self, *args, **kwargs):
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            rc = lib.find_oversized(*args, **kwargs)
+        return rc, buf.getvalue()
+
+    def test_first_matching_limit_applies(self):
+        self.cat_file.size.side_effect = [2048, 2048]
+        rc, out = self._run([('*.csv', 1024), ('*', 4096)], ['a.csv', 'b.txt'])
+        self.assertEqual(rc, 1)
+        self.assertIn('a.csv (2.0 KiB > 1.0 KiB)', out)
+        self.assertNotIn('b.txt', out)
+        self.process.assert_called_once_with()
+        self.assertEqual(
+            self.cat_file.size.call_args_list, [call(':0:a.csv'), call(':0:b.txt')]
+        )
+
+    def test_unlimited_paths_are_not_queried(self):
+        rc, out = self._run([('*.csv', 1024)], ['a.txt'])
+        self.assertEqual((rc, out), (0, ''))
+        self.process.assert_not_called()
+
+    def test_missing_blobs_are_ignored(self):
+        self.cat_file.size.return_value = None
+        rc, out = self._run([('*.csv', 1)], ['gone.csv'])
+        self.assertEqual((rc, out), (0, ''))
+
+    def test_introduced_paths_use_commit_blob(self):
+        self.cat_file.size.return_value = 10
+        self._run([('*', 1)], ['a.bin'], {'a.bin': 'abc123'})
+        self.cat_file.size.assert_called_once_with('abc123:a.bin')
+
+
+@unittest.skipIf(shutil.which('git') is None, 'git not available')
+class SizeLimitGitTests(unittest.TestCase):
+    def setUp(self):
+        tmp = TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.repo = tmp.name
+        subprocess.run(['git', 'init', '--quiet'], cwd=self.repo, check=True)
+        cwd = os.getcwd()
+        os.chdir(self.repo)
+        self.addCleanup(os.chdir, cwd)
+
+    def test_main_reports_staged_blob_over_limit(self):
+        Path('dump.csv').write_bytes(b'x' * 2048)
+        Path('small.csv').write_bytes(b'x' * 10)
+        Path('model.bin').write_bytes(b'x' * 2048)
+        subprocess.run(['git', 'add', '.'], check=True)
+        # The working tree copy is irrelevant, only the staged blob counts.
+        Path('small.csv').write_bytes(b'x' * 4096)
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            rc = lib.main(
+                [
+                    '--size-limits',
+                    '*.csv=1KB',
+                    'dump.csv',
+                    'small.csv',
+                    'model.bin',
+                    'unstaged.csv',
+                ]
+            )
+        out = buf.getvalue()
+        self.assertEqual(rc, 1)
+        self.assertIn('File(s) exceeding size limit: dump.csv (2.0 KiB > 1.0 KiB)', out)
+        self.assertNotIn('small.csv', out)
+        self.assertNotIn('model.bin', out)
+
+    def test_main_uses_one_git_process(self):
+        names = [f'{i}.csv' for i in range(3000)]
+        for name in names:
+            Path(name).write_bytes(b'x')
+        subprocess.run(['git', 'add', '.'], check=True)
+        with patch.object(
+            lib, 'CatFileBatchCheck', wraps=lib.CatFileBatchCheck
+        ) as process, redirect_stdout(io.StringIO()):
+            rc = lib.main(['--size-limits', '*.csv=1KB', *names])
+        self.assertEqual(rc, 0)
+        process.assert_called_once_with()
+
+    def test_cat_file_batch_check(self):
+        blob = subprocess.run(
+            ['git', 'hash-object', '-w', '--stdin'],
+            input='a\nb\0c',
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        objects = [blob, 'HEAD:missing', f'{blob}^{{tree}}', 'x\ny', blob]
+        with util.CatFileBatchCheck() as cat_file:
+            sizes = [cat_file.size(obj) for obj in objects]
+        self.assertEqual(sizes, [5, None, None, None, 5])
+
+    def test_main_rejects_invalid_limit(self):
+        with redirect_stdout(io.StringIO()), patch('sys.stderr', io.StringIO()):
+            with self.assertRaises(SystemExit):
+                lib.main(['--size-limits', '*.csv', 'a.csv'])
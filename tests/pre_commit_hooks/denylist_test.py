@@ -0,0 +1,178 @@
+#  Copyright 2025 T-Systems International GmbH
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice, this
+#     list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its
+#     contributors may be used to endorse or promote products derived from
+#     this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import io
+import os
+import tracemalloc
+import unittest
+from contextlib import redirect_stdout
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+import pre_commit_hooks.check_prohibited_filenames as check
+import pre_commit_hooks.denylist as lib
+
+
+class DenyListTests(unittest.TestCase):
+    def setUp(self):
+        tmp = TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+
+    def _open(self, entries, **kwargs):
+        path = os.path.join(self.tmp, 'deny.idx')
+        with open(path, 'wb') as out:
+            lib.build(entries, out, **kwargs)
+        denylist = lib.DenyList(path)
+        self.addCleanup(denylist.close)
+        return denylist
+
+    def test_contains_exact_entries_only(self):
+        entries = [f'secret-{i}.txt' for i in range(1000)]
+        denylist = self._open(entries)
+        self.assertEqual(len(denylist), 1000)
+        for entry in entries:
+            self.assertIn(entry, denylist)
+        for i in range(1000, 3000):
+            self.assertNotIn(f'secret-{i}.txt', denylist)
+        self.assertNotIn('SECRET-1.txt', denylist)
+        self.assertNotIn(42, denylist)
+
+    def test_duplicates_are_stored_once(self):
+        denylist = self._open(['a', 'b', 'a'])
+        self.assertEqual(len(denylist), 2)
+
+    def test_empty_denylist(self):
+        denylist = self._open([])
+        self.assertEqual(len(denylist), 0)
+        self.assertNotIn('', denylist)
+        self.assertNotIn('a', denylist)
+
+    def test_casefold(self):
+        denylist = self._open(['Id_RSA'], casefold=True)
+        self.assertTrue(denylist.casefold)
+        self.assertIn('id_rsa', denylist)
+        self.assertIn('ID_RSA', denylist)
+
+    def test_non_ascii_keys(self):
+        denylist = self._open(['geheimnis-ä.txt', 'z', 'ä'])
+        self.assertIn('geheimnis-ä.txt', denylist)
+        self.assertIn('ä', denylist)
+        self.assertNotIn('a', denylist)
+
+    def test_fingerprint_flag(self):
+        self.assertFalse(self._open(['a']).has_fingerprints)
+        self.assertTrue(self._open([lib.fingerprint('a/b')]).has_fingerprints)
+
+    def test_bloom_filter_rejects_most_absent_keys(self):
+        denylist = self._open([str(i) for i in range(10000)], false_positive_rate=0.01)
+        with patch.object(denylist, '_table_contains', return_value=True) as table:
+            hits = sum(f'absent-{i}' in denylist for i in range(10000))
+        self.assertLess(hits, 300)
+        self.assertEqual(table.call_count, hits)
+
+    def test_open_does_not_load_entries(self):
+        path = os.path.join(self.tmp, 'big.idx')
+        with open(path, 'wb') as out:
+            lib.build((f'entry-{i}' for i in range(100000)), out)
+        tracemalloc.start()
+        try:
+            with lib.DenyList(path) as denylist:
+                self.assertIn('entry-99999', denylist)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, 64 * 1024)
+
+    def test_rejects_other_files(self):
+        path = os.path.join(self.tmp, 'junk')
+        with open(path, 'wb') as f:
+            f.write(b'not an index at all, but long enough for a header')
+        with self.assertRaises(ValueError):
+            lib.DenyList(path)
+
+    def test_rejects_truncated_index(self):
+        path = os.path.join(self.tmp, 'deny.idx')
+        with open(path, 'wb') as out:
+            lib.build([f'entry-{i}' for i in range(100)], out)
+        with open(path, 'rb') as f:
+            data = f.read()
+        for size in (0, len(data) - 1, len(data) // 2, lib._HEADER.size):
+            with open(path, 'wb') as f:
+                f.write(data[:size])
+            with self.subTest(size=size), self.assertRaises(ValueError):
+                lib.DenyList(path)
+
+    def test_surrogate_escaped_keys(self):
+        name = b'geheim-\xff.txt'.decode('utf-8', 'surrogateescape')
+        denylist = self._open([name, lib.fingerprint(name)])
+        self.assertIn(name, denylist)
+        self.assertIn(lib.fingerprint(name), denylist)
+
+    def test_main_builds_from_text_list(self):
+        source = os.path.join(self.tmp, 'list.txt')
+        output = os.path.join(self.tmp, 'list.idx')
+        with open(source, 'w', encoding='utf-8') as f:
+            f.write('# threat intel feed\n\nid_rsa\n  .env  \n')
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(lib.main([source, output]), 0)
+        with lib.DenyList(output) as denylist:
+            self.assertEqual(len(denylist), 2)
+            self.assertIn('.env', denylist)
+            self.assertNotIn('# threat intel feed', denylist)
+
+
+class CheckProhibitedFilenamesIndexTests(unittest.TestCase):
+    def setUp(self):
+        tmp = TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.index = os.path.join(tmp.name, 'deny.idx')
+        with open(self.index, 'wb') as out:
+            lib.build(['id_rsa', lib.fingerprint('conf/prod/secrets.yaml')], out)
+
+    def _main(self, *args):
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            rc = check.main(['--prohibited-filenames-index', self.index, *args])
+        return rc, buf.getvalue()
+
+    def test_matches_basename_and_fingerprint(self):
+        rc, out = self._main(
+            'home/.ssh/id_rsa', 'conf/prod/secrets.yaml', 'conf/dev/secrets.yaml'
+        )
+        self.assertEqual(rc, 1)
+        self.assertIn('home/.ssh/id_rsa', out)
+        self.assertIn('conf/prod/secrets.yaml', out)
+        self.assertNotIn('conf/dev/secrets.yaml', out)
+
+    def test_clean(self):
+        self.assertEqual(self._main('src/id_rsa.pub'), (0, ''))
+
+    def test_invalid_index_is_an_error(self):
+        with redirect_stdout(io.StringIO()), patch('sys.stderr', io.StringIO()):
+            with self.assertRaises(SystemExit):
+                check.main(['--prohibited-filenames-index', '/nonexistent', 'a'])
@@ -0,0 +1,175 @@
+#  Copyright 2025 T-Systems International GmbH
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice, this
+#     list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its
+#     contributors may be used to endorse or promote products derived from
+#     this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import io
+import os
+import shutil
+import subprocess
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pre_commit_hooks.check_prohibited_filenames as check
+import pre_commit_hooks.git_index as lib
+
+
+@unittest.skipIf(shutil.which('git') is None, 'git not available')
+class ReadIndexTests(unittest.TestCase):
+    def setUp(self):
+        tmp = TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.repo = tmp.name
+        self._git('init', '--quiet')
+        self.blob = self._git('hash-object', '-w', '--stdin', input='x').strip()
+
+    def _git(self, *args, input=None):
+        return subprocess.run(
+            ['git', *args],
+            cwd=self.repo,
+            check=True,
+            capture_output=True,
+            text=True,
+            input=input,
+        ).stdout
+
+    def _add_cacheinfo(self, mode, path):
+        self._git('update-index', '--add', '--cacheinfo', f'{mode},{self.blob},{path}')
+
+    def _expected(self):
+        entries = []
+        for line in self._git('ls-files', '--stage', '-z').split('\0'):
+            if line:
+                info, path = line.split('\t', 1)
+                mode, oid, stage = info.split()
+                entries.append(lib.IndexEntry(path, int(mode, 8), oid, int(stage)))
+        return entries
+
+    def _read(self):
+        return list(lib.read_index(*lib.index_file(self.repo)))
+
+    def _populate(self):
+        for i in range(40):
+            path = Path(self.repo, f'dir{i % 4}', 'sub', f'file-{i}-{"x" * i}.txt')
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(str(i))
+        Path(self.repo, 'ünïcödé name.txt').write_text('u')
+        self._git('add', '--all')
+        self._add_cacheinfo('100755', 'bin/run.sh')
+        self._add_cacheinfo('120000', 'link')
+        self._add_cacheinfo('160000', 'vendor/sub')
+        self._add_cacheinfo('100644', 'long/' + 'y' * 5000)
+
+    def test_index_file(self):
+        filename, hash_size = lib.index_file(self.repo)
+        expected = os.path.join(self.repo, '.git', 'index')
+        self.assertEqual(os.path.realpath(filename), os.path.realpath(expected))
+        self.assertEqual(hash_size, 20)
+
+    def test_missing_index_has_no_entries(self):
+        self.assertEqual(self._read(), [])
+
+    def test_matches_ls_files_for_all_versions(self):
+        self._populate()
+        for version in ('2', '3', '4'):
+            with self.subTest(version=version):
+                self._git('update-index', '--index-version', version)
+                entries = self._read()
+                self.assertEqual(len(entries), 45)
+                self.assertEqual(entries, self._expected())
+
+    def test_extended_flags(self):
+        self._populate()
+        Path(self.repo, 'later.txt').write_text('later')
+        # Intent-to-add entries carry extended flags and force version 3.
+        self._git('add', '--intent-to-add', 'later.txt')
+        self.assertEqual(self._read(), self._expected())
+
+    def test_modes(self):
+        self._populate()
+        modes = {e.path: e.mode for e in self._read()}
+        self.assertEqual(modes['bin/run.sh'], lib.MODE_EXECUTABLE)
+        self.assertEqual(modes['link'], lib.MODE_SYMLINK)
+        self.assertEqual(modes['vendor/sub'], lib.MODE_GITLINK)
+
+    def test_iteration_is_lazy(self):
+        self._populate()
+        entries = lib.read_index(*lib.index_file(self.repo))
+        self.assertEqual(next(entries).path, self._expected()[0].path)
+        entries.close()
+
+    def test_split_index_matches_ls_files(self):
+        self._populate()
+        self._git('update-index', '--split-index')
+        # Replace, delete and add entries after the shared index was written.
+        Path(self.repo, 'dir0', 'sub', 'file-0-.txt').write_text('changed')
+        self._git('add', 'dir0/sub/file-0-.txt')
+        self._git('rm', '--cached', '--quiet', 'link')
+        self._add_cacheinfo('100644', 'added.txt')
+        shared = [
+            name
+            for name in os.listdir(os.path.join(self.repo, '.git'))
+            if name.startswith('sharedindex.')
+        ]
+        self.assertTrue(shared)
+        entries = list(lib.read_index(*lib.index_file(self.repo), self.repo))
+        self.assertEqual(len(entries), 45)
+        self.assertEqual(entries, self._expected())
+
+    def test_split_index_without_shared_index_is_an_error(self):
+        self._populate()
+        self._git('update-index', '--split-index')
+        # Staging a new mode replaces the entry of the shared index.
+        self._add_cacheinfo('100644', 'bin/run.sh')
+        git_dir = os.path.join(self.repo, '.git')
+        for name in os.listdir(git_dir):
+            if name.startswith('sharedindex.'):
+                os.remove(os.path.join(git_dir, name))
+        with self.assertRaises(ValueError):
+            list(lib.read_index(*lib.index_file(self.repo), self.repo))
+
+    def test_rejects_other_files(self):
+        junk = os.path.join(self.repo, 'junk')
+        with open(junk, 'wb') as f:
+            f.write(b'JUNK' + bytes(8))
+        with self.assertRaises(ValueError):
+            list(lib.read_index(junk))
+
+    def test_check_prohibited_filenames_index_option(self):
+        self._populate()
+        cwd = os.getcwd()
+        os.chdir(self.repo)
+        self.addCleanup(os.chdir, cwd)
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            rc = check.main(['--patterns', '*.sh,file-3-*', '--index', 'extra.sh'])
+        out = buf.getvalue()
+        self.assertEqual(rc, 1)
+        self.assertIn('bin/run.sh', out)
+        self.assertIn('dir3/sub/file-3-xxx.txt', out)
+        self.assertIn('extra.sh', out)
+        self.assertNotIn('file-7-', out)
@@ -0,0 +1,164 @@
+#  Copyright 2025 T-Systems International GmbH
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice, this
+#     list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its
+#     contributors may be used to endorse or promote products derived from
+#     this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import shutil
+import threading
+import unittest
+from collections import Counter
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pre_commit_hooks.check_prohibited_filenames as check_prohibited_filenames
+import pre_commit_hooks.metrics as lib
+from tests.pre_commit_hooks import GitRepoTestCase
+
+
+class MetricsTests(unittest.TestCase):
+    def setUp(self):
+        tmp = TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        self.filename = os.path.join(self.dir, 'hooks.prom')
+
+    def test_write_accumulates_runs(self):
+        lib.write(self.filename, 'a', 0.03, Counter(paths_checked=10, violations=1))
+        lib.write(self.filename, 'a', 3.0, Counter(paths_checked=5))
+        lib.write(self.filename, 'b', 0.001, Counter())
+        samples = lib._read_samples(self.filename)
+        bucket = 'pre_commit_hooks_run_duration_seconds_bucket'
+        self.assertEqual(samples[(bucket, 'a', '0.025')], 0)
+        self.assertEqual(samples[(bucket, 'a', '0.05')], 1)
+        self.assertEqual(samples[(bucket, 'a', '5.0')], 2)
+        self.assertEqual(samples[(bucket, 'a', '+Inf')], 2)
+        self.assertEqual(samples[(bucket, 'b', '0.01')], 1)
+        self.assertEqual(
+            samples[('pre_commit_hooks_run_duration_seconds_count', 'a', None)], 2
+        )
+        self.assertAlmostEqual(
+            samples[('pre_commit_hooks_run_duration_seconds_sum', 'a', None)], 3.03
+        )
+        self.assertEqual(
+            samples[('pre_commit_hooks_paths_checked_total', 'a', None)], 15
+        )
+        self.assertEqual(samples[('pre_commit_hooks_violations_total', 'a', None)], 1)
+        self.assertEqual(samples[('pre_commit_hooks_violations_total', 'b', None)], 0)
+        self.assertEqual(
+            [fn for fn in os.listdir(self.dir) if not fn.startswith('hooks.prom')], []
+        )
+
+    def test_render_format(self):
+        lib.write(self.filename, 'a', 0.5, Counter(git_subprocess_seconds=0.25))
+        text = Path(self.filename).read_text()
+        self.assertTrue(text.endswith('\n# EOF\n'))
+        self.assertIn('# TYPE pre_commit_hooks_run_duration_seconds histogram\n', text)
+        self.assertIn('# TYPE pre_commit_hooks_paths_checked counter\n', text)
+        self.assertIn(
+            'pre_commit_hooks_git_subprocess_seconds_total{hook="a"} 0.25\n', text
+        )
+        self.assertIn(
+            'pre_commit_hooks_run_duration_seconds_bucket{hook="a",le="+Inf"} 1\n',
+            text,
+        )
+
+    def test_concurrent_writes_are_not_lost(self):
+        threads = [
+            threading.Thread(
+                target=lib.write,
+                args=(self.filename, 'a', 0.1, Counter(paths_checked=1)),
+            )
+            for _ in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        samples = lib._read_samples(self.filename)
+        if lib.fcntl is not None:
+            self.assertEqual(
+                samples[('pre_commit_hooks_paths_checked_total', 'a', None)], 20
+            )
+        self.assertTrue(Path(self.filename).read_text().endswith('# EOF\n'))
+
+    def test_recorded(self):
+        with lib.recorded(None, 'a'):
+            lib.count('violations', 2)
+        self.assertFalse(os.path.exists(self.filename))
+        with lib.recorded(self.filename, 'a'):
+            lib.count('violations', 3)
+        samples = lib._read_samples(self.filename)
+        # Counts of earlier runs in the same process are not carried over.
+        self.assertEqual(samples[('pre_commit_hooks_violations_total', 'a', None)], 3)
+
+    def test_recorded_failing_run(self):
+        with self.assertRaises(RuntimeError):
+            with lib.recorded(self.filename, 'a'):
+                lib.count('paths_checked', 4)
+                raise RuntimeError('git failed')
+        samples = lib._read_samples(self.filename)
+        self.assertEqual(
+            samples[('pre_commit_hooks_run_duration_seconds_count', 'a', None)], 1
+        )
+        self.assertEqual(
+            samples[('pre_commit_hooks_paths_checked_total', 'a', None)], 4
+        )
+
+
+@unittest.skipIf(shutil.which('git') is None, 'git not available')
+class MetricsHookTests(GitRepoTestCase):
+    main = check_prohibited_filenames.main
+
+    def test_check_prohibited_filenames(self):
+        Path('a.txt').write_text('x')
+        self._git('add', 'a.txt')
+        filename = os.path.join(self.repo, 'hooks.prom')
+        rc, _ = self._main(
+            '--metrics-file',
+            filename,
+            '--patterns',
+            '*.pem',
+            '--size-limits',
+            '*=1MB',
+            'a.txt',
+            'b/c.pem',
+            'b/d.txt',
+        )
+        self.assertEqual(rc, 1)
+        samples = lib._read_samples(filename)
+
+        def total(name):
+            return samples[
+                (f'pre_commit_hooks_{name}_total', 'check-prohibited-filenames', None)
+            ]
+
+        self.assertEqual(total('paths_checked'), 3)
+        self.assertEqual(total('violations'), 1)
+        self.assertGreater(total('git_subprocess_seconds'), 0)
+        # The basename, then every component: a.txt, a.txt (hit), c.pem (match),
+        # d.txt, b, d.txt (hit).
+        self.assertEqual(total('component_cache_lookups'), 6)
+        self.assertEqual(total('component_cache_hits'), 2)
@@ -0,0 +1,196 @@
+#  Copyright 2025 T-Systems International GmbH
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice, this
+#     list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its
+#     contributors may be used to endorse or promote products derived from
+#     this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import shutil
+import tracemalloc
+import unittest
+import unittest.mock
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pre_commit_hooks.check_prohibited_filenames as check
+from pre_commit_hooks import denylist
+from pre_commit_hooks.git_index import IndexEntry
+from pre_commit_hooks.pathstore import PathStore
+from tests.pre_commit_hooks import GitRepoTestCase
+
+
+class PathStoreTests(unittest.TestCase):
+    PATHS = ['README.md', 'src/main.py', 'src/util/main.py', 'src/util/io.py']
+
+    def test_sequence(self):
+        store = PathStore(self.PATHS)
+        self.assertEqual(len(store), 4)
+        self.assertEqual(list(store), self.PATHS)
+        self.assertEqual(store[1], 'src/main.py')
+        self.assertEqual(store[-1], 'src/util/io.py')
+        self.assertEqual(store[1:3], self.PATHS[1:3])
+        self.assertIn('src/util/io.py', store)
+        for index in (4, -5):
+            with self.subTest(index=index), self.assertRaises(IndexError):
+                store[index]
+
+    def test_directories_are_interned(self):
+        store = PathStore(self.PATHS)
+        self.assertEqual(store.names, ['src', 'util'])
+        self.assertEqual(list(store.ids(2)), [0, 1])
+        self.assertEqual(store.basename(2), 'main.py')
+        self.assertEqual(list(store.ids(0)), [])
+        store.append('util/src')
+        self.assertEqual(list(store.ids(4)), [1])
+        self.assertEqual(store.basename(4), 'src')
+        self.assertEqual(len(store.names), 2)
+
+    def test_undecodable_basenames(self):
+        paths = ['caf\udcc3/caf\udcc3', 'b\udcff', 'dir/\u00e9\U0001f600']
+        store = PathStore(paths)
+        self.assertEqual(list(store), paths)
+        self.assertEqual(store[1], paths[1])
+
+    def test_memory(self):
+        # A real tree: the standard library of the running Python.
+        root = os.path.dirname(os.__file__)
+        text = '\n'.join(
+            os.path.relpath(os.path.join(directory, name), root).replace(os.sep, '/')
+            for directory, _, files in os.walk(root)
+            for name in files
+        )
+
+        def peak(build):
+            tracemalloc.start()
+            try:
+                paths = build()
+                return tracemalloc.get_traced_memory()[1], paths
+            finally:
+                tracemalloc.stop()
+
+        strings, paths = peak(lambda: text.split('\n'))
+        stored, store = peak(lambda: PathStore(iter(paths)))
+        self.assertEqual(list(store), paths)
+        self.assertGreater(strings / stored, 1.8)
+
+
+class StagedEntriesTests(unittest.TestCase):
+    def test_store_is_merged_with_the_index(self):
+        entries = [
+            IndexEntry('a.txt', 0o100644, '1' * 40, 0),
+            IndexEntry('b.txt', 0o100644, '2' * 40, 0),
+            IndexEntry('c.txt', 0o100644, '3' * 40, 1),
+            IndexEntry('c.txt', 0o100644, '4' * 40, 2),
+            IndexEntry('d/e.txt', 0o100755, '5' * 40, 0),
+        ]
+        store = PathStore(['a.txt', 'c.txt', 'd/e.txt'])
+        with unittest.mock.patch.object(check, 'read_index') as read_index:
+            staged = list(check._staged_entries(store, entries, exclude={'a.txt'}))
+        self.assertEqual(staged, [None, None, entries[4]])
+        read_index.assert_not_called()
+
+
+class MatchStoreTests(unittest.TestCase):
+    def test_denylist(self):
+        with TemporaryDirectory() as tmp:
+            index = os.path.join(tmp, 'deny.idx')
+            with open(index, 'wb') as out:
+                denylist.build(
+                    ['id_rsa', denylist.fingerprint('conf/prod/secrets.yaml')], out
+                )
+            paths = [
+                'home/.ssh/id_rsa',
+                'conf/prod/secrets.yaml',
+                'conf/dev/secrets.yaml',
+                'keys/id_rsa',
+            ]
+            with denylist.DenyList(index) as deny:
+                ruleset = check.Ruleset(prohibited_patterns=['conf/*/*'], denylist=deny)
+                self.assertEqual(
+                    list(ruleset.match_store(PathStore(paths))),
+                    [ruleset.match_path(path) for path in paths],
+                )
+
+
+@unittest.skipIf(shutil.which('git') is None, 'git not available')
+class FullTreeScanTests(GitRepoTestCase):
+    main = check.main
+
+    def setUp(self):
+        super().setUp()
+        for fn in ('README.md', 'keys/server.pem', 'src/main.py', 'src/.env'):
+            Path(fn).parent.mkdir(parents=True, exist_ok=True)
+            Path(fn).write_text(fn)
+        self._git('add', '--all')
+
+    def test_index_scan_uses_path_store(self):
+        calls = []
+        match_store = check._Rules.match_store
+
+        def spy(rules, store, denylist=None, stats=None):
+            calls.append(list(store))
+            return match_store(rules, store, denylist, stats)
+
+        with unittest.mock.patch.object(check._Rules, 'match_store', spy):
+            rc, out = self._main('--index', '--patterns', '*.pem,.env')
+        self.assertEqual(rc, 1)
+        self.assertEqual(
+            out, 'Prohibited filename(s) found: keys/server.pem, src/.env\n'
+        )
+        self.assertEqual(
+            calls, [['README.md', 'keys/server.pem', 'src/.env', 'src/main.py']]
+        )
+
+    def test_index_scan_with_shards(self):
+        outputs = [
+            self._main('--index', '--patterns', '*.pem,.env', '--shard', f'{i}/3')[1]
+            for i in (1, 2, 3)
+        ]
+        found = sorted(
+            path
+            for out in outputs
+            if out
+            for path in out.split(': ', 1)[1].strip().split(', ')
+        )
+        self.assertEqual(found, ['keys/server.pem', 'src/.env'])
+
+    def test_index_scan_checks_sizes_and_modes(self):
+        os.chmod('src/main.py', 0o755)
+        self._git('add', '--all')
+        args = ['--index', '--size-limits', '*.env=1', '--prohibited-modes']
+        rc, out = self._main(*args, 'executable:*.py')
+        self.assertEqual(rc, 1)
+        self.assertEqual(
+            out,
+            'File(s) exceeding size limit: src/.env (8 B > 1 B)\n'
+            'Prohibited file mode(s) found: src/main.py (executable matching *.py)\n',
+        )
+
+    def test_shard_is_stored_once(self):
+        with unittest.mock.patch.object(
+            PathStore, 'append', autospec=True, side_effect=PathStore.append
+        ) as append:
+            rc, out = self._main('--index', '--patterns', '*.md', '--shard', '1/1')
+        self.assertEqual((rc, out), (1, 'Prohibited filename(s) found: README.md\n'))
+        self.assertEqual(append.call_count, 4)
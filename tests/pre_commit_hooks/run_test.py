@@ -0,0 +1,170 @@
+#  Copyright 2025 T-Systems International GmbH
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice, this
+#     list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its
+#     contributors may be used to endorse or promote products derived from
+#     this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import io
+import os
+import shutil
+import threading
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+
+import pre_commit_hooks.run as lib
+from tests.pre_commit_hooks import GitRepoTestCase
+
+
+class ThreadOutputTests(unittest.TestCase):
+    def test_capture_is_per_thread(self):
+        default = io.StringIO()
+        out = lib._ThreadOutput(default)
+        barrier = threading.Barrier(2)
+        results = {}
+
+        def work(name):
+            def func():
+                for i in range(3):
+                    out.write(f'{name}{i} ')
+                    barrier.wait()
+                return 7
+
+            results[name] = out.capture(func)
+
+        threads = [threading.Thread(target=work, args=(name,)) for name in 'ab']
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        out.write('main')
+        self.assertEqual(
+            results, {'a': (7, 'a0 a1 a2 ', None), 'b': (7, 'b0 b1 b2 ', None)}
+        )
+        self.assertEqual(default.getvalue(), 'main')
+
+    def test_capture_returns_output_before_exception(self):
+        out = lib._ThreadOutput(io.StringIO())
+        error = ValueError('boom')
+
+        def func():
+            out.write('partial')
+            raise error
+
+        self.assertEqual(out.capture(func), (1, 'partial', error))
+
+
+@unittest.skipIf(shutil.which('git') is None, 'git not available')
+class RunGitTests(GitRepoTestCase):
+    main = lib.main
+
+    def setUp(self):
+        super().setUp()
+        self._git('config', 'user.email', 'dev@corp.example')
+        Path('README.md').write_text('readme')
+        Path('readme.md').write_text('readme')
+        Path('server.pem').write_text('pem')
+        self._git('add', '--all')
+
+    def test_all_hooks_share_git_queries(self):
+        with patch.object(lib, 'cmd_outputs', wraps=lib.cmd_outputs) as cmd_outputs:
+            rc, out = self._main(
+                '--hooks',
+                ','.join(lib.HOOKS),
+                '--allowed-domains',
+                'corp.example',
+                '--patterns',
+                '*.pem',
+                '--prohibited-modes',
+                'executable:*',
+                'server.pem',
+            )
+        self.assertEqual(rc, 1)
+        cmd_outputs.assert_called_once()
+        self.assertEqual(len(cmd_outputs.call_args.args), 2)
+        self.assertNotIn('Git user email', out)
+        # Output follows the order of the hooks.
+        self.assertLess(out.index('server.pem'), out.index('README.md and readme.md'))
+
+    def test_single_hook(self):
+        with patch.object(lib, 'cmd_outputs', wraps=lib.cmd_outputs) as cmd_outputs:
+            rc, out = self._main(
+                '--hooks', 'check-git-user-email', '--allowed-domains', 'other.example'
+            )
+        self.assertEqual(rc, 1)
+        self.assertIn('Git user email does not match allowed domains', out)
+        self.assertEqual(
+            cmd_outputs.call_args.args,
+            (('git', 'config', '--default', '', 'user.email'),),
+        )
+
+    def test_filename_check_without_index(self):
+        rc, out = self._main(
+            '--hooks', 'check-prohibited-filenames', '--patterns', '*.txt', 'a.pem'
+        )
+        self.assertEqual((rc, out), (0, ''))
+
+    def test_unset_email_is_reported(self):
+        env = {'GIT_CONFIG_GLOBAL': os.devnull, 'GIT_CONFIG_NOSYSTEM': '1'}
+        self._git('config', '--unset', 'user.email')
+        with patch.dict(os.environ, env), self.assertRaises(RuntimeError):
+            self._main('--hooks', 'check-git-user-email', '--allowed-domains', 'x.com')
+
+    def test_failing_hook_keeps_output_of_others(self):
+        env = {'GIT_CONFIG_GLOBAL': os.devnull, 'GIT_CONFIG_NOSYSTEM': '1'}
+        self._git('config', '--unset', 'user.email')
+        buf = io.StringIO()
+        with patch.dict(os.environ, env), self.assertRaises(RuntimeError):
+            with redirect_stdout(buf):
+                lib.main(
+                    [
+                        '--hooks',
+                        'check-git-user-email,check-prohibited-filenames',
+                        '--allowed-domains',
+                        'x.com',
+                        '--patterns',
+                        '*.pem',
+                        'server.pem',
+                    ]
+                )
+        self.assertIn('Prohibited filename(s) found: server.pem', buf.getvalue())
+
+    def test_options_are_validated_before_dispatch(self):
+        Path('deny.idx').write_text('not an index')
+        for args in (
+            ['--prohibited-filenames-index', 'deny.idx'],
+            ['--prohibited-modes', 'socket:*'],
+            ['--shard', '3/2'],
+        ):
+            with self.subTest(args=args):
+                with patch.object(lib, '_run') as run, patch(
+                    'sys.stderr', io.StringIO()
+                ), self.assertRaises(SystemExit):
+                    lib.main(['--hooks', 'check-prohibited-filenames', *args, 'a'])
+                run.assert_not_called()
+
+    def test_unknown_hook(self):
+        with patch('sys.stderr', io.StringIO()), self.assertRaises(SystemExit):
+            lib.main(['--hooks', 'check-everything'])
@@ -27,12 +27,26 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import tempfile
+import time
 import unittest
 from unittest.mock import patch
 
 import pre_commit_hooks.util as lib
 
 
+@contextlib.contextmanager
+def track_timed(active):
+    """Replacement for `_timed` recording the blocks that are timed."""
+    active.append(True)
+    try:
+        yield
+    finally:
+        active.pop()
+
+
 class UtilTests(unittest.TestCase):
     @patch('pre_commit_hooks.util.cmd_output', return_value='a.py\nb.txt\nc.md\n')
     def test_added_files_parses_lines_into_set(self, cmd):
@@ -65,6 +79,121 @@ class UtilTests(unittest.TestCase):
         ret = lib.cmd_output('sh', '-c', 'echo hi')
         self.assertEqual(ret, 'hi\n')
 
+    def test_cmd_output_zstream_keeps_empty_fields(self):
+        ret = list(lib.cmd_output_zstream('sh', '-c', r"printf 'a\0\0b\0c'"))
+        self.assertEqual(ret, ['a', '', 'b', 'c'])
+
+    def test_cmd_output_zstream_small_chunks_join_fields(self):
+        ret = list(
+            lib.cmd_output_zstream('sh', '-c', r"printf 'abc\0def\0'", chunk_size=2)
+        )
+        self.assertEqual(ret, ['abc', 'def'])
+
+    def test_cmd_output_zstream_raises_on_error(self):
+        with self.assertRaises(lib.CalledProcessError):
+            list(lib.cmd_output_zstream('sh', '-c', 'exit 1'))
+
+    def test_cmd_output_zstream_does_not_time_the_consumer(self):
+        active = []
+        with patch.object(lib, '_timed', lambda: track_timed(active)):
+            for _ in lib.cmd_output_zstream('sh', '-c', r"printf 'a\0b\0'"):
+                self.assertEqual(active, [])
+
+    @patch(
+        'pre_commit_hooks.util.cmd_output_zstream',
+        return_value=iter(
+            ['', '', 'c1', '\na.txt', 'b.pem', '', '', 'c2', '\nb.pem', 'c.txt', '']
+        ),
+    )
+    def test_introduced_files_maps_paths_to_first_commit(self, cmd):
+        ret = lib.introduced_files('main..topic')
+        self.assertEqual(ret, {'a.txt': 'c1', 'b.pem': 'c1', 'c.txt': 'c2'})
+        self.assertEqual(list(ret), ['a.txt', 'b.pem', 'c.txt'])
+        self.assertIn('main..topic', cmd.call_args.args)
+
+    def test_cmd_output_passes_input(self):
+        ret = lib.cmd_output('cat', input='piped\n')
+        self.assertEqual(ret, 'piped\n')
+
+    def test_cmd_output_async_returns_stdout(self):
+        ret = asyncio.run(lib.cmd_output_async('cat', input='hi'))
+        self.assertEqual(ret, 'hi')
+
+    def test_cmd_output_async_raises_on_error(self):
+        with self.assertRaises(lib.CalledProcessError):
+            asyncio.run(lib.cmd_output_async('sh', '-c', 'exit 3'))
+
+    def test_cmd_output_async_timeout_kills_and_raises(self):
+        start = time.monotonic()
+        with self.assertRaises(lib.CalledProcessError) as ctx:
+            asyncio.run(lib.cmd_output_async('sleep', '30', timeout=0.1))
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertIn(b'timed out', ctx.exception.args[4])
+
+    def test_cmd_output_async_timeout_raises_without_retcode(self):
+        with self.assertRaises(lib.CalledProcessError):
+            asyncio.run(
+                lib.cmd_output_async('sleep', '30', retcode=None, timeout=0.1)
+            )
+
+    def test_cmd_outputs_runs_concurrently_in_order(self):
+        # every command waits until all three have started, so a serial
+        # run would hit the timeout
+        with tempfile.TemporaryDirectory() as tmpdir:
+            script = (
+                f'touch {tmpdir}/$1; '
+                f'while [ $(ls {tmpdir} | wc -l) -lt 3 ]; do sleep 0.01; done; '
+                'echo $1'
+            )
+            ret = lib.cmd_outputs(
+                ('sh', '-c', script, '-', 'a'),
+                ('sh', '-c', script, '-', 'b'),
+                ('sh', '-c', script, '-', 'c'),
+                timeout=30,
+            )
+        self.assertEqual(ret, ['a\n', 'b\n', 'c\n'])
+
+    def test_cmd_outputs_caps_concurrency(self):
+        running = []
+        peak = 0
+
+        async def fake(*cmd, timeout=None):
+            nonlocal peak
+            running.append(cmd)
+            peak = max(peak, len(running))
+            await asyncio.sleep(0)
+            running.remove(cmd)
+            return ''
+
+        with patch.object(lib, 'cmd_output_async', fake):
+            lib.cmd_outputs(('a',), ('b',), ('c',), ('d',), max_concurrency=2)
+        self.assertEqual(peak, 2)
+
+    def test_cmd_outputs_raises_first_failure(self):
+        start = time.monotonic()
+        with self.assertRaises(lib.CalledProcessError):
+            lib.cmd_outputs(('sleep', '30'), ('sh', '-c', 'exit 1'))
+        self.assertLess(time.monotonic() - start, 10)
+
+    def test_cmd_outputs_times_all_commands_once(self):
+        active = []
+        blocks = []
+
+        def timed():
+            blocks.append(True)
+            return track_timed(active)
+
+        with patch.object(lib, '_timed', timed):
+            lib.cmd_outputs(('true',), ('true',), ('true',))
+        self.assertEqual(len(blocks), 1)
+
+    def test_cmd_outputs_in_running_loop_raises(self):
+        async def run():
+            lib.cmd_outputs(('true',))
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(run())
+
     def test_zsplit_splits_str_correctly(self):
         for out in ('\0f1\0f2\0', '\0f1\0f2', 'f1\0f2\0'):
             with self.subTest(out=out):
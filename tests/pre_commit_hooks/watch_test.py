@@ -0,0 +1,268 @@
+#  Copyright 2025 T-Systems International GmbH
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice, this
+#     list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its
+#     contributors may be used to endorse or promote products derived from
+#     this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+#  FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+#  DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+#  SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+#  CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+#  OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+#  OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import argparse
+import json
+import os
+import shutil
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import pre_commit_hooks.check_prohibited_filenames as check_prohibited_filenames
+import pre_commit_hooks.watch as lib
+from tests.pre_commit_hooks import GitRepoTestCase
+
+
+def _age(root):
+    """Move the mtimes of all directories below `root` a minute back."""
+    old = time.time_ns() - 60_000_000_000
+    for directory, _, _ in os.walk(root):
+        os.utime(directory, ns=(old, old))
+
+
+@unittest.skipIf(shutil.which('git') is None, 'git not available')
+class WatchTestCase(GitRepoTestCase):
+    main = check_prohibited_filenames.main
+
+    def setUp(self):
+        super().setUp()
+        for fn in ('README.md', 'src/main.py', 'src/util/io.py', 'build/out.o'):
+            Path(fn).parent.mkdir(parents=True, exist_ok=True)
+            Path(fn).write_text(fn)
+        Path('.gitignore').write_text('build/\n')
+        self._git('init', '--quiet', 'vendor/lib')
+        Path('vendor/lib/lib.py').write_text('lib')
+        _age('.')
+
+
+class WorkingTreeTests(WatchTestCase):
+    def test_initial_poll(self):
+        tree = lib.WorkingTree()
+        added, removed = tree.poll()
+        self.assertEqual(
+            sorted(added), ['.gitignore', 'README.md', 'src/main.py', 'src/util/io.py']
+        )
+        self.assertEqual(removed, [])
+        self.assertEqual(tree.pruned, {'build', 'vendor/lib'})
+
+    def test_only_changed_directories_are_listed(self):
+        tree = lib.WorkingTree()
+        tree.poll()
+        with patch.object(tree, '_list', wraps=tree._list) as listed:
+            self.assertEqual(tree.poll(), ([], []))
+            listed.assert_not_called()
+            Path('src/util/new.pem').write_text('x')
+            self.assertEqual(tree.poll(), (['src/util/new.pem'], []))
+            self.assertEqual([c.args[0] for c in listed.call_args_list], ['src/util'])
+
+    def test_added_and_removed_directories(self):
+        tree = lib.WorkingTree()
+        tree.poll()
+        os.rename('src/util', 'src/helpers')
+        Path('docs/api').mkdir(parents=True)
+        Path('docs/api/index.md').write_text('x')
+        Path('node_modules').mkdir()
+        Path('.gitignore').write_text('build/\nnode_modules/\n')
+        Path('node_modules/x.js').write_text('x')
+        added, removed = tree.poll()
+        self.assertEqual(sorted(added), ['docs/api/index.md', 'src/helpers/io.py'])
+        self.assertEqual(removed, ['src/util/io.py'])
+        self.assertIn('node_modules', tree.pruned)
+
+        shutil.rmtree('docs')
+        shutil.rmtree('build')
+        self.assertEqual(tree.poll(), ([], ['docs/api/index.md']))
+        self.assertNotIn('build', tree.pruned)
+
+
+class WatchStateTests(WatchTestCase):
+    def _state(self, **kwargs):
+        return lib.WatchState(time.time_ns(), ['build'], {}, **kwargs)
+
+    def test_covers(self):
+        state = self._state()
+        self.assertTrue(state.covers('README.md'))
+        self.assertTrue(state.covers('src/util/io.py'))
+        self.assertFalse(state.covers('src/missing.py'))
+        self.assertFalse(state.covers('build/out.o'))
+
+    def test_directories_are_checked_once(self):
+        for i in range(100):
+            Path(f'src/util/gen{i}.py').write_text('x')
+        _age('.')
+        state = self._state()
+        paths = ['README.md', 'src/main.py']
+        paths += [f'src/util/gen{i}.py' for i in range(100)]
+        with patch.object(lib.os, 'listdir', wraps=os.listdir) as listdir, patch.object(
+            lib.os.path, 'lexists', side_effect=AssertionError
+        ):
+            self.assertTrue(all(state.covers(path) for path in paths * 2))
+        self.assertEqual(
+            sorted(os.path.normpath(c.args[0]) for c in listdir.call_args_list),
+            ['.', 'src', os.path.join('src', 'util')],
+        )
+
+    def test_changed_directories_are_not_covered(self):
+        Path('src/util/new.py').write_text('x')
+        state = self._state()
+        self.assertFalse(state.covers('src/util/io.py'))
+        self.assertTrue(state.covers('src/main.py'))
+        # A change further up the tree affects everything below it.
+        Path('new.py').write_text('x')
+        state = self._state()
+        self.assertFalse(state.covers('src/main.py'))
+
+    def test_load(self):
+        filename = os.path.join('.git', 'state.json')
+        state = {
+            'fingerprint': 'abc',
+            'scanned_at': time.time_ns(),
+            'heartbeat': time.time(),
+            'interval': 1.0,
+            'root': os.path.realpath(self.repo),
+            'pruned': ['build'],
+            'violations': [{'path': 'a.pem', 'rule': '*.pem', 'kind': 'pattern'}],
+        }
+        lib.write_state(filename, state)
+        loaded = lib.WatchState.load(filename, 'abc')
+        self.assertEqual(loaded.pruned, {'build'})
+        self.assertEqual(
+            loaded.violations,
+            {'a.pem': [{'path': 'a.pem', 'rule': '*.pem', 'kind': 'pattern'}]},
+        )
+        self.assertIsNone(lib.WatchState.load(filename, 'other'))
+        self.assertIsNone(lib.WatchState.load('missing.json', 'abc'))
+        lib.write_state(filename, {**state, 'heartbeat': time.time() - 60})
+        self.assertIsNone(lib.WatchState.load(filename, 'abc'))
+        lib.write_state(filename, state)
+        self.assertIsNone(lib.WatchState.load(filename, 'abc', 'src'))
+        lib.write_state(filename, {**state, 'root': os.path.realpath('src')})
+        self.assertIsNone(lib.WatchState.load(filename, 'abc'))
+        Path(filename).write_text('{')
+        self.assertIsNone(lib.WatchState.load(filename, 'abc'))
+
+
+class WatchHookTests(WatchTestCase):
+    STATE = os.path.join('.git', 'prohibited-filenames.json')
+
+    def test_watch(self):
+        states = []
+
+        def sleep(seconds):
+            with open(self.STATE, encoding='utf-8') as f:
+                states.append(json.load(f))
+            if len(states) == 1:
+                Path('src/id_rsa.pem').write_text('x')
+            elif len(states) == 2:
+                os.remove('src/id_rsa.pem')
+            else:
+                raise KeyboardInterrupt
+
+        with patch.object(check_prohibited_filenames.time, 'sleep', sleep):
+            rc, out = self._main(
+                '--watch', '--state-file', self.STATE, '--patterns', '*.pem,*.o'
+            )
+        self.assertEqual(rc, 0)
+        self.assertEqual(out, 'Prohibited filename(s) found: src/id_rsa.pem\n')
+        self.assertEqual(
+            [state['violations'] for state in states],
+            [[], [{'path': 'src/id_rsa.pem', 'rule': '*.pem', 'kind': 'pattern'}], []],
+        )
+        self.assertEqual(states[0]['pruned'], ['build', 'vendor/lib'])
+        self.assertFalse(os.path.exists(self.STATE))
+
+    def test_state_file_answers(self):
+        rules = argparse.Namespace(
+            prohibited_filenames=[],
+            prohibited_patterns=['*.pem'],
+            prohibited_filenames_index=None,
+        )
+        fingerprint = check_prohibited_filenames._rules_fingerprint(rules)
+        lib.write_state(
+            self.STATE,
+            {
+                'fingerprint': fingerprint,
+                'scanned_at': time.time_ns(),
+                'heartbeat': time.time(),
+                'interval': 1.0,
+                'root': os.path.realpath(self.repo),
+                'pruned': ['build'],
+                # Recorded by the watcher, although the rules say otherwise.
+                'violations': [
+                    {'path': 'README.md', 'rule': '*.pem', 'kind': 'pattern'}
+                ],
+            },
+        )
+        args = ['--patterns', '*.pem', '--state-file', self.STATE]
+        rc, out = self._main(*args, 'README.md', 'src/main.py')
+        self.assertEqual((rc, out), (1, 'Prohibited filename(s) found: README.md\n'))
+
+        # Paths in changed directories are matched directly.
+        Path('src/key.pem').write_text('x')
+        rc, out = self._main(*args, 'src/key.pem', './README.md')
+        self.assertEqual(
+            (rc, out), (1, 'Prohibited filename(s) found: src/key.pem\n')
+        )
+
+        # A state file for other rules is ignored.
+        args = ['--patterns', '*.txt', '--state-file', self.STATE]
+        rc, out = self._main(*args, 'README.md')
+        self.assertEqual((rc, out), (0, ''))
+
+    def test_watch_from_subdirectory(self):
+        Path('src/id.pem').write_text('x')
+        _age('.')
+        states = []
+
+        def sleep(seconds):
+            with open(state_file, encoding='utf-8') as f:
+                states.append(json.load(f))
+            raise KeyboardInterrupt
+
+        state_file = os.path.join(self.repo, self.STATE)
+        os.chdir('src')
+        with patch.object(check_prohibited_filenames.time, 'sleep', sleep):
+            rc, out = self._main(
+                '--watch', '--state-file', state_file, '--patterns', '*.pem'
+            )
+        self.assertEqual((rc, out), (0, 'Prohibited filename(s) found: src/id.pem\n'))
+        state = states[0]
+        self.assertEqual(state['root'], os.path.realpath(self.repo))
+        self.assertEqual(
+            state['violations'],
+            [{'path': 'src/id.pem', 'rule': '*.pem', 'kind': 'pattern'}],
+        )
+
+        # Below the top level, paths are not relative to the root of the
+        # watched tree, so the state is not used.
+        del state['version']
+        lib.write_state(state_file, {**state, 'violations': []})
+        args = ['--patterns', '*.pem', '--state-file', state_file]
+        rc, out = self._main(*args, 'id.pem')
+        self.assertEqual((rc, out), (1, 'Prohibited filename(s) found: id.pem\n'))